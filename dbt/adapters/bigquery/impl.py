@@ -54,6 +54,8 @@ class BigQueryAdapter(PostgresAdapter):
     ]
 
     Relation = BigQueryRelation
+
+    drop_cascades = False
     Column = dbt.schema.BigQueryColumn
 
     SCOPE = ('https://www.googleapis.com/auth/bigquery',
@@ -187,7 +189,7 @@ class BigQueryAdapter(PostgresAdapter):
         return connection
 
     @classmethod
-    def list_relations(cls, profile, project_cfg, schema, model_name=None):
+    def _list_relations(cls, profile, project_cfg, schema, model_name=None):
         connection = cls.get_connection(profile, model_name)
         client = connection.get('handle')
 
@@ -231,7 +233,7 @@ class BigQueryAdapter(PostgresAdapter):
             model_name)
 
     @classmethod
-    def drop_relation(cls, profile, project_cfg, relation, model_name=None):
+    def _drop_relation(cls, profile, project_cfg, relation, model_name=None):
         conn = cls.get_connection(profile, model_name)
         client = conn.get('handle')
 
@@ -247,8 +249,8 @@ class BigQueryAdapter(PostgresAdapter):
             '`rename` is not implemented for this adapter!')
 
     @classmethod
-    def rename_relation(cls, profile, project_cfg, from_relation, to_relation,
-                        model_name=None):
+    def _rename_relation(cls, profile, project_cfg, from_relation,
+                         to_relation, model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`rename_relation` is not implemented for this adapter!')
 
@@ -424,6 +426,8 @@ class BigQueryAdapter(PostgresAdapter):
         new_table = google.cloud.bigquery.Table(table_ref, schema=new_schema)
         client.update_table(new_table, ['schema'])
 
+        cls.invalidate_cached_columns(relation)
+
     @classmethod
     def execute(cls, profile, sql, model_name=None, fetch=None, **kwargs):
         _, iterator = cls.raw_execute(profile, sql, model_name, fetch,
@@ -460,7 +464,7 @@ class BigQueryAdapter(PostgresAdapter):
         pass
 
     @classmethod
-    def create_schema(cls, profile, project_cfg, schema, model_name=None):
+    def _create_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Creating schema "%s".', schema)
 
         conn = cls.get_connection(profile, model_name)
@@ -484,7 +488,7 @@ class BigQueryAdapter(PostgresAdapter):
             client.delete_table(table.reference)
 
     @classmethod
-    def drop_schema(cls, profile, project_cfg, schema, model_name=None):
+    def _drop_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Dropping schema "%s".', schema)
 
         if not cls.check_schema_exists(profile, project_cfg,
@@ -500,7 +504,7 @@ class BigQueryAdapter(PostgresAdapter):
             client.delete_dataset(dataset)
 
     @classmethod
-    def get_existing_schemas(cls, profile, project_cfg, model_name=None):
+    def _get_existing_schemas(cls, profile, project_cfg, model_name=None):
         conn = cls.get_connection(profile, model_name)
         client = conn.get('handle')
 
@@ -509,9 +513,9 @@ class BigQueryAdapter(PostgresAdapter):
             return [ds.dataset_id for ds in all_datasets]
 
     @classmethod
-    def get_columns_in_table(cls, profile, project_cfg,
-                             schema_name, table_name,
-                             database=None, model_name=None):
+    def _get_columns_in_table(cls, profile, project_cfg,
+                              schema_name, table_name,
+                              database=None, model_name=None):
 
         # BigQuery does not have databases -- the database parameter is here
         # for consistency with the base implementation
@@ -0,0 +1,283 @@
+import threading
+
+import dbt.utils
+
+from dbt.logger import GLOBAL_LOGGER as logger
+
+# The cache used by the adapter's relation functions while nodes are being
+# run. Adapters are used through classmethods, so this is simpler than
+# passing the cache to each of them.
+_active_cache = None
+
+
+def get_active_cache():
+    return _active_cache
+
+
+def set_active_cache(cache):
+    global _active_cache
+    _active_cache = cache
+
+
+class RelationsCache(object):
+    """The schemas and relations that exist in the database, as far as this
+    run knows. Each schema's relations are listed from the database once,
+    then kept up to date as the adapter creates, drops and renames things,
+    so materializations don't have to query the catalog for every node.
+
+    Schemas that haven't been listed yet, or that were changed in a way
+    the cache couldn't follow, are listed again when they're next needed.
+
+    The columns of each table are cached the same way, and are forgotten
+    whenever the table is dropped, renamed, altered or rebuilt.
+
+    Like get_relation, schemas and identifiers are only matched
+    case-insensitively when they aren't quoted.
+
+    Dropping a relation with cascade also drops the views that select from
+    it. For the relations dbt builds, those views are known from the graph
+    (see set_dependent_views), and only they are forgotten. For anything
+    else, every schema that holds a view is listed again.
+    """
+
+    def __init__(self, quoting=None):
+        self.quoting = dbt.utils.coalesce(quoting, {})
+        self.lock = threading.RLock()
+        self.schemas = None
+        self.relations = {}
+        self.columns = {}
+        self.dependent_views = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def _schema_key(self, schema):
+        schema = schema or ''
+
+        if self.quoting.get('schema') is False:
+            return schema.lower()
+
+        return schema
+
+    def _identifier_key(self, identifier):
+        identifier = identifier or ''
+
+        if self.quoting.get('identifier') is False:
+            return identifier.lower()
+
+        return identifier
+
+    def _relation_key(self, relation):
+        return (self._schema_key(relation.schema),
+                self._identifier_key(relation.identifier))
+
+    def _columns_key(self, schema, table):
+        if schema is not None:
+            schema = self._schema_key(schema)
+
+        return (schema, self._identifier_key(table))
+
+    def get_schemas(self):
+        with self.lock:
+            if self.schemas is None:
+                return None
+
+            return list(self.schemas)
+
+    def set_schemas(self, schemas):
+        with self.lock:
+            self.schemas = list(schemas)
+
+    def add_schema(self, schema):
+        with self.lock:
+            if self.schemas is not None and schema not in self.schemas:
+                self.schemas.append(schema)
+
+            # a schema that was just created is empty
+            self.relations.setdefault(self._schema_key(schema), {})
+
+    def drop_schema(self, schema, cascade=False):
+        """Forget a dropped schema. If it was dropped with cascade, views in
+        other schemas that selected from it are gone too, so every other
+        schema is listed again."""
+        with self.lock:
+            if self.schemas is not None and schema in self.schemas:
+                self.schemas.remove(schema)
+
+            if cascade:
+                self.invalidate()
+
+            self.relations[self._schema_key(schema)] = {}
+            self._invalidate_schema_columns(schema)
+
+    def is_listed(self, schema):
+        with self.lock:
+            return self._schema_key(schema) in self.relations
+
+    def get_relations(self, schema):
+        """Return the relations in the schema, or None if it hasn't been
+        listed yet."""
+        with self.lock:
+            relations = self.relations.get(self._schema_key(schema))
+
+            if relations is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return list(relations.values())
+
+    def set_relations(self, schema, relations):
+        with self.lock:
+            self.relations[self._schema_key(schema)] = {
+                self._identifier_key(relation.identifier): relation
+                for relation in relations
+            }
+
+    def add(self, relation):
+        with self.lock:
+            relations = self.relations.get(self._schema_key(relation.schema))
+
+            # the whole schema will be listed when it's first used
+            if relations is not None:
+                relations[self._identifier_key(relation.identifier)] = relation
+
+    def set_dependent_views(self, relation, views):
+        """Record the views that select from a relation."""
+        with self.lock:
+            self.dependent_views[self._relation_key(relation)] = set(
+                self._relation_key(view) for view in views)
+
+    def drop(self, relation, cascade=False):
+        """Forget a dropped relation. If it was dropped with cascade, the
+        views that selected from it, in any schema, are gone too, unless the
+        relation is known not to have existed."""
+        with self.lock:
+            schema_key, identifier_key = self._relation_key(relation)
+            relations = self.relations.get(schema_key)
+
+            if cascade and (relations is None or identifier_key in relations):
+                self._drop_dependent_views((schema_key, identifier_key))
+
+            if relations is not None:
+                relations.pop(identifier_key, None)
+
+            self.invalidate_columns(relation.schema, relation.identifier)
+
+    def _drop_dependent_views(self, key):
+        if key not in self.dependent_views:
+            self._invalidate_views()
+            return
+
+        dropped = set()
+        to_visit = [key]
+
+        while to_visit:
+            for view in self.dependent_views.get(to_visit.pop(), ()):
+                if view not in dropped:
+                    dropped.add(view)
+                    to_visit.append(view)
+
+        for schema_key, identifier_key in dropped:
+            self.relations.get(schema_key, {}).pop(identifier_key, None)
+            self.invalidate_columns(schema_key, identifier_key)
+
+    def _invalidate_views(self):
+        """List every schema that holds a view again, and forget the columns
+        of everything but the tables in the schemas that are left."""
+        for schema_key, relations in list(self.relations.items()):
+            if any(relation.type != relation.Table
+                   for relation in relations.values()):
+                del self.relations[schema_key]
+
+        for schema_key, identifier_key in list(self.columns):
+            relations = self.relations.get(schema_key)
+            if relations is None or identifier_key not in relations:
+                del self.columns[(schema_key, identifier_key)]
+
+    def rename(self, from_relation, to_relation):
+        with self.lock:
+            self.invalidate_columns(from_relation.schema,
+                                    from_relation.identifier)
+            self.invalidate_columns(from_relation.schema,
+                                    to_relation.identifier)
+
+            # views that selected from the relation still do under its new
+            # name. Its old name keeps them too, as they'll be rebuilt on
+            # whatever replaces it.
+            from_key = self._relation_key(from_relation)
+            to_key = (from_key[0],
+                      self._identifier_key(to_relation.identifier))
+
+            if from_key in self.dependent_views:
+                self.dependent_views[to_key] = \
+                    self.dependent_views.get(to_key, set()) | \
+                    self.dependent_views[from_key]
+
+            relations = self.relations.get(
+                self._schema_key(from_relation.schema), {})
+            cached = relations.pop(
+                self._identifier_key(from_relation.identifier), None)
+
+            if cached is not None:
+                renamed = cached.incorporate(
+                    path={'identifier': to_relation.identifier},
+                    table_name=to_relation.identifier)
+            elif from_relation.type is not None:
+                renamed = from_relation.incorporate(
+                    path={'identifier': to_relation.identifier},
+                    table_name=to_relation.identifier)
+            else:
+                logger.debug("Don't know the type of {}, it will be listed "
+                             "again".format(from_relation))
+                self.invalidate(from_relation.schema)
+                return
+
+            self.add(renamed)
+
+    def invalidate(self, schema=None):
+        """Forget the relations in a schema, or in every schema, so they're
+        listed from the database the next time they're needed. The columns
+        of the tables in them are forgotten too."""
+        with self.lock:
+            if schema is None:
+                self.relations = {}
+                self.columns = {}
+            else:
+                self.relations.pop(self._schema_key(schema), None)
+                self._invalidate_schema_columns(schema)
+
+    def get_columns(self, schema, table):
+        """Return the columns in the table, or None if they haven't been
+        queried yet."""
+        with self.lock:
+            columns = self.columns.get(self._columns_key(schema, table))
+
+            if columns is None:
+                return None
+
+            return list(columns)
+
+    def set_columns(self, schema, table, columns):
+        with self.lock:
+            self.columns[self._columns_key(schema, table)] = list(columns)
+
+    def invalidate_columns(self, schema, table):
+        """Forget the columns of a table. Columns looked up without a schema
+        (eg. for temporary tables) could belong to a table of the same name
+        in any schema, so they're forgotten too."""
+        schema_key, table_key = self._columns_key(schema, table)
+
+        with self.lock:
+            for key in list(self.columns):
+                if key[1] == table_key and (key[0] is None or
+                                            schema_key is None or
+                                            key[0] == schema_key):
+                    del self.columns[key]
+
+    def _invalidate_schema_columns(self, schema):
+        schema_key = self._schema_key(schema)
+
+        for key in list(self.columns):
+            if key[0] is None or key[0] == schema_key:
+                del self.columns[key]
@@ -5,6 +5,7 @@ import agate
 
 from contextlib import contextmanager
 
+import dbt.adapters.cache
 import dbt.exceptions
 import dbt.flags
 import dbt.schema
@@ -59,12 +60,16 @@ class DefaultAdapter(object):
         "get_status",
         "get_result_from_cursor",
         "quote",
-        "convert_type"
+        "convert_type",
+        "invalidate_cached_columns",
     ]
 
     Relation = DefaultRelation
     Column = Column
 
+    # whether drop_relation also drops the views that select from a relation
+    drop_cascades = True
+
     ###
     # ADAPTER-SPECIFIC FUNCTIONS -- each of these must be overridden in
     #                               every adapter
@@ -92,8 +97,8 @@ class DefaultAdapter(object):
             '`get_status` is not implemented for this adapter!')
 
     @classmethod
-    def alter_column_type(cls, profile, project_cfg, schema, table,
-                          column_name, new_column_type, model_name=None):
+    def _alter_column_type(cls, profile, project_cfg, schema, table,
+                           column_name, new_column_type, model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`alter_column_type` is not implemented for this adapter!')
 
@@ -113,7 +118,7 @@ class DefaultAdapter(object):
                 for relation in all_relations}
 
     @classmethod
-    def get_existing_schemas(cls, profile, project_cfg, model_name=None):
+    def _get_existing_schemas(cls, profile, project_cfg, model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`get_existing_schemas` is not implemented for this adapter!')
 
@@ -155,7 +160,7 @@ class DefaultAdapter(object):
         return cls.drop_relation(profile, project_cfg, relation, model_name)
 
     @classmethod
-    def drop_relation(cls, profile, project_cfg, relation, model_name=None):
+    def _drop_relation(cls, profile, project_cfg, relation, model_name=None):
         if relation.type is None:
             dbt.exceptions.raise_compiler_error(
                 'Tried to drop relation {}, but its type is null.'
@@ -195,8 +200,8 @@ class DefaultAdapter(object):
             model_name=model_name)
 
     @classmethod
-    def rename_relation(cls, profile, project_cfg, from_relation,
-                        to_relation, model_name=None):
+    def _rename_relation(cls, profile, project_cfg, from_relation,
+                         to_relation, model_name=None):
         sql = 'alter table {} rename to {}'.format(
             from_relation, to_relation.include(schema=False))
 
@@ -253,8 +258,8 @@ class DefaultAdapter(object):
         return sql
 
     @classmethod
-    def get_columns_in_table(cls, profile, project_cfg, schema_name,
-                             table_name, database=None, model_name=None):
+    def _get_columns_in_table(cls, profile, project_cfg, schema_name,
+                              table_name, database=None, model_name=None):
         sql = cls._get_columns_in_table_sql(schema_name, table_name, database)
         connection, cursor = cls.add_query(
             profile, sql, model_name)
@@ -269,6 +274,50 @@ class DefaultAdapter(object):
 
         return columns
 
+    # These functions keep the column cache up to date while a run is going
+    # on. Adapters implement the underscored versions.
+    @classmethod
+    def get_columns_in_table(cls, profile, project_cfg, schema_name,
+                             table_name, database=None, model_name=None):
+        cache = dbt.adapters.cache.get_active_cache()
+
+        if cache is not None:
+            columns = cache.get_columns(schema_name, table_name)
+            if columns is not None:
+                return columns
+
+        columns = cls._get_columns_in_table(profile, project_cfg,
+                                            schema_name, table_name,
+                                            database, model_name)
+
+        if cache is not None:
+            cache.set_columns(schema_name, table_name, columns)
+
+        return columns
+
+    @classmethod
+    def alter_column_type(cls, profile, project_cfg, schema, table,
+                          column_name, new_column_type, model_name=None):
+        to_return = cls._alter_column_type(profile, project_cfg, schema,
+                                           table, column_name,
+                                           new_column_type, model_name)
+
+        cls.invalidate_cached_columns(
+            cls.Relation.create(schema=schema, identifier=table))
+
+        return to_return
+
+    @classmethod
+    def invalidate_cached_columns(cls, relation):
+        """Forget the cached columns of a relation whose columns were
+        changed with SQL. Returns an empty string, so it can be called from
+        templates."""
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.invalidate_columns(relation.schema, relation.identifier)
+
+        return ''
+
     @classmethod
     def _table_columns_to_dict(cls, columns):
         return {col.name: col for col in columns}
@@ -309,10 +358,105 @@ class DefaultAdapter(object):
     # RELATIONS
     ###
     @classmethod
-    def list_relations(cls, profile, project_cfg, schema, model_name=None):
+    def _list_relations(cls, profile, project_cfg, schema, model_name=None):
         raise dbt.exceptions.NotImplementedException(
             '`list_relations` is not implemented for this adapter!')
 
+    # These functions keep the relations cache up to date while a run is
+    # going on. Adapters implement the underscored versions.
+    @classmethod
+    def list_relations(cls, profile, project_cfg, schema, model_name=None):
+        cache = dbt.adapters.cache.get_active_cache()
+
+        if cache is not None:
+            relations = cache.get_relations(schema)
+            if relations is not None:
+                return relations
+
+        relations = cls._list_relations(profile, project_cfg, schema,
+                                        model_name)
+
+        if cache is not None:
+            cache.set_relations(schema, relations)
+
+        return relations
+
+    @classmethod
+    def get_existing_schemas(cls, profile, project_cfg, model_name=None):
+        cache = dbt.adapters.cache.get_active_cache()
+
+        if cache is not None:
+            schemas = cache.get_schemas()
+            if schemas is not None:
+                return schemas
+
+        schemas = cls._get_existing_schemas(profile, project_cfg, model_name)
+
+        if cache is not None:
+            cache.set_schemas(schemas)
+
+        return schemas
+
+    @classmethod
+    def drop_relation(cls, profile, project_cfg, relation, model_name=None):
+        to_return = cls._drop_relation(profile, project_cfg, relation,
+                                       model_name)
+
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.drop(relation, cascade=cls.drop_cascades)
+
+        return to_return
+
+    @classmethod
+    def rename_relation(cls, profile, project_cfg, from_relation,
+                        to_relation, model_name=None):
+        to_return = cls._rename_relation(profile, project_cfg, from_relation,
+                                         to_relation, model_name)
+
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.rename(from_relation, to_relation)
+
+        return to_return
+
+    @classmethod
+    def create_schema(cls, profile, project_cfg, schema, model_name=None):
+        to_return = cls._create_schema(profile, project_cfg, schema,
+                                       model_name)
+
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.add_schema(schema)
+
+        return to_return
+
+    @classmethod
+    def drop_schema(cls, profile, project_cfg, schema, model_name=None):
+        to_return = cls._drop_schema(profile, project_cfg, schema,
+                                     model_name)
+
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.drop_schema(schema, cascade=cls.drop_cascades)
+
+        return to_return
+
+    @classmethod
+    def cache_new_relation(cls, relation):
+        """Record a relation that was created or rebuilt with SQL, rather
+        than through one of the functions above."""
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.add(relation)
+            cache.invalidate_columns(relation.schema, relation.identifier)
+
+    @classmethod
+    def invalidate_cached_relations(cls, schema=None):
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is not None:
+            cache.invalidate(schema)
+
     @classmethod
     def _make_match_kwargs(cls, project_cfg, schema, identifier):
         if identifier is not None and \
@@ -696,7 +840,7 @@ class DefaultAdapter(object):
         return connection
 
     @classmethod
-    def create_schema(cls, profile, project_cfg, schema, model_name=None):
+    def _create_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Creating schema "%s".', schema)
         sql = cls.get_create_schema_sql(project_cfg, schema)
         res = cls.add_query(profile, sql, model_name)
@@ -706,7 +850,7 @@ class DefaultAdapter(object):
         return res
 
     @classmethod
-    def drop_schema(cls, profile, project_cfg, schema, model_name=None):
+    def _drop_schema(cls, profile, project_cfg, schema, model_name=None):
         logger.debug('Dropping schema "%s".', schema)
         sql = cls.get_drop_schema_sql(project_cfg, schema)
         return cls.add_query(profile, sql, model_name)
@@ -119,8 +119,8 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
     # These require the profile AND project, as they need to know
     # database-specific configs at the project level.
     @classmethod
-    def alter_column_type(cls, profile, project, schema, table, column_name,
-                          new_column_type, model_name=None):
+    def _alter_column_type(cls, profile, project, schema, table, column_name,
+                           new_column_type, model_name=None):
         """
         1. Create a new column (w/ temp name and correct type)
         2. Copy data over to it
@@ -149,7 +149,7 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
         return connection, cursor
 
     @classmethod
-    def list_relations(cls, profile, project, schema, model_name=None):
+    def _list_relations(cls, profile, project, schema, model_name=None):
         sql = """
         select tablename as name, schemaname as schema, 'table' as type from pg_tables
         where schemaname ilike '{schema}'
@@ -175,7 +175,7 @@ class PostgresAdapter(dbt.adapters.default.DefaultAdapter):
                 for (name, _schema, type) in results]
 
     @classmethod
-    def get_existing_schemas(cls, profile, project, model_name=None):
+    def _get_existing_schemas(cls, profile, project, model_name=None):
         sql = "select distinct nspname from pg_namespace"
 
         connection, cursor = cls.add_query(profile, sql, model_name,
@@ -106,7 +106,7 @@ class SnowflakeAdapter(PostgresAdapter):
         return result
 
     @classmethod
-    def list_relations(cls, profile, project_cfg, schema, model_name=None):
+    def _list_relations(cls, profile, project_cfg, schema, model_name=None):
         sql = """
         select
           table_name as name, table_schema as schema, table_type as type
@@ -136,8 +136,8 @@ class SnowflakeAdapter(PostgresAdapter):
                 for (name, _schema, type) in results]
 
     @classmethod
-    def rename_relation(cls, profile, project_cfg, from_relation,
-                        to_relation, model_name=None):
+    def _rename_relation(cls, profile, project_cfg, from_relation,
+                         to_relation, model_name=None):
         sql = 'alter table {} rename to {}'.format(
             from_relation, to_relation)
 
@@ -148,7 +148,7 @@ class SnowflakeAdapter(PostgresAdapter):
         return cls.add_query(profile, 'BEGIN', name, auto_begin=False)
 
     @classmethod
-    def get_existing_schemas(cls, profile, project_cfg, model_name=None):
+    def _get_existing_schemas(cls, profile, project_cfg, model_name=None):
         sql = "select distinct schema_name from information_schema.schemata"
 
         connection, cursor = cls.add_query(profile, sql, model_name,
@@ -1,10 +1,14 @@
 import copy
+import json
 from collections import Mapping
 from jsonschema import Draft4Validator
 
 from dbt.exceptions import ValidationException
 from dbt.utils import deep_merge
 
+# Draft4Validators for each SCHEMA, by id
+_validators = {}
+
 
 class APIObject(Mapping):
     """
@@ -50,6 +54,16 @@ class APIObject(Mapping):
         """
         return copy.deepcopy(self._contents)
 
+    def to_json(self, encoder=None):
+        """
+        Return the JSON representation of this object. Unlike
+        serialize, this doesn't copy the object first.
+        """
+        if encoder is None:
+            encoder = json.JSONEncoder()
+
+        return encoder.encode(self._contents)
+
     @classmethod
     def deserialize(cls, settings):
         """
@@ -58,17 +72,31 @@ class APIObject(Mapping):
         """
         return cls(**settings)
 
+    @classmethod
+    def _get_validator(cls):
+        """Return a validator for the class's SCHEMA. Validators are built
+        once per schema, since objects like Relations are created for every
+        node."""
+        validator = _validators.get(id(cls.SCHEMA))
+
+        if validator is None or validator.schema is not cls.SCHEMA:
+            validator = Draft4Validator(cls.SCHEMA)
+            _validators[id(cls.SCHEMA)] = validator
+
+        return validator
+
     def validate(self):
         """
         Using the SCHEMA property, validate the attributes
         of this instance. If any attributes are missing or
         invalid, raise a ValidationException.
         """
-        validator = Draft4Validator(self.SCHEMA)
+        validator = self._get_validator()
 
         errors = set()  # make errors a set to avoid duplicates
 
-        for error in validator.iter_errors(self.serialize()):
+        # validation doesn't modify the contents, so they aren't copied
+        for error in validator.iter_errors(self._contents):
             errors.add('.'.join(
                 list(map(str, error.path)) + [error.message]
             ))
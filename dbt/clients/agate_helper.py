@@ -1,6 +1,10 @@
 
+import io
+
 import agate
 
+import dbt.compat
+
 DEFAULT_TYPE_TESTER = agate.TypeTester(types=[
     agate.data_types.Number(),
     agate.data_types.Date(),
@@ -39,3 +43,16 @@ def as_matrix(table):
 
 def from_csv(abspath):
     return agate.Table.from_csv(abspath, column_types=DEFAULT_TYPE_TESTER)
+
+
+def csv_header(abspath):
+    "Return the column names from the first row of a csv file"
+
+    # open the file the same way agate.Table.from_csv does
+    if dbt.compat.WHICH_PYTHON == 2:
+        handle = open(abspath, 'Urb')
+    else:
+        handle = io.open(abspath, encoding='utf-8')
+
+    with handle:
+        return next(agate.csv.reader(handle), [])
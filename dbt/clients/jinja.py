@@ -1,12 +1,18 @@
+import collections
+import threading
+
 import jinja2
 import jinja2._compat
+import jinja2.bccache
 import jinja2.ext
 import jinja2.nodes
 import jinja2.parser
 import jinja2.sandbox
 
+import dbt.clients.system
 import dbt.compat
 import dbt.exceptions
+import dbt.utils
 
 from dbt.node_types import NodeType
 from dbt.utils import AttrDict
@@ -42,6 +48,13 @@ def macro_generator(template, node):
     def apply_context(context):
         def call(*args, **kwargs):
             name = node.get('name')
+
+            # only present in contexts that record the macros they call, see
+            # BaseParser.parse_node and Compiler.compile_node
+            macro_calls = context.get('_macro_calls')
+            if macro_calls is not None:
+                macro_calls.add(node.get('unique_id'))
+
             module = template.make_module(
                 context, False, context)
 
@@ -126,53 +139,140 @@ class OperationExtension(jinja2.ext.Extension):
         return node
 
 
-def create_macro_capture_env(node):
+class ParserMacroCapture(jinja2.Undefined):
+    """
+    This class sets up the parser to capture macros.
+    """
+    def __init__(self, hint=None, obj=None, name=None,
+                 exc=None):
+        super(jinja2.Undefined, self).__init__()
 
-    class ParserMacroCapture(jinja2.Undefined):
-        """
-        This class sets up the parser to capture macros.
-        """
-        def __init__(self, hint=None, obj=None, name=None,
-                     exc=None):
-            super(jinja2.Undefined, self).__init__()
+        self.name = name
+        self.package_name = None
 
-            self.node = node
-            self.name = name
-            self.package_name = node.get('package_name')
+    def __getattr__(self, name):
 
-        def __getattr__(self, name):
+        # jinja uses these for safety, so we have to override them.
+        # see https://github.com/pallets/jinja/blob/master/jinja2/sandbox.py#L332-L339 # noqa
+        if name in ['unsafe_callable', 'alters_data']:
+            return False
 
-            # jinja uses these for safety, so we have to override them.
-            # see https://github.com/pallets/jinja/blob/master/jinja2/sandbox.py#L332-L339 # noqa
-            if name in ['unsafe_callable', 'alters_data']:
-                return False
+        self.package_name = self.name
+        self.name = name
 
-            self.package_name = self.name
-            self.name = name
+        return self
 
-            return self
+    def __call__(self, *args, **kwargs):
+        return True
 
-        def __call__(self, *args, **kwargs):
-            return True
 
-    return ParserMacroCapture
+# The number of compiled templates to keep in memory. Each entry is a python
+# code object, so this is cheap compared to compiling the template again.
+TEMPLATE_CACHE_SIZE = 1024
 
+# One environment per capture_macros mode. Environments are safe to share
+# once they're configured, and building one is not free.
+_environments = {}
 
-def get_template(string, ctx, node=None, capture_macros=False):
-    try:
+# Compiled template code, keyed by capture_macros mode and template source.
+# Entries are moved to the end when used, so the least recently used
+# template is always first.
+_template_cache = collections.OrderedDict()
+_template_cache_lock = threading.Lock()
+
+# An optional on-disk cache of compiled templates, shared between dbt
+# invocations. See set_bytecode_cache_dir.
+_bytecode_cache = None
+
+# Strings that contain none of these can't do anything when rendered, so
+# they aren't compiled or rendered at all.
+TEMPLATE_MARKERS = ('{{', '{%', '{#')
+
+# The number of strings rendered and the number skipped because they had no
+# template syntax. See get_render_counts.
+_render_counts = {'rendered': 0, 'skipped': 0}
+_render_counts_lock = threading.Lock()
+
+
+def get_environment(capture_macros=False):
+    env = _environments.get(capture_macros)
+
+    if env is None:
         args = {
             'extensions': []
         }
 
         if capture_macros:
-            args['undefined'] = create_macro_capture_env(node)
+            args['undefined'] = ParserMacroCapture
 
         args['extensions'].append(MaterializationExtension)
         args['extensions'].append(OperationExtension)
 
         env = MacroFuzzEnvironment(**args)
+        _environments[capture_macros] = env
+
+    return env
+
+
+def set_bytecode_cache_dir(path):
+    """Store compiled templates in the given directory so they can be reused
+    by later invocations. Passing None turns the on-disk cache off."""
+    global _bytecode_cache
+
+    if path is None:
+        _bytecode_cache = None
+        return
+
+    dbt.clients.system.make_directory(path)
+    _bytecode_cache = jinja2.bccache.FileSystemBytecodeCache(path)
+
+
+def clear_template_cache():
+    with _template_cache_lock:
+        _template_cache.clear()
+
+
+def _compile_from_disk(env, string, capture_macros):
+    name = '{}-{}'.format(capture_macros, dbt.utils.md5(string))
+    bucket = _bytecode_cache.get_bucket(env, name, None, string)
+
+    if bucket.code is None:
+        bucket.code = env.compile(string)
+        _bytecode_cache.set_bucket(bucket)
 
-        return env.from_string(dbt.compat.to_string(string), globals=ctx)
+    return bucket.code
+
+
+def get_template_code(env, string, capture_macros=False):
+    key = (capture_macros, string)
+
+    with _template_cache_lock:
+        code = _template_cache.pop(key, None)
+        if code is not None:
+            _template_cache[key] = code
+            return code
+
+    if _bytecode_cache is not None:
+        code = _compile_from_disk(env, string, capture_macros)
+    else:
+        code = env.compile(string)
+
+    with _template_cache_lock:
+        _template_cache[key] = code
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+
+    return code
+
+
+def get_template(string, ctx, node=None, capture_macros=False):
+    try:
+        env = get_environment(capture_macros)
+        code = get_template_code(env, dbt.compat.to_string(string),
+                                 capture_macros)
+
+        return env.template_class.from_code(env, code,
+                                            env.make_globals(ctx))
 
     except (jinja2.exceptions.TemplateSyntaxError,
             jinja2.exceptions.UndefinedError) as e:
@@ -190,8 +290,37 @@ def render_template(template, ctx, node=None):
         dbt.exceptions.raise_compiler_error(str(e), node)
 
 
+def is_template_free(string):
+    return not any(marker in string for marker in TEMPLATE_MARKERS)
+
+
+def _count_render(kind):
+    with _render_counts_lock:
+        _render_counts[kind] += 1
+
+
+def get_render_counts():
+    with _render_counts_lock:
+        return dict(_render_counts)
+
+
+def reset_render_counts():
+    with _render_counts_lock:
+        _render_counts['rendered'] = 0
+        _render_counts['skipped'] = 0
+
+
 def get_rendered(string, ctx, node=None,
                  capture_macros=False):
+    string = dbt.compat.to_string(string)
+
+    if is_template_free(string):
+        _count_render('skipped')
+        # this is what jinja does to plain text: newlines are normalized and
+        # the trailing newline is dropped
+        return u'\n'.join(string.splitlines())
+
+    _count_render('rendered')
     template = get_template(string, ctx, node,
                             capture_macros=capture_macros)
 
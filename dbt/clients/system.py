@@ -1,11 +1,13 @@
 import errno
 import fnmatch
+import hashlib
 import os
 import os.path
 import shutil
 import subprocess
 import sys
 import tarfile
+import uuid
 import requests
 import stat
 
@@ -65,6 +67,18 @@ def load_file_contents(path, strip=True):
     return to_return
 
 
+def file_md5(path, chunk_size=1024 * 1024):
+    """Return the md5 hexdigest of a file's contents, without reading the
+    whole file into memory."""
+    md5 = hashlib.md5()
+
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            md5.update(chunk)
+
+    return md5.hexdigest()
+
+
 def make_directory(path):
     """
     Make a directory and any intermediate directories that don't already
@@ -117,6 +131,25 @@ def write_file(path, contents=''):
     return True
 
 
+def write_file_atomic(path, contents=''):
+    """
+    Write `contents` to a temporary file next to `path`, then rename it into
+    place, so that nothing ever sees a partially written file at `path`.
+    """
+    make_directory(os.path.dirname(path))
+    temp_path = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+
+    try:
+        dbt.compat.write_file(temp_path, contents)
+        dbt.compat.replace_file(temp_path, path)
+    finally:
+        # only still there if writing or renaming it was interrupted
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return True
+
+
 def _windows_rmdir_readonly(func, path, exc):
     exception_val = exc[1]
     if exception_val.errno == errno.EACCES:
@@ -1,4 +1,5 @@
 import codecs
+import os
 
 WHICH_PYTHON = None
 
@@ -9,9 +10,11 @@ except NameError:
     WHICH_PYTHON = 3
 
 if WHICH_PYTHON == 2:
+    import Queue as queue
     basestring = basestring
     bigint = long
 else:
+    import queue
     basestring = str
     bigint = int
 
@@ -45,3 +48,13 @@ def write_file(path, s):
     else:
         with open(path, 'w') as f:
             return f.write(to_string(s))
+
+
+def replace_file(from_path, to_path):
+    if WHICH_PYTHON == 2:
+        # os.rename won't replace an existing file on windows
+        if os.name == 'nt' and os.path.exists(to_path):
+            os.remove(to_path)
+        os.rename(from_path, to_path)
+    else:
+        os.replace(from_path, to_path)
@@ -1,6 +1,6 @@
 import itertools
 import os
-import json
+import re
 from collections import OrderedDict, defaultdict
 import sqlparse
 
@@ -14,17 +14,18 @@ from dbt.utils import get_materialization, NodeType, is_type
 from dbt.linker import Linker
 
 import dbt.compat
+import dbt.compile_cache
 import dbt.context.runtime
 import dbt.contracts.graph.compiled
 import dbt.contracts.project
 import dbt.exceptions
 import dbt.flags
 import dbt.loader
+import dbt.writer
 
-from dbt.clients.system import write_file
 from dbt.logger import GLOBAL_LOGGER as logger
 
-graph_file_name = 'graph.gpickle'
+graph_file_name = 'graph.json'
 manifest_file_name = 'manifest.json'
 
 
@@ -59,12 +60,15 @@ def recursively_prepend_ctes(model, flat_graph):
         dbt.contracts.graph.compiled.CompiledNode(**model)
         dbt.contracts.graph.compiled.CompiledGraph(**flat_graph)
 
+    # Ephemeral models are only expanded once per compile. The expanded
+    # model replaces the original in the flat graph, so every model that
+    # refs it afterwards shares its CTEs instead of rebuilding them.
+    if model.get('extra_ctes_injected') is True:
+        return (model, model.get('extra_ctes'), flat_graph)
+
     model = model.copy()
     prepend_ctes = OrderedDict()
 
-    if model.get('all_ctes_injected') is True:
-        return (model, model.get('extra_ctes').keys(), flat_graph)
-
     for cte_id in model.get('extra_ctes', {}):
         cte_to_add = flat_graph.get('nodes').get(cte_id)
         cte_to_add, new_prepend_ctes, flat_graph = recursively_prepend_ctes(
@@ -113,6 +117,112 @@ def inject_ctes_into_sql(sql, ctes):
     if len(ctes) == 0:
         return sql
 
+    insertion_point = find_cte_insertion_point(sql)
+
+    if insertion_point is None:
+        return inject_ctes_with_sqlparse(sql, ctes)
+
+    index, has_with = insertion_point
+    joined_ctes = ", ".join(ctes.values())
+
+    if has_with:
+        # stmt exists, add a comma (which will come after injected CTEs)
+        return sql[:index] + joined_ctes + ',' + sql[index:]
+    else:
+        # no with stmt, add one, and inject CTEs right at the beginning
+        return sql[:index] + 'with' + joined_ctes + sql[index:]
+
+
+# The tokens find_cte_insertion_point needs to tell apart. Anything that
+# could change how sqlparse reads the statement, like a semicolon, a dollar
+# quote or an unterminated string or comment, is "ambiguous".
+SQL_TOKEN_REGEX = re.compile(r"""
+    (?P<whitespace>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:''|\\.|[^'\\])*'|"(?:""|[^"])*"|`(?:``|[^`])*`)
+  | (?P<word>[^\W\d]\w*)
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<ambiguous>[;$'"`]|/\*)
+  | (?P<other>[^\s\w'"`()/;$-]+|\w+|[/-])
+""", re.DOTALL | re.UNICODE | re.VERBOSE)
+
+
+def find_cte_insertion_point(sql):
+    """Find where inject_ctes_into_sql should put CTEs, without parsing the
+    sql. This only looks at the tokens that matter for a single statement
+    starting with SELECT or WITH: whitespace, comments, quoted strings,
+    words and parentheses.
+
+    Returns (index, has_with). If the statement starts with WITH, index is
+    the start of the token following it. Otherwise index is the start of
+    the first token, comments included. Returns None when the sql is
+    anything else, or when `with` appears anywhere after the first word, so
+    the caller can fall back to sqlparse.
+    """
+    pos = 0
+    depth = 0
+    first_token = None
+    first_word = None
+    after_with = None
+    expect_after_with = False
+
+    while pos < len(sql):
+        match = SQL_TOKEN_REGEX.match(sql, pos)
+        kind = match.lastgroup
+        start, pos = pos, match.end()
+
+        if kind == 'whitespace':
+            continue
+
+        if first_token is None:
+            first_token = start
+
+        if expect_after_with:
+            after_with = start
+            expect_after_with = False
+
+        if kind == 'comment':
+            continue
+
+        elif kind == 'ambiguous':
+            return None
+
+        elif first_word is None and (kind != 'word' or depth > 0):
+            # the statement doesn't start with a keyword
+            return None
+
+        elif kind == 'open':
+            depth += 1
+
+        elif kind == 'close':
+            depth -= 1
+            if depth < 0:
+                return None
+
+        elif kind == 'word':
+            word = match.group().lower()
+
+            if first_word is None:
+                first_word = word
+                expect_after_with = (word == 'with')
+
+            elif word == 'with':
+                return None
+
+    if depth != 0:
+        return None
+
+    elif first_word == 'with' and after_with is not None:
+        return (after_with, True)
+
+    elif first_word == 'select':
+        return (first_token, False)
+
+    return None
+
+
+def inject_ctes_with_sqlparse(sql, ctes):
     parsed_stmts = sqlparse.parse(sql)
     parsed = parsed_stmts[0]
 
@@ -150,7 +260,7 @@ class Compiler(object):
     def __write(self, build_filepath, payload):
         target_path = os.path.join(self.project['target-path'], build_filepath)
 
-        write_file(target_path, payload)
+        dbt.writer.write_if_changed(target_path, payload)
 
         return target_path
 
@@ -166,13 +276,32 @@ class Compiler(object):
             'injected_sql': None,
         })
 
-        context = dbt.context.runtime.generate(
-            compiled_node, self.project, flat_graph)
+        cache = dbt.compile_cache.get_active_cache()
+        entry = None
 
-        compiled_node['compiled_sql'] = dbt.clients.jinja.get_rendered(
-            node.get('raw_sql'),
-            context,
-            node)
+        if cache is not None:
+            cache_key = cache.node_key(node, flat_graph)
+            entry = cache.get(cache_key)
+
+        if entry is not None:
+            compiled_node['compiled_sql'] = entry['compiled_sql']
+            compiled_node['extra_ctes'] = OrderedDict(
+                (cte_id, None) for cte_id in entry['extra_ctes'])
+
+        else:
+            context = dbt.context.runtime.generate(
+                compiled_node, self.project, flat_graph)
+
+            if cache is not None:
+                context['_macro_calls'] = set()
+
+            compiled_node['compiled_sql'] = dbt.clients.jinja.get_rendered(
+                node.get('raw_sql'),
+                context,
+                node)
+
+            if cache is not None:
+                cache.set(cache_key, compiled_node, context['_macro_calls'])
 
         compiled_node['compiled'] = True
 
@@ -215,7 +344,10 @@ class Compiler(object):
         """
         filename = manifest_file_name
         manifest_path = os.path.join(self.project['target-path'], filename)
-        write_file(manifest_path, json.dumps(manifest.serialize()))
+
+        dbt.clients.system.make_directory(os.path.dirname(manifest_path))
+        with open(manifest_path, 'w') as handle:
+            manifest.write_json(handle)
 
     def write_graph_file(self, linker):
         filename = graph_file_name
@@ -242,7 +374,7 @@ class Compiler(object):
 
     def link_graph(self, linker, flat_graph):
         linked_graph = {
-            'nodes': {},
+            'nodes': dbt.utils.IndexedSubgraph(),
             'macros': flat_graph.get('macros')
         }
 
@@ -0,0 +1,315 @@
+import os
+import pickle
+import threading
+
+import jinja2.meta
+import jinja2.nodes
+
+import dbt.clients.jinja
+import dbt.clients.system
+import dbt.flags
+import dbt.parser.cache
+import dbt.utils
+import dbt.version
+
+from dbt.compat import basestring
+from dbt.logger import GLOBAL_LOGGER as logger
+
+COMPILE_CACHE_FILE_NAME = 'compile_cache.pickle'
+
+# Templates that use any of these names can render differently from one run
+# to the next with the same inputs, eg. by querying the database or reading
+# the environment, so their results are never cached.
+VOLATILE_NAMES = frozenset([
+    'adapter',
+    'context',
+    'env_var',
+    'graph',
+    'invocation_id',
+    'load_result',
+    'log',
+    'modules',
+    'run_started_at',
+    'store_result',
+    'write',
+    '_sql_results',
+])
+
+# Fields that are filled in by compilation, and so don't identify the inputs
+# to it.
+COMPILED_FIELDS = frozenset([
+    'build_path',
+    'compiled',
+    'compiled_sql',
+    'extra_ctes',
+    'extra_ctes_injected',
+    'injected_sql',
+    'wrapped_sql',
+])
+
+# The fields of a referenced node that ref() uses to build its relation.
+REF_FIELDS = ['unique_id', 'name', 'package_name', 'resource_type', 'schema',
+              'alias']
+
+# Whether each template source uses any volatile names, keyed by the hash of
+# the source and the name of the macro that was checked
+_volatile_sources = {}
+
+# The cache used by Compiler.compile_node while nodes are being run. Runners
+# build their own compilers, so this is simpler than passing the cache to
+# each of them.
+_active_cache = None
+
+
+def get_active_cache():
+    return _active_cache
+
+
+def set_active_cache(cache):
+    global _active_cache
+    _active_cache = cache
+
+
+def uses_volatile_names(source, macro_name=None):
+    """Return True if the template source uses any volatile names. If a
+    macro name is given, only the body of that macro is checked, so one
+    macro that calls the adapter doesn't stop the other macros in the same
+    file from being cached."""
+    if not source:
+        return False
+
+    key = (dbt.utils.md5(source), macro_name)
+    volatile = _volatile_sources.get(key)
+
+    if volatile is None:
+        env = dbt.clients.jinja.get_environment()
+        template = env.parse(source)
+
+        if macro_name is not None:
+            macro_names = [macro_name,
+                           dbt.utils.get_dbt_macro_name(macro_name),
+                           dbt.utils.get_dbt_operation_name(macro_name)]
+            bodies = [macro for macro
+                      in template.find_all(jinja2.nodes.Macro)
+                      if macro.name in macro_names]
+
+            if bodies:
+                template = jinja2.nodes.Template(bodies)
+                template.set_environment(env)
+
+        names = jinja2.meta.find_undeclared_variables(template)
+        volatile = len(names & VOLATILE_NAMES) > 0
+        _volatile_sources[key] = volatile
+
+    return volatile
+
+
+def is_volatile(node, macros, macro_calls, cli_vars):
+    """Return True if rendering the node could give a different result from
+    one run to the next with the same inputs, because its SQL, a macro it
+    called, or a var it can see uses a volatile name."""
+    if uses_volatile_names(node.get('raw_sql')):
+        return True
+
+    for unique_id in macro_calls:
+        macro = macros[unique_id]
+        if uses_volatile_names(macro.get('raw_sql'), macro.get('name')):
+            return True
+
+    # vars are rendered in the node's context when they're used
+    local_vars = dbt.utils.merge(
+        node.get('config', {}).get('vars', {}),
+        cli_vars)
+
+    return any(uses_volatile_names(value)
+               for value in local_vars.values()
+               if isinstance(value, basestring))
+
+
+class CompileCache(object):
+    """A cache of compiled SQL, persisted in the target directory between
+    invocations.
+
+    Entries are keyed by a hash of everything that goes into rendering a
+    node: the node itself, the relations of the nodes it refs, the project
+    config (and therefore --vars and the target), the set of macro names and
+    the flags that change `this`. Like the parse cache, each entry records
+    the hashes of the macros called while the node was rendered, so editing
+    a macro only invalidates the nodes that use it.
+
+    Nodes whose SQL, or any macro they call, uses something that can change
+    between runs (see VOLATILE_NAMES) are never cached.
+    """
+
+    def __init__(self, path, project_cfg, macros, entries=None,
+                 written=None):
+        self.path = path
+        self.entries = dbt.utils.coalesce(entries, {})
+        self.written = dbt.utils.coalesce(written, {})
+        self.used_entries = {}
+
+        self.macros = macros
+        self.cli_vars = project_cfg.get('cli_vars', {})
+        self.macro_digests = {
+            unique_id: dbt.utils.md5(macro.get('raw_sql'))
+            for unique_id, macro in macros.items()
+        }
+
+        self.inputs_digest = dbt.parser.cache.digest({
+            'project': project_cfg,
+            'macros': sorted(macros.keys()),
+            'non_destructive': dbt.flags.NON_DESTRUCTIVE,
+            'full_refresh': dbt.flags.FULL_REFRESH,
+        })
+
+        self.new_written = {}
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, target_path, project_cfg, macros):
+        path = os.path.join(target_path, COMPILE_CACHE_FILE_NAME)
+        saved = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as handle:
+                    saved = pickle.load(handle)
+
+                if saved.get('dbt_version') != dbt.version.__version__:
+                    saved = {}
+
+            except Exception as e:
+                logger.debug("Could not read the compile cache at {}, "
+                             "ignoring it: {}".format(path, e))
+
+        return cls(path, project_cfg, macros, saved.get('entries'),
+                   saved.get('written'))
+
+    def save(self):
+        """Write the entries used by this run back to disk, along with every
+        entry from earlier runs for nodes that weren't compiled this time."""
+        used_nodes = set(entry['unique_id']
+                         for entry in self.used_entries.values())
+
+        entries = {
+            key: entry for key, entry in self.entries.items()
+            if entry['unique_id'] not in used_nodes
+        }
+        entries.update(self.used_entries)
+
+        to_save = {
+            'dbt_version': dbt.version.__version__,
+            'entries': entries,
+            'written': self.written,
+        }
+
+        try:
+            dbt.clients.system.make_directory(os.path.dirname(self.path))
+            with open(self.path, 'wb') as handle:
+                pickle.dump(to_save, handle, pickle.HIGHEST_PROTOCOL)
+
+        except Exception as e:
+            logger.debug("Could not write the compile cache to {}: {}"
+                         .format(self.path, e))
+
+    def node_key(self, node, flat_graph):
+        nodes = flat_graph.get('nodes', {})
+        refs = []
+
+        for unique_id in node.get('depends_on', {}).get('nodes', []):
+            ref = nodes.get(unique_id, {})
+            refs.append([ref.get(field) for field in REF_FIELDS] +
+                        [dbt.utils.get_materialization(ref)])
+
+        return dbt.parser.cache.digest({
+            'inputs': self.inputs_digest,
+            'node': {key: value for key, value in node.items()
+                     if key not in COMPILED_FIELDS},
+            'refs': refs,
+        })
+
+    def _is_fresh(self, entry):
+        for unique_id, macro_digest in entry['macros'].items():
+            if self.macro_digests.get(unique_id) != macro_digest:
+                return False
+
+        return True
+
+    def get(self, key):
+        entry = self.entries.get(key)
+
+        with self.lock:
+            if entry is None or not self._is_fresh(entry):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.used_entries[key] = entry
+
+        return entry
+
+    def set(self, key, compiled_node, macro_calls):
+        if is_volatile(compiled_node, self.macros, macro_calls,
+                       self.cli_vars):
+            return
+
+        with self.lock:
+            self.used_entries[key] = {
+                'unique_id': compiled_node.get('unique_id'),
+                'compiled_sql': compiled_node.get('compiled_sql'),
+                'extra_ctes': list(compiled_node.get('extra_ctes', {})),
+                'macros': {
+                    unique_id: self.macro_digests.get(unique_id)
+                    for unique_id in macro_calls
+                },
+            }
+
+    def is_written(self, unique_id, path, payload):
+        """Return True if the payload was written to path by an earlier run,
+        and the file is still there."""
+        written = self.written.get(unique_id) == (path,
+                                                  dbt.utils.md5(payload))
+        return written and os.path.exists(path)
+
+    def set_written(self, unique_id, path, payload):
+        with self.lock:
+            self.written[unique_id] = (path, dbt.utils.md5(payload))
+            self.new_written[unique_id] = self.written[unique_id]
+
+    def forget_written(self, paths):
+        """Forget the files at the given paths, eg. because writing them
+        failed."""
+        paths = set(paths)
+
+        with self.lock:
+            for unique_id, (path, _) in list(self.written.items()):
+                if path in paths:
+                    del self.written[unique_id]
+
+    def start_batch(self):
+        """Start recording the cache activity of a batch of nodes, so it can
+        be sent from a compile worker back to the parent process."""
+        with self.lock:
+            self.used_entries = {}
+            self.new_written = {}
+            self.hits = 0
+            self.misses = 0
+
+    def get_batch(self):
+        with self.lock:
+            return {
+                'entries': self.used_entries,
+                'written': self.new_written,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def merge_batch(self, batch):
+        with self.lock:
+            self.used_entries.update(batch['entries'])
+            self.written.update(batch['written'])
+            self.hits += batch['hits']
+            self.misses += batch['misses']
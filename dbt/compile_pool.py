@@ -0,0 +1,195 @@
+import multiprocessing
+import traceback
+
+import dbt.adapters.cache
+import dbt.compile_cache
+import dbt.exceptions
+import dbt.flags
+import dbt.tracking
+import dbt.utils
+import dbt.writer
+
+from dbt.adapters.factory import get_adapter
+from dbt.contracts.graph.parsed import ParsedMacro
+from dbt.logger import GLOBAL_LOGGER as logger
+
+# flags that can change the result of compiling a node, and so need to be
+# copied into worker processes on platforms that don't fork
+WORKER_FLAGS = ['STRICT_MODE', 'NON_DESTRUCTIVE', 'FULL_REFRESH',
+                'USE_COMPILE_CACHE']
+
+# The fields of a node that are filled in by compiling it. These are the
+# only parts of a node that are sent back from the workers.
+COMPILED_FIELDS = ['compiled', 'compiled_sql', 'extra_ctes',
+                   'extra_ctes_injected', 'injected_sql', 'wrapped_sql',
+                   'build_path']
+
+# The pool used by CompileRunner.compile while `dbt compile` is running with
+# --compile-workers.
+_active_pool = None
+
+# The state of a worker process, set by _initialize_worker
+_worker_project = None
+_worker_flat_graph = None
+
+
+def get_active_pool():
+    return _active_pool
+
+
+def set_active_pool(pool):
+    global _active_pool
+    _active_pool = pool
+
+
+def _initialize_worker(project, nodes, serialized_macros, flag_values,
+                       active_user, cache_state):
+    global _worker_project, _worker_flat_graph
+
+    for name, value in flag_values.items():
+        setattr(dbt.flags, name, value)
+
+    if dbt.tracking.active_user is None:
+        dbt.tracking.active_user = active_user
+
+    # jinja templates can't be pickled, so each worker compiles the macro
+    # templates it needs from their raw_sql.
+    macros = {
+        unique_id: ParsedMacro(**macro)
+        for unique_id, macro in serialized_macros.items()
+    }
+
+    _worker_project = project
+    _worker_flat_graph = {'nodes': nodes, 'macros': macros}
+
+    cache = None
+    if cache_state is not None:
+        path, entries, written = cache_state
+        cache = dbt.compile_cache.CompileCache(
+            path, project.cfg, macros, entries, written)
+
+    dbt.compile_cache.set_active_cache(cache)
+
+    # a writer inherited from the parent by fork has no thread to drain it
+    dbt.writer.set_active_writer(None)
+    dbt.adapters.cache.set_active_cache(None)
+
+
+def _compile_in_worker(node, ephemeral_nodes):
+    # imported here to avoid a cycle, dbt.node_runners imports this module
+    from dbt.node_runners import CompileRunner
+
+    # ephemeral models are compiled before anything that refs them, so the
+    # parent sends along the compiled versions this node might inject
+    _worker_flat_graph['nodes'].update(ephemeral_nodes)
+
+    cache = dbt.compile_cache.get_active_cache()
+    if cache is not None:
+        cache.start_batch()
+
+    try:
+        adapter = get_adapter(_worker_project.run_environment())
+        compiled_node = CompileRunner._compile_node(
+            adapter, _worker_project, node, _worker_flat_graph)
+
+    except (Exception, dbt.exceptions.Exception):
+        # exceptions don't reliably survive a trip through pickle. The parent
+        # process compiles the node again to raise the error itself.
+        logger.debug("Error compiling {} in a worker process:\n{}"
+                     .format(node.get('unique_id'), traceback.format_exc()))
+        return None
+
+    compiled = {field: compiled_node.get(field) for field in COMPILED_FIELDS}
+
+    cache_updates = None
+    if cache is not None:
+        cache_updates = cache.get_batch()
+
+    return compiled, cache_updates
+
+
+class CompilePool(object):
+    """A pool of worker processes for compiling nodes.
+
+    Each worker gets a read-only copy of the project and the manifest when
+    it starts. Compiling a node only sends the node itself and the compiled
+    ephemeral models it depends on to a worker, and only the compiled
+    fields of the node come back. Errors are raised by compiling the node
+    again in the parent process, so error handling is the same as compiling
+    without workers.
+    """
+
+    def __init__(self, num_workers, project, flat_graph):
+        self.num_workers = num_workers
+        self.nodes = flat_graph.get('nodes', {})
+        self.ephemeral_ancestors = {}
+
+        serialized_macros = {
+            unique_id: macro.serialize()
+            for unique_id, macro in flat_graph.get('macros', {}).items()
+        }
+
+        flag_values = {name: getattr(dbt.flags, name)
+                       for name in WORKER_FLAGS}
+
+        cache = dbt.compile_cache.get_active_cache()
+        cache_state = None
+        if cache is not None:
+            cache_state = (cache.path, cache.entries, cache.written)
+
+        logger.debug("Starting {} compile workers".format(num_workers))
+        self.pool = multiprocessing.Pool(
+            num_workers, _initialize_worker,
+            (project, dict(self.nodes), serialized_macros, flag_values,
+             dbt.tracking.active_user, cache_state))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def terminate(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def get_ephemeral_ancestors(self, unique_id):
+        """Return the ids of the ephemeral models that could be injected
+        into the given node as CTEs: its ephemeral parents, their ephemeral
+        parents, and so on."""
+        if unique_id not in self.ephemeral_ancestors:
+            ancestors = set()
+            node = self.nodes.get(unique_id, {})
+
+            for parent_id in node.get('depends_on', {}).get('nodes', []):
+                parent = self.nodes.get(parent_id, {})
+
+                if dbt.utils.get_materialization(parent) == 'ephemeral':
+                    ancestors.add(parent_id)
+                    ancestors.update(self.get_ephemeral_ancestors(parent_id))
+
+            self.ephemeral_ancestors[unique_id] = ancestors
+
+        return self.ephemeral_ancestors[unique_id]
+
+    def compile_node(self, node, flat_graph):
+        """Compile the node in a worker process. Returns None if the worker
+        couldn't compile it."""
+        ephemeral_nodes = {
+            unique_id: flat_graph['nodes'][unique_id]
+            for unique_id in self.get_ephemeral_ancestors(
+                node.get('unique_id'))
+        }
+
+        output = self.pool.apply(_compile_in_worker, (node, ephemeral_nodes))
+
+        if output is None:
+            return None
+
+        compiled, cache_updates = output
+
+        cache = dbt.compile_cache.get_active_cache()
+        if cache is not None and cache_updates is not None:
+            cache.merge_batch(cache_updates)
+
+        compiled_node = node.copy()
+        compiled_node.update(compiled)
+        return compiled_node
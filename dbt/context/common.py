@@ -1,6 +1,9 @@
+import copy
 import json
 import os
 
+import jinja2
+
 from dbt.adapters.factory import get_adapter
 from dbt.compat import basestring
 from dbt.node_types import NodeType
@@ -37,24 +40,27 @@ class DatabaseWrapper(object):
         self.project = project
         self.Relation = adapter.Relation
 
-        # Fun with metaprogramming
-        # Most adapter functions take `profile` as the first argument, and
-        # `model_name` as the last. This automatically injects those arguments.
-        # In model code, these functions can be called without those two args.
-        for context_function in self.adapter.context_functions:
-            setattr(self,
-                    context_function,
-                    self.wrap(context_function, (self.profile, self.project,)))
-
-        for profile_function in self.adapter.profile_functions:
-            setattr(self,
-                    profile_function,
-                    self.wrap(profile_function, (self.profile,)))
-
-        for raw_function in self.adapter.raw_functions:
-            setattr(self,
-                    raw_function,
-                    getattr(self.adapter, raw_function))
+    # Fun with metaprogramming
+    # Most adapter functions take `profile` as the first argument, and
+    # `model_name` as the last. This automatically injects those arguments.
+    # In model code, these functions can be called without those two args.
+    # Wrappers are only built for the functions a template actually uses.
+    def __getattr__(self, name):
+        adapter = self.__dict__.get('adapter')
+
+        if adapter is not None:
+            if name in adapter.context_functions:
+                return self.wrap(name, (self.profile, self.project,))
+
+            elif name in adapter.profile_functions:
+                return self.wrap(name, (self.profile,))
+
+            elif name in adapter.raw_functions:
+                return getattr(adapter, name)
+
+        raise AttributeError(
+            "'{}' object has no attribute '{}'"
+            .format(type(self).__name__, name))
 
     def wrap(self, fn, arg_prefix):
         def wrapped(*args, **kwargs):
@@ -72,72 +78,99 @@ class DatabaseWrapper(object):
             self.profile, self.model.get('name'))
 
 
-def _add_macros(context, model, flat_graph):
-    macros_to_add = {'global': [], 'local': []}
+class Macro(object):
+    """A macro in a MacroNamespace. Namespaces are shared by every context
+    built from the same graph, so the macro is bound to the calling node's
+    context when it is called rather than when the context is built.
+    """
 
-    for unique_id, macro in flat_graph.get('macros', {}).items():
-        if macro.get('resource_type') != NodeType.Macro:
-            continue
-        package_name = macro.get('package_name')
+    def __init__(self, macro):
+        self.macro = macro
 
-        macro_map = {
-            macro.get('name'): macro.generator(context)
-        }
+    def bind(self, context):
+        """Return a function that calls the macro in the given dbt context."""
+        return self.macro.generator(context)
 
-        if context.get(package_name) is None:
-            context[package_name] = {}
+    @jinja2.contextfunction
+    def __call__(self, jinja_context, *args, **kwargs):
+        # every context built by generate() contains itself as 'context'
+        return self.bind(jinja_context.get('context'))(*args, **kwargs)
 
-        context.get(package_name, {}) \
-               .update(macro_map)
 
-        if package_name == model.get('package_name'):
-            macros_to_add['local'].append(macro_map)
-        elif package_name == dbt.include.GLOBAL_PROJECT_NAME:
-            macros_to_add['global'].append(macro_map)
+class MacroNamespace(object):
+    """The macros in a graph, grouped by package name."""
 
-    # Load global macros before local macros -- local takes precedence
-    unprefixed_macros = macros_to_add['global'] + macros_to_add['local']
-    for macro_map in unprefixed_macros:
-        context.update(macro_map)
+    def __init__(self, macros):
+        self.macros = macros
+        self.size = len(macros)
+        self.packages = {}
+        self.unprefixed = {}
 
-    return context
+        for unique_id, macro in macros.items():
+            if macro.get('resource_type') != NodeType.Macro:
+                continue
+
+            package_macros = self.packages.setdefault(
+                macro.get('package_name'), {})
+            package_macros[macro.get('name')] = Macro(macro)
+
+    def is_namespace_for(self, macros):
+        return self.macros is macros and self.size == len(macros)
+
+    def get_unprefixed(self, package_name):
+        """Return the macros that can be called without a package prefix from
+        the given package."""
+        if package_name not in self.unprefixed:
+            # Load global macros before local macros -- local takes precedence
+            unprefixed = {}
+            unprefixed.update(
+                self.packages.get(dbt.include.GLOBAL_PROJECT_NAME, {}))
+            unprefixed.update(self.packages.get(package_name, {}))
+            self.unprefixed[package_name] = unprefixed
+
+        return self.unprefixed[package_name]
+
+
+# The namespace for the most recently used macros. Every context for a run is
+# built from the same macros, so this is built once.
+_macro_namespace = None
 
 
-def _add_tracking(context):
+def get_macro_namespace(macros):
+    global _macro_namespace
+
+    namespace = _macro_namespace
+    if namespace is None or not namespace.is_namespace_for(macros):
+        namespace = MacroNamespace(macros)
+        _macro_namespace = namespace
+
+    return namespace
+
+
+def _get_tracking():
     if dbt.tracking.active_user is not None:
-        context = dbt.utils.merge(context, {
+        return {
             "run_started_at": dbt.tracking.active_user.run_started_at,
             "invocation_id": dbt.tracking.active_user.invocation_id,
-        })
+        }
     else:
-        context = dbt.utils.merge(context, {
+        return {
             "run_started_at": None,
             "invocation_id": None
-        })
-
-    return context
-
-
-def _add_validation(context):
-    def validate_any(*args):
-        def inner(value):
-            for arg in args:
-                if isinstance(arg, type) and isinstance(value, arg):
-                    return
-                elif value == arg:
-                    return
-            raise dbt.exceptions.ValidationException(
-                'Expected value "{}" to be one of {}'
-                .format(value, ','.join(map(str, args))))
-        return inner
+        }
 
-    validation_utils = dbt.utils.AttrDict({
-        'any': validate_any,
-    })
 
-    return dbt.utils.merge(
-        context,
-        {'validation': validation_utils})
+def _validate_any(*args):
+    def inner(value):
+        for arg in args:
+            if isinstance(arg, type) and isinstance(value, arg):
+                return
+            elif value == arg:
+                return
+        raise dbt.exceptions.ValidationException(
+            'Expected value "{}" to be one of {}'
+            .format(value, ','.join(map(str, args))))
+    return inner
 
 
 def _env_var(var, default=None):
@@ -172,13 +205,13 @@ def _load_result(sql_results):
     return call
 
 
-def _add_sql_handlers(context):
+def _get_sql_handlers():
     sql_results = {}
-    return dbt.utils.merge(context, {
+    return {
         '_sql_results': sql_results,
         'store_result': _store_result(sql_results),
         'load_result': _load_result(sql_results),
-    })
+    }
 
 
 def log(msg, info=False):
@@ -340,6 +373,117 @@ def create_adapter(adapter_type, relation_type):
     return AdapterWithContext
 
 
+class BaseContext(object):
+    """The parts of a context that are the same for every node in a package
+    while a project is being parsed or run. It's built once, and each call
+    to generate() starts from a copy of it.
+    """
+
+    def __init__(self, project_cfg, namespace, provider, package_name):
+        self.project_cfg = project_cfg
+
+        target_name = project_cfg.get('target')
+        self.profile = project_cfg.get('outputs').get(target_name)
+        target = self.profile.copy()
+        target.pop('pass', None)
+        target['name'] = target_name
+
+        self.target = target
+
+        adapter = get_adapter(self.profile)
+        self.relation_type = create_relation(adapter.Relation,
+                                             project_cfg.get('quoting'))
+        self.adapter = create_adapter(adapter, self.relation_type)
+        self.default_schema = self.profile.get('schema', 'public')
+
+        self.context = {
+            "env": target,
+            "api": {
+                "Relation": self.relation_type,
+                "Column": adapter.Column,
+            },
+            "column": adapter.Column,
+            "env_var": _env_var,
+            "exceptions": dbt.exceptions,
+            "execute": provider.execute,
+            "flags": dbt.flags,
+            "log": log,
+            "modules": {
+                "pytz": pytz,
+                "datetime": datetime
+            },
+            "return": _return,
+            "sql_now": adapter.date_function(),
+            "fromjson": fromjson,
+            "tojson": tojson,
+            "target": target,
+            "validation": dbt.utils.AttrDict({
+                'any': _validate_any,
+            }),
+        }
+
+        # macros take precedence over everything but the functions that are
+        # bound to the node in generate()
+        for name, package_macros in namespace.packages.items():
+            if self.context.get(name) is None:
+                self.context[name] = package_macros
+            else:
+                self.context[name] = dbt.utils.merge(self.context[name],
+                                                     package_macros)
+
+        unprefixed = namespace.get_unprefixed(package_name)
+        self.context.update(unprefixed)
+
+        self.macro_names = frozenset(namespace.packages) | \
+            frozenset(unprefixed)
+
+
+# Entries of the base context that templates can change. Each node gets its
+# own copy of them, so a change made while rendering one node doesn't show up
+# in the others.
+MUTABLE_BASE_ENTRIES = ['api', 'modules', 'validation']
+
+# The base contexts built from the most recently used macro namespace, by
+# project, provider and package
+_base_namespace = None
+_base_contexts = {}
+
+# The most recently used project config and its digest
+_project_digest = (None, None)
+
+
+def get_project_digest(project_cfg):
+    global _project_digest
+
+    last_project_cfg, digest = _project_digest
+
+    if last_project_cfg is not project_cfg:
+        digest = dbt.utils.md5(json.dumps(project_cfg, sort_keys=True,
+                                          default=str))
+        _project_digest = (project_cfg, digest)
+
+    return digest
+
+
+def get_base_context(project_cfg, flat_graph, provider, package_name):
+    global _base_namespace, _base_contexts
+
+    namespace = get_macro_namespace(flat_graph.get('macros', {}))
+    if namespace is not _base_namespace:
+        _base_namespace = namespace
+        _base_contexts = {}
+
+    key = (project_cfg.get('name'), get_project_digest(project_cfg),
+           provider, package_name)
+    base = _base_contexts.get(key)
+
+    if base is None:
+        base = BaseContext(project_cfg, namespace, provider, package_name)
+        _base_contexts[key] = base
+
+    return base
+
+
 def generate(model, project_cfg, flat_graph, provider=None):
     """
     Not meant to be called directly. Call with either:
@@ -351,74 +495,51 @@ def generate(model, project_cfg, flat_graph, provider=None):
         raise dbt.exceptions.InternalException(
             "Invalid provider given to context: {}".format(provider))
 
-    target_name = project_cfg.get('target')
-    profile = project_cfg.get('outputs').get(target_name)
-    target = profile.copy()
-    target.pop('pass', None)
-    target['name'] = target_name
-    adapter = get_adapter(profile)
-
-    context = {'env': target}
-    schema = profile.get('schema', 'public')
-
-    pre_hooks = model.get('config', {}).get('pre-hook')
-    post_hooks = model.get('config', {}).get('post-hook')
+    base = get_base_context(project_cfg, flat_graph, provider,
+                            model.get('package_name'))
+    profile = base.profile
 
-    relation_type = create_relation(adapter.Relation,
-                                    project_cfg.get('quoting'))
-
-    db_wrapper = DatabaseWrapper(model,
-                                 create_adapter(adapter, relation_type),
-                                 profile,
-                                 project_cfg)
+    db_wrapper = DatabaseWrapper(model, base.adapter, profile, project_cfg)
 
     cli_var_overrides = project_cfg.get('cli_vars', {})
 
-    context = dbt.utils.merge(context, {
+    node_context = {
         "adapter": db_wrapper,
-        "api": {
-            "Relation": relation_type,
-            "Column": adapter.Column,
-        },
-        "column": adapter.Column,
         "config": provider.Config(model),
-        "env_var": _env_var,
-        "exceptions": dbt.exceptions,
-        "execute": provider.execute,
-        "flags": dbt.flags,
         "graph": flat_graph,
-        "log": log,
         "model": model,
-        "modules": {
-            "pytz": pytz,
-            "datetime": datetime
-        },
-        "post_hooks": post_hooks,
-        "pre_hooks": pre_hooks,
+        "post_hooks": model.get('config', {}).get('post-hook'),
+        "pre_hooks": model.get('config', {}).get('pre-hook'),
         "ref": provider.ref(db_wrapper, model, project_cfg,
                             profile, flat_graph),
-        "return": _return,
-        "schema": model.get('schema', schema),
+        "schema": model.get('schema', base.default_schema),
         "sql": model.get('injected_sql'),
-        "sql_now": adapter.date_function(),
-        "fromjson": fromjson,
-        "tojson": tojson,
-        "target": target,
         "try_or_compiler_error": try_or_compiler_error(model)
-    })
+    }
 
     # Operations do not represent database relations, so 'this' does not apply
     if model.get('resource_type') != NodeType.Operation:
-        context["this"] = get_this_relation(db_wrapper, project_cfg, profile,
-                                            model)
+        node_context["this"] = get_this_relation(db_wrapper, project_cfg,
+                                                 profile, model)
+
+    node_context.update(_get_tracking())
+    node_context.update(_get_sql_handlers())
+
+    context = base.context.copy()
 
-    context = _add_tracking(context)
-    context = _add_validation(context)
-    context = _add_sql_handlers(context)
+    for name, value in node_context.items():
+        if name not in base.macro_names:
+            context[name] = value
 
-    # we make a copy of the context for each of these ^^
+    for name in MUTABLE_BASE_ENTRIES:
+        if name not in base.macro_names:
+            context[name] = copy.copy(base.context[name])
 
-    context = _add_macros(context, model, flat_graph)
+    # env is another name for target
+    target = base.target.copy()
+    for name in ['env', 'target']:
+        if name not in base.macro_names:
+            context[name] = target
 
     context["write"] = write(model, project_cfg.get('target-path'), 'run')
     context["render"] = render(context, model)
@@ -1,5 +1,7 @@
+import json
+
 from dbt.api import APIObject
-from dbt.utils import deep_merge
+from dbt.utils import deep_merge, IndexedSubgraph
 from dbt.node_types import NodeType
 
 import dbt.clients.jinja
@@ -290,9 +292,20 @@ class ParsedMacro(APIObject):
     SCHEMA = PARSED_MACRO_CONTRACT
 
     def __init__(self, template=None, **kwargs):
-        self.template = template
+        self._template = template
         super(ParsedMacro, self).__init__(**kwargs)
 
+    @property
+    def template(self):
+        """The compiled jinja template for the file this macro came from.
+        Macros loaded from the parse cache don't have one until it's needed.
+        """
+        if self._template is None:
+            self._template = dbt.clients.jinja.get_template(
+                self.raw_sql, {}, node=self)
+
+        return self._template
+
     @property
     def generator(self):
         """
@@ -337,8 +350,8 @@ class ParsedManifest(object):
         """The constructor. nodes and macros are dictionaries mapping unique
         IDs to ParsedNode and ParsedMacro objects, respectively.
         """
-        self.nodes = nodes
-        self.macros = macros
+        self.nodes = IndexedSubgraph(nodes)
+        self.macros = IndexedSubgraph(macros)
 
     def serialize(self):
         """Convert the parsed manifest to a nested dict structure that we can
@@ -353,6 +366,43 @@ class ParsedManifest(object):
             'child_map': forward_edges,
         }
 
+    def write_json(self, handle):
+        """Write the serialized manifest to an open file as JSON, one node or
+        macro at a time. This produces the same document as serialize, but
+        without copying every node or holding the whole document in memory.
+        """
+        encoder = json.JSONEncoder()
+        forward_edges, backward_edges = build_edges(self.nodes.values())
+
+        def encode_object(value):
+            return value.to_json(encoder)
+
+        sections = [
+            ('nodes', self.nodes, encode_object),
+            ('macros', self.macros, encode_object),
+            ('parent_map', backward_edges, encoder.encode),
+            ('child_map', forward_edges, encoder.encode),
+        ]
+
+        handle.write('{')
+
+        for i, (section_name, section, encode) in enumerate(sections):
+            if i > 0:
+                handle.write(', ')
+
+            handle.write('{}: {{'.format(encoder.encode(section_name)))
+
+            for j, (unique_id, value) in enumerate(section.items()):
+                if j > 0:
+                    handle.write(', ')
+
+                handle.write('{}: '.format(encoder.encode(unique_id)))
+                handle.write(encode(value))
+
+            handle.write('}')
+
+        handle.write('}')
+
     def _find_by_name(self, name, package, subgraph, nodetype):
         """
 
@@ -388,6 +438,7 @@ class ParsedManifest(object):
         Ideally in the future we won't need to have this method.
         """
         return {
-            'nodes': {k: v.to_dict() for k, v in self.nodes.items()},
+            'nodes': IndexedSubgraph(
+                (k, v.to_dict()) for k, v in self.nodes.items()),
             'macros': self.macros,
         }
@@ -71,7 +71,34 @@ UNPARSED_NODE_CONTRACT = deep_merge(
                     # we need this if parse_node is going to handle archives.
                     NodeType.Archive,
                 ]
-            }
+            },
+            'seed_file': {
+                'type': 'object',
+                'additionalProperties': False,
+                'description': (
+                    'For seeds, the csv file the seed is loaded from. The '
+                    'rows are not read until the seed is run.'),
+                'properties': {
+                    'path': {
+                        'type': 'string',
+                        'description': 'The absolute path to the csv file',
+                    },
+                    'size': {
+                        'type': 'integer',
+                    },
+                    'hash': {
+                        'type': 'string',
+                        'description': 'The md5 hash of the file contents',
+                    },
+                    'header': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'string',
+                        },
+                    },
+                },
+                'required': ['path', 'size', 'hash', 'header'],
+            },
         },
         'required': UNPARSED_BASE_CONTRACT['required'] + [
             'resource_type', 'name']
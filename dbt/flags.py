@@ -1,11 +1,20 @@
 STRICT_MODE = False
 NON_DESTRUCTIVE = False
 FULL_REFRESH = False
+PARSE_WORKERS = 1
+USE_PARSE_CACHE = True
+USE_COMPILE_CACHE = True
+USE_RELATION_CACHE = True
 
 
 def reset():
-    global STRICT_MODE, NON_DESTRUCTIVE, FULL_REFRESH
+    global STRICT_MODE, NON_DESTRUCTIVE, FULL_REFRESH, PARSE_WORKERS, \
+        USE_PARSE_CACHE, USE_COMPILE_CACHE, USE_RELATION_CACHE
 
     STRICT_MODE = False
     NON_DESTRUCTIVE = False
     FULL_REFRESH = False
+    PARSE_WORKERS = 1
+    USE_PARSE_CACHE = True
+    USE_COMPILE_CACHE = True
+    USE_RELATION_CACHE = True
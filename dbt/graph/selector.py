@@ -1,4 +1,3 @@
-import networkx as nx
 from dbt.logger import GLOBAL_LOGGER as logger
 
 from dbt.utils import is_enabled, get_materialization, coalesce
@@ -73,50 +72,152 @@ def is_selected_node(real_node, node_selector):
     return True
 
 
-def get_nodes_by_qualified_name(graph, qualified_name):
-    """ returns a node if matched, else throws a CompilerError. qualified_name
-    should be either 1) a node name or 2) a dot-notation qualified selector"""
+class FQNTrieNode(object):
+    def __init__(self):
+        self.children = {}
+        # every node at or below this point in the trie, and the same nodes
+        # keyed by their name (the last part of their fqn)
+        self.nodes = set()
+        self.nodes_by_name = {}
 
-    package_names = get_package_names(graph)
+    def add(self, node, name):
+        self.nodes.add(node)
+        self.nodes_by_name.setdefault(name, set()).add(node)
 
-    for node in graph.nodes():
-        fqn_ish = graph.node[node]['fqn']
 
-        if len(qualified_name) == 1 and fqn_ish[-1] == qualified_name[0]:
-            yield node
+class FQNIndex(object):
+    """A prefix trie over the fqns of the nodes in a graph. Looking up a
+    qualified name walks down the trie once, so a lookup costs the length of
+    the qualified name plus the number of nodes it matches. Matches are the
+    same as is_selected_node would make for each node in the graph.
 
-        elif qualified_name[0] in package_names:
-            if is_selected_node(fqn_ish, qualified_name):
-                yield node
+    get_node returns the data of a node, eg. Linker.get_node. It defaults to
+    reading the graph's node data directly."""
+
+    def __init__(self, graph, get_node=None):
+        if get_node is None:
+            get_node = graph.node.__getitem__
+
+        self.root = FQNTrieNode()
+        self.package_names = get_package_names(graph)
+
+        for node in graph.nodes():
+            self.add(node, get_node(node)['fqn'])
+
+    def add(self, node, fqn):
+        trie_node = self.root
+        trie_node.add(node, fqn[-1])
+
+        for part in fqn:
+            if part not in trie_node.children:
+                trie_node.children[part] = FQNTrieNode()
+
+            trie_node = trie_node.children[part]
+            trie_node.add(node, fqn[-1])
+
+    def match(self, trie_node, node_selector):
+        """Return the nodes below trie_node whose remaining fqn matches
+        node_selector"""
+        matched = set()
+
+        for i, selector_part in enumerate(node_selector):
+            # a glob selects everything from here down
+            if selector_part == SELECTOR_GLOB:
+                return matched | trie_node.nodes
+
+            child = trie_node.children.get(selector_part)
+
+            if i == len(node_selector) - 1:
+                # the last part matches node names at any depth, or else a
+                # node or directory at this level
+                matched.update(trie_node.nodes_by_name.get(selector_part, ()))
+
+                if child is not None:
+                    matched.update(child.nodes)
+
+                return matched
+
+            elif child is None:
+                return matched
+
+            trie_node = child
+
+        return matched | trie_node.nodes
+
+    def get_nodes(self, qualified_name):
+        selected = set()
+
+        if len(qualified_name) == 1:
+            selected.update(
+                self.root.nodes_by_name.get(qualified_name[0], ()))
+
+        if qualified_name[0] in self.package_names:
+            selected.update(self.match(self.root, qualified_name))
 
         else:
-            for package_name in package_names:
-                local_qualified_node_name = [package_name] + qualified_name
-                if is_selected_node(fqn_ish, local_qualified_node_name):
-                    yield node
-                    break
+            for package_name in self.package_names:
+                package = self.root.children.get(package_name)
+
+                if package is not None:
+                    selected.update(self.match(package, qualified_name))
 
+        return selected
 
-def get_nodes_from_spec(graph, spec):
+
+def get_nodes_by_qualified_name(graph, qualified_name, fqn_index=None):
+    """ returns the nodes in the graph matched by qualified_name, which
+    should be either 1) a node name or 2) a dot-notation qualified selector.
+    fqn_index can be an FQNIndex over this graph or a graph containing it,
+    to save building a new one."""
+
+    if fqn_index is None:
+        fqn_index = FQNIndex(graph)
+
+    return set(node for node in fqn_index.get_nodes(qualified_name)
+               if node in graph)
+
+
+def get_reachable(nodes, get_neighbors):
+    """Return every node reachable from any of the given nodes, not counting
+    the nodes themselves unless they're reachable from one another. This is
+    a single traversal for the whole set, so nodes shared by the closures of
+    several of the given nodes are only visited once."""
+    reachable = set()
+    to_visit = list(nodes)
+
+    while to_visit:
+        for neighbor in get_neighbors(to_visit.pop()):
+            if neighbor not in reachable:
+                reachable.add(neighbor)
+                to_visit.append(neighbor)
+
+    return reachable
+
+
+def get_ancestors(graph, nodes):
+    return get_reachable(nodes, graph.predecessors_iter)
+
+
+def get_descendants(graph, nodes):
+    return get_reachable(nodes, graph.successors_iter)
+
+
+def get_nodes_from_spec(graph, spec, fqn_index=None):
     select_parents = spec['select_parents']
     select_children = spec['select_children']
     qualified_node_name = spec['qualified_node_name']
 
-    selected_nodes = set(get_nodes_by_qualified_name(graph,
-                                                     qualified_node_name))
+    selected_nodes = get_nodes_by_qualified_name(graph, qualified_node_name,
+                                                 fqn_index)
 
     additional_nodes = set()
     test_nodes = set()
 
     if select_parents:
-        for node in selected_nodes:
-            parent_nodes = nx.ancestors(graph, node)
-            additional_nodes.update(parent_nodes)
+        additional_nodes.update(get_ancestors(graph, selected_nodes))
 
     if select_children:
-        for node in selected_nodes:
-            child_nodes = nx.descendants(graph, node)
-            additional_nodes.update(child_nodes)
+        additional_nodes.update(get_descendants(graph, selected_nodes))
 
     model_nodes = selected_nodes | additional_nodes
 
@@ -141,9 +242,13 @@ def warn_if_useless_spec(spec, nodes):
     )
 
 
-def select_nodes(graph, raw_include_specs, raw_exclude_specs):
+def select_nodes(graph, raw_include_specs, raw_exclude_specs,
+                 fqn_index=None):
     selected_nodes = set()
 
+    if fqn_index is None:
+        fqn_index = FQNIndex(graph)
+
     split_include_specs = split_specs(raw_include_specs)
     split_exclude_specs = split_specs(raw_exclude_specs)
 
@@ -151,12 +256,12 @@ def select_nodes(graph, raw_include_specs, raw_exclude_specs):
     exclude_specs = [parse_spec(spec) for spec in split_exclude_specs]
 
     for spec in include_specs:
-        included_nodes = get_nodes_from_spec(graph, spec)
+        included_nodes = get_nodes_from_spec(graph, spec, fqn_index)
         warn_if_useless_spec(spec, included_nodes)
         selected_nodes = selected_nodes | included_nodes
 
     for spec in exclude_specs:
-        excluded_nodes = get_nodes_from_spec(graph, spec)
+        excluded_nodes = get_nodes_from_spec(graph, spec, fqn_index)
         warn_if_useless_spec(spec, excluded_nodes)
         selected_nodes = selected_nodes - excluded_nodes
 
@@ -168,6 +273,10 @@ class NodeSelector(object):
         self.linker = linker
         self.flat_graph = flat_graph
 
+        # selection reads every node, so load them all at once
+        self.linker.load_nodes()
+        self.fqn_index = FQNIndex(linker.graph, linker.get_node)
+
     def get_valid_nodes(self, graph):
         valid = []
         for node_name in graph.nodes():
@@ -186,7 +295,8 @@ class NodeSelector(object):
 
         to_run = self.get_valid_nodes(graph)
         filtered_graph = graph.subgraph(to_run)
-        selected_nodes = select_nodes(filtered_graph, include, exclude)
+        selected_nodes = select_nodes(filtered_graph, include, exclude,
+                                      self.fqn_index)
 
         filtered_nodes = set()
         for node_name in selected_nodes:
@@ -208,22 +318,10 @@ class NodeSelector(object):
 
     def get_ancestor_ephemeral_nodes(self, flat_graph, linked_graph,
                                      selected_nodes):
-
-        node_names = {
-            node: flat_graph['nodes'].get(node).get('name')
-            for node in selected_nodes
-            if node in flat_graph['nodes']
-        }
-
-        include_spec = [
-            '+{}'.format(node_names[node])
-            for node in selected_nodes if node in node_names
-        ]
-
-        all_ancestors = select_nodes(linked_graph, include_spec, [])
+        ancestors = get_ancestors(linked_graph, selected_nodes)
 
         res = []
-        for ancestor in all_ancestors:
+        for ancestor in ancestors | set(selected_nodes):
             ancestor_node = flat_graph['nodes'].get(ancestor, None)
 
             if ancestor_node and self.is_ephemeral_model(ancestor_node):
@@ -36,6 +36,7 @@
 #}
 {% macro create_columns(relation, columns) %}
   {{ adapter_macro('create_columns', relation, columns) }}
+  {{ adapter.invalidate_cached_columns(relation) }}
 {% endmacro %}
 
 {% macro default__create_columns(relation, columns) %}
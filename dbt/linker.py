@@ -1,6 +1,11 @@
+import json
+import os
+
 import networkx as nx
 from collections import defaultdict
 
+import dbt.clients.system
+import dbt.exceptions
 import dbt.utils
 
 
@@ -8,6 +13,8 @@ GRAPH_SERIALIZE_BLACKLIST = [
     'agate_table'
 ]
 
+GRAPH_FORMAT_VERSION = 1
+
 
 def from_file(graph_file):
     linker = Linker()
@@ -16,11 +23,48 @@ def from_file(graph_file):
     return linker
 
 
+def get_payload_file_name(graph_file):
+    """Node payloads are stored next to the graph file, eg. graph.json keeps
+    its node data in graph.nodes.jsonl"""
+    base, _ = os.path.splitext(graph_file)
+    return '{}.nodes.jsonl'.format(base)
+
+
+class NodePayloads(object):
+    """Reads the data of single nodes out of a payload file written by
+    Linker.write_graph, one JSON document per line. The graph file records
+    the byte offset of each node's line, so a node can be read without
+    loading the rest of the file."""
+
+    def __init__(self, path, offsets):
+        self.path = path
+        self.offsets = offsets
+
+    def __contains__(self, node):
+        return node in self.offsets
+
+    def load(self, node):
+        return self.load_many([node])[node]
+
+    def load_many(self, nodes):
+        """Read the data of each of the given nodes, opening the payload file
+        once. Returns a dict of node to data."""
+        loaded = {}
+
+        with open(self.path, 'rb') as fh:
+            for node in sorted(nodes, key=self.offsets.get):
+                fh.seek(self.offsets[node])
+                loaded[node] = json.loads(fh.readline().decode('utf-8'))
+
+        return loaded
+
+
 class Linker(object):
     def __init__(self, data=None):
         if data is None:
             data = {}
         self.graph = nx.DiGraph(**data)
+        self.payloads = None
 
     def edges(self):
         return self.graph.edges()
@@ -29,22 +73,125 @@ class Linker(object):
         return self.graph.nodes()
 
     def get_node(self, node):
-        return self.graph.node[node]
+        data = self.graph.node[node]
+
+        # graphs read from disk load node data the first time it's needed
+        if (len(data) == 0 and self.payloads is not None and
+                node in self.payloads):
+            data.update(self.payloads.load(node))
+
+        return data
+
+    def load_nodes(self):
+        """Load the data of every node that hasn't been loaded yet, reading
+        the payload file once rather than once per node."""
+        if self.payloads is None:
+            return
+
+        to_load = [node for node, data in self.graph.nodes_iter(data=True)
+                   if len(data) == 0 and node in self.payloads]
+
+        if to_load:
+            for node, data in self.payloads.load_many(to_load).items():
+                self.graph.node[node].update(data)
 
     def find_cycles(self):
-        # There's a networkx find_cycle function, but there's a bug in the
-        # nx 1.11 release that prevents us from using it. We should use that
-        # function when we upgrade to 2.X. More info:
-        #     https://github.com/networkx/networkx/pull/2473
-        cycles = list(nx.simple_cycles(self.graph))
+        """Return the first cycle in the graph as a string, or None if the
+        graph is acyclic. This is an iterative depth-first search that stops
+        at the first edge leading back to a node on the current path, so
+        each node and edge is visited at most once."""
+        visited = set()
+
+        for start in self.graph.nodes_iter():
+            if start in visited:
+                continue
+
+            visited.add(start)
+            path = [start]
+            on_path = set(path)
+            stack = [self.graph.successors_iter(start)]
 
-        if len(cycles) > 0:
-            cycle_nodes = cycles[0]
-            cycle_nodes.append(cycle_nodes[0])
-            return " --> ".join(cycle_nodes)
+            while stack:
+                child = next(stack[-1], None)
+
+                if child is None:
+                    stack.pop()
+                    on_path.discard(path.pop())
+
+                elif child in on_path:
+                    cycle_nodes = path[path.index(child):]
+                    cycle_nodes.append(child)
+                    return " --> ".join(cycle_nodes)
+
+                elif child not in visited:
+                    visited.add(child)
+                    path.append(child)
+                    on_path.add(child)
+                    stack.append(self.graph.successors_iter(child))
 
         return None
 
+    def get_node_depths(self, ephemeral_only=False):
+        """Return a dict mapping each node in the graph to its depth: the
+        largest number of blocking dependencies on any path leading to it. If
+        ephemeral_only is set, only ephemeral blocking dependencies are
+        counted. This is one pass over the graph in topological order.
+        """
+        depths = {}
+
+        for node in nx.topological_sort(self.graph):
+            depth = 0
+
+            for parent in self.graph.predecessors(node):
+                parent_data = self.get_node(parent)
+                parent_depth = depths[parent]
+
+                if (dbt.utils.is_blocking_dependency(parent_data) and
+                    (ephemeral_only is False or
+                     dbt.utils.get_materialization(
+                         parent_data) == 'ephemeral')):
+                    parent_depth += 1
+
+                depth = max(depth, parent_depth)
+
+            depths[node] = depth
+
+        return depths
+
+    def get_blocking_dependencies(self, limit_to):
+        """Return a dict mapping each node in limit_to to the set of nodes in
+        limit_to that have to finish before it can run: the nearest blocking
+        dependency in limit_to on each path leading to the node. Nodes that
+        aren't in limit_to are looked through, so a node still waits for a
+        selected grandparent when its parent wasn't selected.
+        """
+        return self._get_nearest_dependencies(
+            limit_to, dbt.utils.is_blocking_dependency)
+
+    def get_upstream_dependencies(self, limit_to):
+        """Return a dict mapping each node in limit_to to the nearest nodes
+        in limit_to on each path leading to it, blocking or not. A node is
+        downstream of everything reachable through these sets."""
+        return self._get_nearest_dependencies(limit_to, lambda node: True)
+
+    def _get_nearest_dependencies(self, limit_to, is_dependency):
+        limit_to = set(limit_to)
+        waits_for = {}
+
+        for node in nx.topological_sort(self.graph):
+            node_waits_for = set()
+
+            for parent in self.graph.predecessors(node):
+                if (parent in limit_to and
+                        is_dependency(self.get_node(parent))):
+                    node_waits_for.add(parent)
+                else:
+                    node_waits_for.update(waits_for[parent])
+
+            waits_for[node] = node_waits_for
+
+        return {node: waits_for[node] for node in limit_to}
+
     def as_dependency_list(self, limit_to=None, ephemeral_only=False):
         """returns a list of list of nodes, eg. [[0,1], [2], [4,5,6]]. Each
         element contains nodes whose dependenices are subsumed by the union of
@@ -66,17 +213,10 @@ class Linker(object):
                     "it disabled?".format(node)
                 )
 
-            num_ancestors = len([
-                ancestor for ancestor in
-                nx.ancestors(self.graph, node)
-                if (dbt.utils.is_blocking_dependency(
-                        self.get_node(ancestor)) and
-                    (ephemeral_only is False or
-                     dbt.utils.get_materialization(
-                         self.get_node(ancestor)) == 'ephemeral'))
-            ])
+        depths = self.get_node_depths(ephemeral_only)
 
-            depth_nodes[num_ancestors].append(node)
+        for node in graph_nodes:
+            depth_nodes[depths[node]].append(node)
 
         dependency_list = []
         for depth in sorted(depth_nodes.keys()):
@@ -105,20 +245,58 @@ class Linker(object):
         self.graph.add_node(node, data)
 
     def write_graph(self, outfile):
-        out_graph = self.remove_blacklisted_attributes_from_nodes(self.graph)
-        nx.write_gpickle(out_graph, outfile)
+        """Write the graph to outfile as a list of node ids and a list of
+        edges between them, stored as pairs of indexes into the node list.
+        The data of each node goes to a separate payload file, written one
+        node at a time."""
+        node_ids = []
+        offsets = []
+        offset = 0
+
+        dbt.clients.system.make_directory(os.path.dirname(outfile))
+
+        with open(get_payload_file_name(outfile), 'wb') as fh:
+            for node_id, data in self.graph.nodes_iter(data=True):
+                slim_node = {
+                    key: value for key, value in data.items()
+                    if key not in GRAPH_SERIALIZE_BLACKLIST
+                }
+                line = (json.dumps(slim_node) + '\n').encode('utf-8')
+                fh.write(line)
+
+                node_ids.append(node_id)
+                offsets.append(offset)
+                offset += len(line)
+
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        edges = [[index[src], index[dest]]
+                 for src, dest in self.graph.edges_iter()]
+
+        dbt.clients.system.write_file(outfile, json.dumps({
+            'version': GRAPH_FORMAT_VERSION,
+            'nodes': node_ids,
+            'edges': edges,
+            'offsets': offsets,
+        }, separators=(',', ':')))
 
     def read_graph(self, infile):
-        self.graph = nx.read_gpickle(infile)
-
-    @classmethod
-    def remove_blacklisted_attributes_from_nodes(cls, graph):
-        graph = graph.copy()
-        for node_name, node in graph.node.items():
-            slim_node = node.copy()
-            for key in GRAPH_SERIALIZE_BLACKLIST:
-                if key in slim_node:
-                    del slim_node[key]
-
-            graph.node[node_name] = slim_node
-        return graph
+        """Read a graph written by write_graph. Only the structure of the
+        graph is loaded here, node data is read from the payload file on
+        demand by get_node."""
+        contents = json.loads(dbt.clients.system.load_file_contents(infile))
+
+        if contents.get('version') != GRAPH_FORMAT_VERSION:
+            dbt.exceptions.raise_compiler_error(
+                "Unsupported graph file version in {}: {}. Run `dbt compile` "
+                "to rebuild it.".format(infile, contents.get('version')))
+
+        node_ids = contents['nodes']
+
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(node_ids)
+        self.graph.add_edges_from(
+            (node_ids[src], node_ids[dest])
+            for src, dest in contents['edges'])
+
+        self.payloads = NodePayloads(get_payload_file_name(infile),
+                                     dict(zip(node_ids, contents['offsets'])))
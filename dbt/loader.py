@@ -1,9 +1,18 @@
+import os
+
+import dbt.clients.jinja
 import dbt.exceptions
+import dbt.flags
 
 from dbt.node_types import NodeType
 from dbt.contracts.graph.parsed import ParsedManifest
+from dbt.logger import GLOBAL_LOGGER as logger
 
 import dbt.parser
+import dbt.parser.cache
+import dbt.parser.parallel
+
+TEMPLATE_CACHE_DIR_NAME = 'jinja_cache'
 
 
 class GraphLoader(object):
@@ -12,14 +21,50 @@ class GraphLoader(object):
 
     @classmethod
     def load_all(cls, root_project, all_projects):
-        macros = MacroLoader.load_all(root_project, all_projects)
-        macros.update(OperationLoader.load_all(root_project, all_projects))
-        nodes = {}
-        for loader in cls._LOADERS:
-            nodes.update(loader.load_all(root_project, all_projects, macros))
+        target_path = root_project.get('target-path')
+
+        dbt.clients.jinja.set_bytecode_cache_dir(
+            os.path.join(target_path, TEMPLATE_CACHE_DIR_NAME))
+
+        cache = None
+        if dbt.flags.USE_PARSE_CACHE:
+            cache = dbt.parser.cache.ParseCache.load(target_path)
+
+        dbt.parser.cache.set_active_cache(cache)
+
+        try:
+            macros = MacroLoader.load_all(root_project, all_projects)
+            macros.update(OperationLoader.load_all(root_project,
+                                                   all_projects))
+
+            if cache is not None:
+                cache.set_macros(macros)
+
+            if dbt.flags.PARSE_WORKERS > 1:
+                dbt.parser.parallel.set_active_pool(
+                    dbt.parser.parallel.ParsePool(dbt.flags.PARSE_WORKERS,
+                                                  macros))
+
+            nodes = {}
+            for loader in cls._LOADERS:
+                nodes.update(loader.load_all(root_project, all_projects,
+                                             macros))
+        finally:
+            pool = dbt.parser.parallel.get_active_pool()
+            if pool is not None:
+                pool.close()
+
+            dbt.parser.parallel.set_active_pool(None)
+            dbt.parser.cache.set_active_cache(None)
+
+        if cache is not None:
+            logger.debug("Parse cache: {} hits, {} misses"
+                         .format(cache.hits, cache.misses))
+            cache.save()
 
         manifest = ParsedManifest(nodes=nodes, macros=macros)
-        manifest = dbt.parser.ParserUtils.process_refs(manifest, root_project)
+        manifest = dbt.parser.ParserUtils.process_refs(
+            manifest, root_project.get('name'))
         return manifest
 
     @classmethod
@@ -24,6 +24,7 @@ import dbt.config as config
 import dbt.ui.printer
 import dbt.compat
 import dbt.deprecations
+import dbt.scheduler
 
 from dbt.utils import ExitCodes
 
@@ -235,6 +236,12 @@ def invoke_dbt(parsed):
     proj.log_warnings()
 
     flags.NON_DESTRUCTIVE = getattr(proj.args, 'non_destructive', False)
+    flags.PARSE_WORKERS = getattr(proj.args, 'parse_workers', 1)
+    flags.USE_PARSE_CACHE = not getattr(proj.args, 'no_parse_cache', False)
+    flags.USE_COMPILE_CACHE = not getattr(proj.args, 'no_compile_cache',
+                                          False)
+    flags.USE_RELATION_CACHE = not getattr(proj.args, 'no_relation_cache',
+                                           False)
 
     arg_drop_existing = getattr(proj.args, 'drop_existing', False)
     arg_full_refresh = getattr(proj.args, 'full_refresh', False)
@@ -316,6 +323,56 @@ def parse_args(args):
             should be a YAML string, eg. '{my_variable: my_value}'"""
     )
 
+    base_subparser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=1,
+        help="""
+            Render models and tests with this many worker processes while
+            parsing the project. Defaults to 1, which parses everything in
+            the dbt process."""
+    )
+
+    base_subparser.add_argument(
+        '--no-parse-cache',
+        action='store_true',
+        help="""
+            Parse every file from scratch, instead of reusing the results of
+            files that haven't changed since the last run."""
+    )
+
+    base_subparser.add_argument(
+        '--no-compile-cache',
+        action='store_true',
+        help="""
+            Render every node from scratch, instead of reusing the compiled
+            SQL of nodes whose inputs haven't changed since the last run."""
+    )
+
+    base_subparser.add_argument(
+        '--no-relation-cache',
+        action='store_true',
+        help="""
+            Query the database for existing relations every time a
+            materialization needs them, instead of listing each schema once
+            per run. Use this if something else changes the schemas dbt
+            writes to while it's running."""
+    )
+
+    # flags for the commands that run nodes on the scheduler
+    scheduler_subparser = argparse.ArgumentParser(add_help=False)
+
+    scheduler_subparser.add_argument(
+        '--scheduler',
+        choices=dbt.scheduler.SCHEDULERS,
+        default=dbt.scheduler.CRITICAL_PATH,
+        help="""
+            The order to start nodes in once they are ready to run.
+            'critical-path' starts the nodes with the longest chain of
+            dependents first, using execution times from previous runs.
+            'fifo' starts them in the order they became ready."""
+    )
+
     sub = subs.add_parser('init', parents=[base_subparser])
     sub.add_argument('project_name', type=str, help='Name of the new project')
     sub.set_defaults(cls=init_task.InitTask, which='init')
@@ -336,7 +393,8 @@ def parse_args(args):
     sub = subs.add_parser('deps', parents=[base_subparser])
     sub.set_defaults(cls=deps_task.DepsTask, which='deps')
 
-    sub = subs.add_parser('archive', parents=[base_subparser])
+    sub = subs.add_parser(
+        'archive', parents=[base_subparser, scheduler_subparser])
     sub.add_argument(
         '--threads',
         type=int,
@@ -348,10 +406,20 @@ def parse_args(args):
     )
     sub.set_defaults(cls=archive_task.ArchiveTask, which='archive')
 
-    run_sub = subs.add_parser('run', parents=[base_subparser])
+    run_sub = subs.add_parser(
+        'run', parents=[base_subparser, scheduler_subparser])
     run_sub.set_defaults(cls=run_task.RunTask, which='run')
 
-    compile_sub = subs.add_parser('compile', parents=[base_subparser])
+    compile_sub = subs.add_parser(
+        'compile', parents=[base_subparser, scheduler_subparser])
+    compile_sub.add_argument(
+        '--compile-workers',
+        type=int,
+        default=1,
+        help="""
+            Compile nodes in this many worker processes. Defaults to 1, which
+            compiles everything in the dbt process using --threads."""
+    )
     compile_sub.set_defaults(cls=compile_task.CompileTask, which='compile')
 
     for sub in [run_sub, compile_sub]:
@@ -422,7 +490,8 @@ def parse_args(args):
     generate_sub.set_defaults(cls=generate_task.GenerateTask,
                               which='generate')
 
-    sub = subs.add_parser('test', parents=[base_subparser])
+    sub = subs.add_parser(
+        'test', parents=[base_subparser, scheduler_subparser])
     sub.add_argument(
         '--data',
         action='store_true',
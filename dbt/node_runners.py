@@ -5,8 +5,14 @@ from dbt.utils import get_nodes_by_tags
 from dbt.node_types import NodeType, RunHookType
 from dbt.adapters.factory import get_adapter
 
+import dbt.adapters.cache
 import dbt.clients.jinja
+import dbt.compat
+import dbt.compilation
+import dbt.compile_cache
+import dbt.compile_pool
 import dbt.context.runtime
+import dbt.parser
 import dbt.utils
 import dbt.tracking
 import dbt.ui.printer
@@ -17,6 +23,16 @@ import dbt.writer
 
 import time
 
+from multiprocessing.dummy import Pool as ThreadPool
+
+
+# The type of relation each of the built in materializations leaves behind
+MATERIALIZED_RELATION_TYPES = {
+    'table': 'table',
+    'incremental': 'table',
+    'seed': 'table',
+    'view': 'view',
+}
 
 INTERNAL_ERROR_STRING = """This is an error in dbt. Please try again. If \
 the error persists, open an issue at https://github.com/fishtown-analytics/dbt
@@ -193,7 +209,7 @@ class BaseRunner(object):
         pass
 
     @classmethod
-    def before_run(self, project, adapter, flat_graph):
+    def before_run(self, project, adapter, flat_graph, threads=1):
         pass
 
     @classmethod
@@ -221,6 +237,15 @@ class CompileRunner(BaseRunner):
         return RunModelResult(compiled_node)
 
     def compile(self, flat_graph):
+        pool = dbt.compile_pool.get_active_pool()
+
+        if pool is not None:
+            compiled_node = pool.compile_node(self.node, flat_graph)
+
+            # if the worker failed, compile here to raise the same error
+            if compiled_node is not None:
+                return compiled_node
+
         return self._compile_node(self.adapter, self.project, self.node,
                                   flat_graph)
 
@@ -232,6 +257,15 @@ class CompileRunner(BaseRunner):
 
         if(node['injected_sql'] is not None and
            not (dbt.utils.is_type(node, NodeType.Archive))):
+            cache = dbt.compile_cache.get_active_cache()
+            build_path = dbt.writer.get_node_path(
+                node, project.get('target-path'), 'compiled')
+
+            if cache is not None and cache.is_written(
+                    node['unique_id'], build_path, node['injected_sql']):
+                node['build_path'] = build_path
+                return node
+
             logger.debug('Writing injected SQL for node "{}"'.format(
                 node['unique_id']))
 
@@ -243,12 +277,28 @@ class CompileRunner(BaseRunner):
 
             node['build_path'] = written_path
 
+            if cache is not None:
+                cache.set_written(node['unique_id'], written_path,
+                                  node['injected_sql'])
+
         return node
 
     @classmethod
     def _inject_runtime_config(cls, adapter, project, node):
         wrapped_sql = node.get('wrapped_sql')
-        context = cls._node_context(adapter, project, node)
+
+        # most wrapped SQL is the output of the first render, and has no
+        # template syntax left in it to fill in
+        if wrapped_sql is None:
+            return node
+
+        elif dbt.clients.jinja.is_template_free(
+                dbt.compat.to_string(wrapped_sql)):
+            context = {}
+
+        else:
+            context = cls._node_context(adapter, project, node)
+
         sql = dbt.clients.jinja.get_rendered(wrapped_sql, context)
         node['wrapped_sql'] = sql
         return node
@@ -281,12 +331,47 @@ class CompileRunner(BaseRunner):
         }
 
     @classmethod
-    def create_schemas(cls, project, adapter, flat_graph):
+    def run_for_schemas(cls, profile, adapter, schemas, func, threads=1):
+        """Call func(schema, model_name) for each schema. If there's more
+        than one schema and more than one thread, the calls are made
+        concurrently, each on its own connection."""
+        schemas = sorted(schemas)
+        num_threads = min(threads, len(schemas))
+
+        if num_threads <= 1:
+            for schema in schemas:
+                func(schema, None)
+            return
+
+        def run(schema):
+            model_name = 'schema_{}'.format(schema)
+            try:
+                func(schema, model_name)
+            finally:
+                adapter.release_connection(profile, model_name)
+
+        pool = None
+
+        try:
+            pool = ThreadPool(num_threads)
+            pool.map(run, schemas)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    @classmethod
+    def create_schemas(cls, project, adapter, flat_graph, threads=1):
         profile = project.run_environment()
         required_schemas = cls.get_model_schemas(flat_graph)
         existing_schemas = set(adapter.get_existing_schemas(profile, project))
-        for schema in (required_schemas - existing_schemas):
-            adapter.create_schema(profile, project, schema)
+
+        def create_schema(schema, model_name):
+            adapter.create_schema(profile, project, schema, model_name)
+
+        cls.run_for_schemas(profile, adapter,
+                            required_schemas - existing_schemas,
+                            create_schema, threads)
 
 
 class ModelRunner(CompileRunner):
@@ -341,25 +426,104 @@ class ModelRunner(CompileRunner):
             raise
 
     @classmethod
-    def create_schemas(cls, project, adapter, flat_graph):
+    def create_schemas(cls, project, adapter, flat_graph, threads=1):
         profile = project.run_environment()
         required_schemas = cls.get_model_schemas(flat_graph)
 
         # Snowflake needs to issue a "use {schema}" query, where schema
         # is the one defined in the profile. Create this schema if it
         # does not exist, otherwise subsequent queries will fail. Generally,
-        # dbt expects that this schema will exist anyway.
-        required_schemas.add(adapter.get_default_schema(profile, project))
+        # dbt expects that this schema will exist anyway. It's created
+        # before the others, as they're created on new connections.
+        default_schema = adapter.get_default_schema(profile, project)
 
         existing_schemas = set(adapter.get_existing_schemas(profile, project))
 
-        for schema in (required_schemas - existing_schemas):
-            adapter.create_schema(profile, project, schema)
+        if default_schema not in existing_schemas:
+            adapter.create_schema(profile, project, default_schema)
+
+        def create_schema(schema, model_name):
+            adapter.create_schema(profile, project, schema, model_name)
+
+        cls.run_for_schemas(
+            profile, adapter,
+            required_schemas - existing_schemas - {default_schema},
+            create_schema, threads)
+
+    @classmethod
+    def cache_relations(cls, project, adapter, flat_graph, threads=1):
+        cache = dbt.adapters.cache.get_active_cache()
+        if cache is None:
+            return
+
+        profile = project.run_environment()
+        cls.cache_dependent_views(profile, adapter, flat_graph)
+
+        # schemas that were just created are already known to be empty
+        schemas = [schema for schema in cls.get_model_schemas(flat_graph)
+                   if not cache.is_listed(schema)]
+
+        def list_relations(schema, model_name):
+            adapter.list_relations(profile, project, schema, model_name)
+
+        cls.run_for_schemas(profile, adapter, schemas, list_relations,
+                            threads)
 
     @classmethod
-    def before_run(cls, project, adapter, flat_graph):
+    def get_dependent_views(cls, flat_graph):
+        """Return the unique ids of the view models that select from each
+        model, looking through ephemeral models."""
+        nodes = flat_graph['nodes']
+        dependents = {}
+
+        for unique_id, node in nodes.items():
+            if not cls.is_refable(node) or \
+               dbt.utils.get_materialization(node) != 'view':
+                continue
+
+            to_visit = list(node.get('depends_on', {}).get('nodes', []))
+            visited = set()
+
+            while to_visit:
+                parent_id = to_visit.pop()
+                parent = nodes.get(parent_id)
+                if parent_id in visited or parent is None:
+                    continue
+
+                visited.add(parent_id)
+
+                if cls.is_ephemeral_model(parent):
+                    to_visit.extend(parent.get('depends_on', {})
+                                          .get('nodes', []))
+                else:
+                    dependents.setdefault(parent_id, set()).add(unique_id)
+
+        return dependents
+
+    @classmethod
+    def cache_dependent_views(cls, profile, adapter, flat_graph):
+        cache = dbt.adapters.cache.get_active_cache()
+        nodes = flat_graph['nodes']
+        dependents = cls.get_dependent_views(flat_graph)
+
+        for unique_id, node in nodes.items():
+            if not cls.is_refable(node) or cls.is_ephemeral(node):
+                continue
+
+            views = [adapter.Relation.create_from_node(profile, nodes[view_id])
+                     for view_id in dependents.get(unique_id, [])]
+            cache.set_dependent_views(
+                adapter.Relation.create_from_node(profile, node), views)
+
+    @classmethod
+    def before_run(cls, project, adapter, flat_graph, threads=1):
         cls.safe_run_hooks(project, adapter, flat_graph, RunHookType.Start)
-        cls.create_schemas(project, adapter, flat_graph)
+
+        started = time.time()
+        cls.create_schemas(project, adapter, flat_graph, threads)
+        cls.cache_relations(project, adapter, flat_graph, threads)
+        logger.debug("Created schemas and listed relations in {:0.2f}s"
+                     .format(time.time() - started))
 
     @classmethod
     def print_results_line(cls, results, execution_time):
@@ -424,12 +588,38 @@ class ModelRunner(CompileRunner):
                 model,
                 self.adapter.type())
 
-        materialization_macro.generator(context)()
+        try:
+            materialization_macro.generator(context)()
+
+        except:
+            # the materialization might have changed the schema before it
+            # failed
+            self.adapter.invalidate_cached_relations(model.get('schema'))
+            raise
+
+        self.cache_materialized_relation(model)
 
         result = context['load_result']('main')
 
         return RunModelResult(model, status=result.status)
 
+    def cache_materialized_relation(self, model):
+        relation_type = MATERIALIZED_RELATION_TYPES.get(
+            dbt.utils.get_materialization(model))
+
+        config = model.get('config', {})
+
+        if relation_type is None:
+            # custom materializations can leave anything behind
+            self.adapter.invalidate_cached_relations()
+        elif config.get('pre-hook') or config.get('post-hook'):
+            # hooks can run any SQL against the model's schema
+            self.adapter.invalidate_cached_relations(model.get('schema'))
+        else:
+            self.adapter.cache_new_relation(
+                self.adapter.Relation.create_from_node(
+                    self.profile, model, type=relation_type))
+
 
 class TestRunner(CompileRunner):
 
@@ -506,6 +696,11 @@ class SeedRunner(ModelRunner):
                                         self.num_nodes)
 
     def compile(self, flat_graph):
+        # seeds are parsed without their rows, so load them now
+        if self.node.get('agate_table') is None:
+            self.node['agate_table'] = \
+                dbt.parser.SeedParser.load_agate_table(self.node)
+
         return self.node
 
     def print_result_line(self, result):
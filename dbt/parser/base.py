@@ -7,6 +7,8 @@ import dbt.utils
 import dbt.hooks
 import dbt.clients.jinja
 import dbt.context.parser
+import dbt.parser.cache
+import dbt.parser.parallel
 
 from dbt.utils import coalesce
 from dbt.logger import GLOBAL_LOGGER as logger
@@ -40,18 +42,62 @@ class BaseParser(object):
     def parse_node(cls, node, node_path, root_project_config,
                    package_project_config, all_projects,
                    tags=None, fqn_extra=None, fqn=None, macros=None,
-                   agate_table=None, archive_config=None):
+                   archive_config=None):
         """Parse a node, given an UnparsedNode and any other required information.
 
-        agate_table should be set if the node came from a seed file.
         archive_config should be set if the node is an Archive node.
         """
+        cache = dbt.parser.cache.get_active_cache()
+        cache_key = None
+
+        if cache is not None:
+            cache_key = cache.node_key(node, node_path, root_project_config,
+                                       package_project_config, tags=tags,
+                                       fqn_extra=fqn_extra, fqn=fqn,
+                                       archive_config=archive_config)
+            cached = cache.get_node(cache_key)
+
+            if cached is not None:
+                logger.debug("Using cached parse of {}".format(node_path))
+                return cached
+
+        parsed_node, macro_calls = cls.render_node(
+            node, node_path, root_project_config, package_project_config,
+            all_projects, tags=tags, fqn_extra=fqn_extra, fqn=fqn,
+            macros=macros, archive_config=archive_config)
+
+        if cache_key is not None:
+            cache.set_node(cache_key, parsed_node, macro_calls,
+                           root_project_config.get('cli_vars'))
+
+        return parsed_node
+
+    @classmethod
+    def parse_nodes(cls, jobs, macros=None):
+        """Parse a list of nodes. Each job is a dict of keyword arguments for
+        parse_node, minus macros. If --parse-workers was given, the nodes are
+        parsed in a process pool. Either way, the results are returned in the
+        same order as the jobs."""
+        pool = dbt.parser.parallel.get_active_pool()
+
+        if pool is None:
+            return [cls.parse_node(macros=macros, **job) for job in jobs]
+
+        return pool.parse_nodes(cls, jobs, macros)
+
+    @classmethod
+    def render_node(cls, node, node_path, root_project_config,
+                    package_project_config, all_projects,
+                    tags=None, fqn_extra=None, fqn=None, macros=None,
+                    archive_config=None):
+        """Render the node with a parse-time context, bypassing the parse
+        cache. Returns the ParsedNode and the set of unique IDs of the macros
+        that were called while rendering it.
+        """
         logger.debug("Parsing {}".format(node_path))
 
         node = node.serialize()
 
-        if agate_table is not None:
-            node['agate_table'] = agate_table
         tags = coalesce(tags, [])
         fqn_extra = coalesce(fqn_extra, [])
         macros = coalesce(macros, {})
@@ -100,6 +146,10 @@ class BaseParser(object):
         context = dbt.context.parser.generate(node, root_project_config,
                                               {"macros": macros})
 
+        # collects the unique ids of the macros called while rendering, so
+        # the cache entry can be invalidated when one of them changes
+        context['_macro_calls'] = set()
+
         dbt.clients.jinja.get_rendered(
             node.get('raw_sql'), context, node,
             capture_macros=True)
@@ -112,9 +162,11 @@ class BaseParser(object):
 
         # Special macro defined in the global project
         schema_override = config.config.get('schema')
-        get_schema = context.get('generate_schema_name',
-                                 lambda x: default_schema)
-        node['schema'] = get_schema(schema_override)
+        get_schema = context.get('generate_schema_name')
+        if get_schema is None:
+            node['schema'] = default_schema
+        else:
+            node['schema'] = get_schema.bind(context)(schema_override)
         node['alias'] = config.config.get('alias', default_alias)
 
         # Overwrite node config
@@ -127,4 +179,4 @@ class BaseParser(object):
 
         del node['config_reference']
 
-        return ParsedNode(**node)
+        return ParsedNode(**node), context['_macro_calls']
@@ -77,6 +77,7 @@ class BaseSqlParser(BaseParser):
             macros = {}
 
         to_return = {}
+        jobs = []
 
         for n in nodes:
             node = UnparsedNode(**n)
@@ -86,13 +87,19 @@ class BaseSqlParser(BaseParser):
                                      package_name,
                                      node.get('name'))
 
-            node_parsed = cls.parse_node(node,
-                                         node_path,
-                                         root_project,
-                                         projects.get(package_name),
-                                         projects,
-                                         tags=tags,
-                                         macros=macros)
+            jobs.append({
+                'node': node,
+                'node_path': node_path,
+                'root_project_config': root_project,
+                'package_project_config': projects.get(package_name),
+                'all_projects': projects,
+                'tags': tags,
+            })
+
+        parsed_nodes = cls.parse_nodes(jobs, macros=macros)
+
+        for job, node_parsed in zip(jobs, parsed_nodes):
+            node_path = job['node_path']
 
             # Ignore disabled nodes
             if not node_parsed['config']['enabled']:
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import pickle
+
+import dbt.clients.system
+import dbt.compile_cache
+import dbt.utils
+import dbt.version
+
+from dbt.contracts.graph.parsed import ParsedNode
+from dbt.logger import GLOBAL_LOGGER as logger
+
+PARSE_CACHE_FILE_NAME = 'partial_parse.pickle'
+
+# The cache used by the parsers while GraphLoader.load_all is running. The
+# parsers are all classmethods, so this is simpler than threading the cache
+# through every loader and parser signature.
+_active_cache = None
+
+
+def get_active_cache():
+    return _active_cache
+
+
+def set_active_cache(cache):
+    global _active_cache
+    _active_cache = cache
+
+
+def digest(value):
+    """Return a stable md5 hexdigest for any json-able value."""
+    serialized = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.md5(serialized.encode('utf-8')).hexdigest()
+
+
+class ParseCache(object):
+    """A cache of parse results, persisted in the target directory between
+    invocations.
+
+    Node entries are keyed by a hash of the unparsed node and everything that
+    is fed into parse_node along with it, including the root and package
+    project configs (and therefore --vars). Each entry also records the
+    hashes of the macros that were called while the node was parsed, so
+    editing a macro only invalidates the nodes that use it. Adding or
+    removing a macro changes how names resolve, so that invalidates every
+    node. Like the compile cache, nodes that use something that can change
+    between runs without changing the key, eg. env_var, are never cached.
+
+    Macro file entries are keyed by the file contents and record the names of
+    the macros defined in the file, so the file does not need to be compiled
+    until one of its macros is actually used.
+    """
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = dbt.utils.coalesce(entries, {})
+        self.used_entries = {}
+
+        self.macros = {}
+        self.macro_digests = {}
+        self.macro_set_digest = None
+        self.project_digests = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, target_path):
+        path = os.path.join(target_path, PARSE_CACHE_FILE_NAME)
+        entries = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as handle:
+                    saved = pickle.load(handle)
+
+                if saved.get('dbt_version') == dbt.version.__version__:
+                    entries = saved.get('entries', {})
+
+            except Exception as e:
+                logger.debug("Could not read the parse cache at {}, "
+                             "ignoring it: {}".format(path, e))
+
+        return cls(path, entries)
+
+    def save(self):
+        """Write every entry that was used by this parse back to disk.
+        Entries that were not used are dropped, so the cache does not grow
+        forever as files are edited or removed."""
+        to_save = {
+            'dbt_version': dbt.version.__version__,
+            'entries': self.used_entries,
+        }
+
+        try:
+            dbt.clients.system.make_directory(os.path.dirname(self.path))
+            with open(self.path, 'wb') as handle:
+                pickle.dump(to_save, handle, pickle.HIGHEST_PROTOCOL)
+
+        except Exception as e:
+            logger.debug("Could not write the parse cache to {}: {}"
+                         .format(self.path, e))
+
+    def set_macros(self, macros):
+        """Record the current hash of every macro. Must be called after
+        macros are loaded and before any nodes are parsed."""
+        self.macros = macros
+        self.macro_digests = {
+            unique_id: dbt.utils.md5(macro.get('raw_sql'))
+            for unique_id, macro in macros.items()
+        }
+        self.macro_set_digest = digest(sorted(macros.keys()))
+
+    def project_digest(self, project_cfg):
+        name = project_cfg.get('name')
+
+        if name not in self.project_digests:
+            self.project_digests[name] = digest(project_cfg)
+
+        return self.project_digests[name]
+
+    def node_key(self, node, node_path, root_project_config,
+                 package_project_config, tags=None, fqn_extra=None, fqn=None,
+                 archive_config=None, **kwargs):
+        """Return the cache key for the given parse_node arguments. Any other
+        keyword arguments (eg. all_projects) are accepted and ignored, as
+        they don't affect the parsed node."""
+        return digest({
+            'node': node.serialize(),
+            'node_path': node_path,
+            'root_project': self.project_digest(root_project_config),
+            'package_project': self.project_digest(package_project_config),
+            'macros': self.macro_set_digest,
+            'tags': tags,
+            'fqn_extra': fqn_extra,
+            'fqn': fqn,
+            'archive_config': archive_config,
+        })
+
+    def macro_file_key(self, macro_file_path, macro_file_contents, root_path,
+                       package_name, resource_type, tags):
+        return digest({
+            'path': macro_file_path,
+            'contents': dbt.utils.md5(macro_file_contents),
+            'root_path': root_path,
+            'package_name': package_name,
+            'resource_type': resource_type,
+            'tags': tags,
+        })
+
+    def _is_fresh(self, entry):
+        for unique_id, macro_digest in entry.get('macros', {}).items():
+            if self.macro_digests.get(unique_id) != macro_digest:
+                return False
+
+        return True
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+
+        if entry is None or not self._is_fresh(entry):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.used_entries[key] = entry
+        return entry
+
+    def get_node(self, key):
+        entry = self._get(key)
+
+        if entry is None:
+            return None
+
+        return ParsedNode(**entry['node'])
+
+    def set_node(self, key, parsed_node, macro_calls, cli_vars=None):
+        if dbt.compile_cache.is_volatile(parsed_node, self.macros,
+                                         macro_calls,
+                                         dbt.utils.coalesce(cli_vars, {})):
+            return
+
+        self.used_entries[key] = {
+            'node': parsed_node.serialize(),
+            'macros': {
+                unique_id: self.macro_digests.get(unique_id)
+                for unique_id in macro_calls
+            },
+        }
+
+    def get_macro_names(self, key):
+        entry = self._get(key)
+
+        if entry is None:
+            return None
+
+        return entry['names']
+
+    def set_macro_names(self, key, names):
+        self.used_entries[key] = {'names': list(names)}
@@ -8,6 +8,7 @@ import dbt.utils
 import dbt.clients.jinja
 import dbt.clients.system
 import dbt.contracts.project
+import dbt.parser.cache
 
 from dbt.parser.base import BaseParser
 from dbt.node_types import NodeType
@@ -17,12 +18,36 @@ from dbt.contracts.graph.parsed import ParsedMacro
 
 
 class MacroParser(BaseParser):
+    @classmethod
+    def get_macro_names(cls, template, resource_type):
+        """Return the names of the macros of the given resource type that are
+        defined in the compiled template."""
+        names = []
+
+        for key, item in template.module.__dict__.items():
+            if type(item) != jinja2.runtime.Macro:
+                continue
+
+            node_type = None
+            if key.startswith(dbt.utils.MACRO_PREFIX):
+                node_type = NodeType.Macro
+                name = key.replace(dbt.utils.MACRO_PREFIX, '')
+
+            elif key.startswith(dbt.utils.OPERATION_PREFIX):
+                node_type = NodeType.Operation
+                name = key.replace(dbt.utils.OPERATION_PREFIX, '')
+
+            if node_type != resource_type:
+                continue
+
+            names.append(name)
+
+        return names
+
     @classmethod
     def parse_macro_file(cls, macro_file_path, macro_file_contents, root_path,
                          package_name, resource_type, tags=None, context=None):
 
-        logger.debug("Parsing {}".format(macro_file_path))
-
         to_return = {}
 
         if tags is None:
@@ -39,29 +64,33 @@ class MacroParser(BaseParser):
             root_path=root_path,
         )
 
-        try:
-            template = dbt.clients.jinja.get_template(
-                macro_file_contents, context, node=base_node)
-        except dbt.exceptions.CompilationException as e:
-            e.node = base_node
-            raise e
+        cache = dbt.parser.cache.get_active_cache()
+        cache_key = None
+        template = None
+        names = None
 
-        for key, item in template.module.__dict__.items():
-            if type(item) != jinja2.runtime.Macro:
-                continue
+        if cache is not None:
+            cache_key = cache.macro_file_key(
+                macro_file_path, macro_file_contents, root_path,
+                package_name, resource_type, tags)
+            names = cache.get_macro_names(cache_key)
 
-            node_type = None
-            if key.startswith(dbt.utils.MACRO_PREFIX):
-                node_type = NodeType.Macro
-                name = key.replace(dbt.utils.MACRO_PREFIX, '')
+        if names is None:
+            logger.debug("Parsing {}".format(macro_file_path))
 
-            elif key.startswith(dbt.utils.OPERATION_PREFIX):
-                node_type = NodeType.Operation
-                name = key.replace(dbt.utils.OPERATION_PREFIX, '')
+            try:
+                template = dbt.clients.jinja.get_template(
+                    macro_file_contents, context, node=base_node)
+            except dbt.exceptions.CompilationException as e:
+                e.node = base_node
+                raise e
 
-            if node_type != resource_type:
-                continue
+            names = cls.get_macro_names(template, resource_type)
+
+            if cache_key is not None:
+                cache.set_macro_names(cache_key, names)
 
+        for name in names:
             unique_id = cls.get_path(resource_type, package_name, name)
 
             merged = dbt.utils.deep_merge(
@@ -74,6 +103,7 @@ class MacroParser(BaseParser):
                     'depends_on': {'macros': []},
                 })
 
+            # if template is None, ParsedMacro compiles it on first use
             new_node = ParsedMacro(
                 template=template,
                 **merged)
@@ -0,0 +1,137 @@
+import multiprocessing
+import traceback
+
+import dbt.exceptions
+import dbt.flags
+import dbt.parser.cache
+
+from dbt.contracts.graph.parsed import ParsedMacro, ParsedNode
+from dbt.contracts.graph.unparsed import UnparsedNode
+from dbt.logger import GLOBAL_LOGGER as logger
+
+# flags that can change the result of parsing a node, and so need to be
+# copied into worker processes on platforms that don't fork
+WORKER_FLAGS = ['STRICT_MODE', 'NON_DESTRUCTIVE', 'FULL_REFRESH']
+
+# The pool used by BaseParser.parse_nodes while GraphLoader.load_all is
+# running with --parse-workers.
+_active_pool = None
+
+# The macros available to a worker process, set by _initialize_worker
+_worker_macros = None
+
+
+def get_active_pool():
+    return _active_pool
+
+
+def set_active_pool(pool):
+    global _active_pool
+    _active_pool = pool
+
+
+def _initialize_worker(serialized_macros, flag_values):
+    global _worker_macros
+
+    for name, value in flag_values.items():
+        setattr(dbt.flags, name, value)
+
+    # jinja templates can't be pickled, so each worker compiles the macro
+    # templates it needs from their raw_sql.
+    _worker_macros = {
+        unique_id: ParsedMacro(**macro)
+        for unique_id, macro in serialized_macros.items()
+    }
+
+
+def _parse_in_worker(job):
+    # imported here to avoid a cycle, dbt.parser.base imports this module
+    from dbt.parser.base import BaseParser
+
+    job = dict(job, node=UnparsedNode(**job['node']))
+
+    try:
+        parsed_node, macro_calls = BaseParser.render_node(
+            macros=_worker_macros, **job)
+
+    except (Exception, dbt.exceptions.Exception):
+        # exceptions don't reliably survive a trip through pickle. The parent
+        # process parses the node again to raise the error itself.
+        logger.debug("Error parsing {} in a worker process:\n{}"
+                     .format(job.get('node_path'), traceback.format_exc()))
+        return None
+
+    return parsed_node.serialize(), macro_calls
+
+
+class ParsePool(object):
+    """A pool of worker processes for rendering nodes at parse time.
+
+    Only the rendering is done in the workers. Cache lookups, duplicate
+    checks and error handling all stay in the parent process, so the result
+    of parsing with workers is the same as parsing without them.
+    """
+
+    def __init__(self, num_workers, macros):
+        self.num_workers = num_workers
+
+        serialized_macros = {
+            unique_id: macro.serialize()
+            for unique_id, macro in macros.items()
+        }
+
+        flag_values = {name: getattr(dbt.flags, name)
+                       for name in WORKER_FLAGS}
+
+        logger.debug("Starting {} parse workers".format(num_workers))
+        self.pool = multiprocessing.Pool(num_workers, _initialize_worker,
+                                         (serialized_macros, flag_values))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def terminate(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def parse_nodes(self, parser, jobs, macros):
+        cache = dbt.parser.cache.get_active_cache()
+        results = [None] * len(jobs)
+        pending = []
+
+        for index, job in enumerate(jobs):
+            cache_key = None
+
+            if cache is not None:
+                cache_key = cache.node_key(**job)
+                cached = cache.get_node(cache_key)
+
+                if cached is not None:
+                    results[index] = cached
+                    continue
+
+            pending.append((index, cache_key, job))
+
+        to_parse = [dict(job, node=job['node'].serialize())
+                    for _, _, job in pending]
+        chunksize = max(1, len(to_parse) // (self.num_workers * 4))
+        outputs = self.pool.map(_parse_in_worker, to_parse, chunksize)
+
+        for (index, cache_key, job), output in zip(pending, outputs):
+            if output is None:
+                # this will raise the error that the worker ran into. Nodes
+                # are handled in order, so the error is deterministic.
+                results[index] = parser.parse_node(macros=macros, **job)
+                continue
+
+            serialized_node, macro_calls = output
+            parsed_node = ParsedNode(**serialized_node)
+
+            if cache_key is not None:
+                cache.set_node(cache_key, parsed_node, macro_calls,
+                               job['root_project_config'].get('cli_vars'))
+
+            results[index] = parsed_node
+
+        return results
@@ -64,9 +64,10 @@ def as_kwarg(key, value):
 class SchemaParser(BaseParser):
 
     @classmethod
-    def parse_schema_test(cls, test_base, model_name, test_config,
+    def build_schema_test(cls, test_base, model_name, test_config,
                           test_namespace, test_type, root_project_config,
-                          package_project_config, all_projects, macros=None):
+                          package_project_config, all_projects):
+        """Build the parse_node arguments for a single schema test."""
 
         if isinstance(test_config, (basestring, int, float, bool)):
             test_args = {'arg': test_config}
@@ -114,19 +115,20 @@ class SchemaParser(BaseParser):
             raw_sql=raw_sql
         )
 
-        return cls.parse_node(to_return,
-                              node_path,
-                              root_project_config,
-                              package_project_config,
-                              all_projects,
-                              tags=['schema'],
-                              fqn_extra=None,
-                              fqn=fqn_override,
-                              macros=macros)
+        return {
+            'node': to_return,
+            'node_path': node_path,
+            'root_project_config': root_project_config,
+            'package_project_config': package_project_config,
+            'all_projects': all_projects,
+            'tags': ['schema'],
+            'fqn_extra': None,
+            'fqn': fqn_override,
+        }
 
     @classmethod
-    def get_parsed_schema_test(cls, test_node, test_type, model_name, config,
-                               root_project, projects, macros):
+    def get_schema_test(cls, test_node, test_type, model_name, config,
+                        root_project, projects):
 
         package_name = test_node.get('package_name')
         test_namespace = None
@@ -144,7 +146,7 @@ class SchemaParser(BaseParser):
                                                     model_name)
             dbt.exceptions.raise_dep_not_found(test_node, desc, test_namespace)
 
-        return cls.parse_schema_test(
+        return cls.build_schema_test(
             test_node,
             model_name,
             config,
@@ -152,12 +154,11 @@ class SchemaParser(BaseParser):
             test_type,
             root_project,
             source_package,
-            all_projects=projects,
-            macros=macros)
+            all_projects=projects)
 
     @classmethod
     def parse_schema_tests(cls, tests, root_project, projects, macros=None):
-        to_return = {}
+        jobs = []
 
         for test in tests:
             raw_yml = test.get('raw_yml')
@@ -198,12 +199,14 @@ class SchemaParser(BaseParser):
                         continue
 
                     for config in configs:
-                        to_add = cls.get_parsed_schema_test(
+                        jobs.append(cls.get_schema_test(
                                     test, test_type, model_name, config,
-                                    root_project, projects, macros)
+                                    root_project, projects))
+
+        to_return = {}
 
-                        if to_add is not None:
-                            to_return[to_add.get('unique_id')] = to_add
+        for to_add in cls.parse_nodes(jobs, macros=macros):
+            to_return[to_add.get('unique_id')] = to_add
 
         return to_return
 
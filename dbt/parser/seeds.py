@@ -16,8 +16,8 @@ from dbt.parser.base import BaseParser
 class SeedParser(BaseParser):
     @classmethod
     def parse_seed_file(cls, file_match, root_dir, package_name):
-        """Parse the given seed file, returning an UnparsedNode and the agate
-        table.
+        """Parse the given seed file, returning an UnparsedNode. Only the
+        header of the csv is read here, see load_agate_table.
         """
         abspath = file_match['absolute_path']
         logger.debug("Parsing {}".format(abspath))
@@ -34,12 +34,29 @@ class SeedParser(BaseParser):
             original_file_path=os.path.join(file_match.get('searched_path'),
                                             file_match.get('relative_path')),
         )
+        try:
+            header = dbt.clients.agate_helper.csv_header(abspath)
+        except ValueError as e:
+            dbt.exceptions.raise_compiler_error(str(e), node)
+
+        seed_file = {
+            'path': abspath,
+            'size': os.path.getsize(abspath),
+            'hash': dbt.clients.system.file_md5(abspath),
+            'header': header,
+        }
+        return UnparsedNode(seed_file=seed_file, **node.serialize())
+
+    @classmethod
+    def load_agate_table(cls, node):
+        """Load the rows of the csv file for the given seed node."""
+        abspath = node.get('seed_file', {}).get('path')
         try:
             table = dbt.clients.agate_helper.from_csv(abspath)
         except ValueError as e:
             dbt.exceptions.raise_compiler_error(str(e), node)
         table.original_abspath = abspath
-        return node, table
+        return table
 
     @classmethod
     def load_and_parse(cls, package_name, root_project, all_projects, root_dir,
@@ -58,13 +75,11 @@ class SeedParser(BaseParser):
 
         result = {}
         for file_match in file_matches:
-            node, agate_table = cls.parse_seed_file(file_match, root_dir,
-                                                    package_name)
+            node = cls.parse_seed_file(file_match, root_dir, package_name)
             node_path = cls.get_path(NodeType.Seed, package_name, node.name)
             parsed = cls.parse_node(node, node_path, root_project,
                                     all_projects.get(package_name),
-                                    all_projects, tags=tags, macros=macros,
-                                    agate_table=agate_table)
+                                    all_projects, tags=tags, macros=macros)
             result[node_path] = parsed
 
         return result
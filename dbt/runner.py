@@ -2,15 +2,22 @@ import os
 import time
 
 from dbt.adapters.factory import get_adapter
+from dbt.compat import queue
 from dbt.logger import GLOBAL_LOGGER as logger
 
+import dbt.adapters.cache
 import dbt.clients.jinja
 import dbt.compilation
+import dbt.compile_cache
+import dbt.compile_pool
 import dbt.exceptions
+import dbt.flags
 import dbt.linker
 import dbt.tracking
 import dbt.model
+import dbt.scheduler
 import dbt.ui.printer
+import dbt.writer
 
 import dbt.graph.selector
 
@@ -31,6 +38,10 @@ class RunManager(object):
         else:
             self.threads = self.args.threads
 
+        self.scheduler = getattr(self.args, 'scheduler',
+                                 dbt.scheduler.CRITICAL_PATH)
+        self.compile_workers = getattr(self.args, 'compile_workers', 1)
+
     def deserialize_graph(self):
         logger.info("Loading dependency graph file.")
 
@@ -42,11 +53,6 @@ class RunManager(object):
 
         return dbt.linker.from_file(graph_file)
 
-    def get_dependent(self, linker, node_id):
-        dependent_nodes = linker.get_dependent_nodes(node_id)
-        for node_id in dependent_nodes:
-            yield node_id
-
     def get_runners(self, Runner, adapter, node_dependency_list):
         all_nodes = dbt.utils.flatten_nodes(node_dependency_list)
 
@@ -88,13 +94,22 @@ class RunManager(object):
 
         return result
 
-    def get_relevant_runners(self, node_runners, node_subset):
-        runners = []
-        for node in node_subset:
-            unique_id = node.get('unique_id')
-            if unique_id in node_runners:
-                runners.append(node_runners[unique_id])
-        return runners
+    def submit_runner(self, pool, done, unique_id, runner, flat_graph):
+        """Run the runner in the pool, and put (unique_id, result, error) on
+        the done queue when it finishes. Errors are handed back instead of
+        raised so execute_nodes can raise them in the main thread."""
+        def run():
+            try:
+                result = self.call_runner({
+                    'flat_graph': flat_graph,
+                    'runner': runner
+                })
+            except BaseException as e:
+                done.put((unique_id, None, e))
+            else:
+                done.put((unique_id, result, None))
+
+        pool.apply_async(run)
 
     def execute_nodes(self, linker, Runner, flat_graph, node_dependency_list):
         profile = self.project.run_environment()
@@ -111,60 +126,99 @@ class RunManager(object):
         schemas = list(Runner.get_model_schemas(flat_graph))
         node_runners = self.get_runners(Runner, adapter, node_dependency_list)
 
-        pool = ThreadPool(num_threads)
+        # Nodes are started as soon as everything they depend on has
+        # finished, rather than a level at a time.
+        node_order = [
+            node.get('unique_id')
+            for node in dbt.utils.flatten_nodes(node_dependency_list)
+        ]
+        waiting_on = linker.get_blocking_dependencies(node_order)
+
+        history = dbt.scheduler.RunHistory.load(self.target_path)
+        priorities = None
+
+        if self.scheduler == dbt.scheduler.CRITICAL_PATH:
+            priorities = dbt.scheduler.get_critical_path_priorities(
+                waiting_on, history.get_execution_times(node_order))
+
+        node_queue = dbt.scheduler.NodeQueue(node_order, waiting_on,
+                                             priorities)
+        skip_tracker = dbt.scheduler.SkipTracker(
+            linker.get_upstream_dependencies(node_order))
+
+        # each thread waits on one compile worker at a time, so it takes as
+        # many threads as workers to keep them all busy
+        num_workers = num_threads
+        if dbt.compile_pool.get_active_pool() is not None:
+            num_workers = max(num_threads, self.compile_workers)
+
+        pool = ThreadPool(num_workers)
+        done = queue.Queue()
+        in_flight = 0
         node_results = []
-        for node_list in node_dependency_list:
-            runners = self.get_relevant_runners(node_runners, node_list)
 
-            args_list = []
-            for runner in runners:
-                args_list.append({
-                    'flat_graph': flat_graph,
-                    'runner': runner
-                })
+        try:
+            while True:
+                # only hand the pool as many nodes as it has threads, so a
+                # node that becomes ready later can still go first
+                while node_queue.has_ready() and in_flight < num_workers:
+                    unique_id = node_queue.pop()
+                    self.submit_runner(pool, done, unique_id,
+                                       node_runners[unique_id], flat_graph)
+                    in_flight += 1
 
-            try:
-                for result in pool.imap_unordered(self.call_runner, args_list):
-                    if not Runner.is_ephemeral_model(result.node):
-                        node_results.append(result)
+                if in_flight == 0:
+                    break
 
-                    node_id = result.node.get('unique_id')
-                    flat_graph['nodes'][node_id] = result.node
+                node_id, result, error = done.get()
+                in_flight -= 1
 
-                    if result.errored:
-                        for dep_node_id in self.get_dependent(linker, node_id):
-                            runner = node_runners.get(dep_node_id)
-                            if runner:
-                                runner.do_skip()
+                if error is not None:
+                    raise error
 
-            except KeyboardInterrupt:
-                pool.close()
-                pool.terminate()
+                if not Runner.is_ephemeral_model(result.node):
+                    node_results.append(result)
+
+                flat_graph['nodes'][node_id] = result.node
 
-                profile = self.project.run_environment()
-                adapter = get_adapter(profile)
+                if result.errored:
+                    for dep_node_id in skip_tracker.mark_failed(node_id):
+                        node_runners[dep_node_id].do_skip()
 
-                if not adapter.is_cancelable():
-                    msg = ("The {} adapter does not support query "
-                           "cancellation. Some queries may still be "
-                           "running!".format(adapter.type()))
+                node_queue.mark_done(node_id)
 
-                    yellow = dbt.ui.printer.COLOR_FG_YELLOW
-                    dbt.ui.printer.print_timestamped_line(msg, yellow)
-                    raise
+        except KeyboardInterrupt:
+            pool.close()
+            pool.terminate()
 
-                for conn_name in adapter.cancel_open_connections(profile):
-                    dbt.ui.printer.print_cancel_line(conn_name)
+            profile = self.project.run_environment()
+            adapter = get_adapter(profile)
 
-                dbt.ui.printer.print_run_end_messages(node_results,
-                                                      early_exit=True)
+            if not adapter.is_cancelable():
+                msg = ("The {} adapter does not support query "
+                       "cancellation. Some queries may still be "
+                       "running!".format(adapter.type()))
 
-                pool.join()
+                yellow = dbt.ui.printer.COLOR_FG_YELLOW
+                dbt.ui.printer.print_timestamped_line(msg, yellow)
                 raise
 
+            for conn_name in adapter.cancel_open_connections(profile):
+                dbt.ui.printer.print_cancel_line(conn_name)
+
+            dbt.ui.printer.print_run_end_messages(node_results,
+                                                  early_exit=True)
+
+            pool.join()
+            raise
+
         pool.close()
         pool.join()
 
+        history.record(node_results)
+        history.prune(flat_graph.get('nodes', {}))
+        history.save()
+
         return node_results
 
     def compile(self, project):
@@ -196,10 +250,40 @@ class RunManager(object):
         else:
             logger.info("")
 
+        cache = None
+        if dbt.flags.USE_COMPILE_CACHE:
+            cache = dbt.compile_cache.CompileCache.load(
+                self.target_path, self.project.cfg,
+                flat_graph.get('macros', {}))
+
+        dbt.compile_cache.set_active_cache(cache)
+
+        dbt.clients.jinja.reset_render_counts()
+
+        relations_cache = None
+        if dbt.flags.USE_RELATION_CACHE:
+            relations_cache = dbt.adapters.cache.RelationsCache(
+                self.project.cfg.get('quoting'))
+
+        dbt.adapters.cache.set_active_cache(relations_cache)
+
+        writer = None
+
         try:
+            # the workers are forked before any threads are started, as a
+            # forked process only gets the thread that forked it
+            if self.compile_workers > 1:
+                dbt.compile_pool.set_active_pool(
+                    dbt.compile_pool.CompilePool(self.compile_workers,
+                                                 self.project, flat_graph))
+
+            writer = dbt.writer.BackgroundWriter()
+            dbt.writer.set_active_writer(writer)
+
             Runner.before_hooks(self.project, adapter, flat_graph)
             started = time.time()
-            Runner.before_run(self.project, adapter, flat_graph)
+            Runner.before_run(self.project, adapter, flat_graph,
+                              self.threads)
             res = self.execute_nodes(linker, Runner, flat_graph, dep_list)
             Runner.after_run(self.project, adapter, res, flat_graph)
             elapsed = time.time() - started
@@ -208,6 +292,45 @@ class RunManager(object):
         finally:
             adapter.cleanup_connections()
 
+            pool = dbt.compile_pool.get_active_pool()
+            if pool is not None:
+                pool.close()
+
+            dbt.compile_pool.set_active_pool(None)
+            dbt.compile_cache.set_active_cache(None)
+            dbt.adapters.cache.set_active_cache(None)
+
+            if relations_cache is not None:
+                logger.debug("Served {} of {} relation listings from the "
+                             "relations cache".format(
+                                 relations_cache.hits,
+                                 relations_cache.hits +
+                                 relations_cache.misses))
+
+            if writer is not None:
+                writer.close()
+                logger.debug("Wrote {} files, {} were unchanged"
+                             .format(writer.written, writer.unchanged))
+
+            dbt.writer.set_active_writer(None)
+
+            render_counts = dbt.clients.jinja.get_render_counts()
+            logger.debug("Skipped {} of {} renders of strings without any "
+                         "template syntax".format(
+                             render_counts['skipped'],
+                             render_counts['skipped'] +
+                             render_counts['rendered']))
+
+            if cache is not None:
+                if writer is not None:
+                    cache.forget_written(writer.failed_paths())
+                cache.save()
+                logger.info("Served {} of {} compiled nodes from the compile "
+                            "cache".format(cache.hits,
+                                           cache.hits + cache.misses))
+
+        writer.raise_errors()
+
         return res
 
     # ------------------------------------
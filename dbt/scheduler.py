@@ -0,0 +1,196 @@
+import heapq
+import json
+import os
+
+import dbt.clients.system
+import dbt.utils
+
+from dbt.logger import GLOBAL_LOGGER as logger
+
+FIFO = 'fifo'
+CRITICAL_PATH = 'critical-path'
+SCHEDULERS = [FIFO, CRITICAL_PATH]
+
+RUN_HISTORY_FILE_NAME = 'run_history.json'
+
+# the assumed execution time of nodes that haven't been run before, when
+# there is no history at all
+DEFAULT_EXECUTION_TIME = 1.0
+
+
+class RunHistory(object):
+    """The execution time of each node the last time it ran successfully,
+    persisted in the target directory between invocations."""
+
+    def __init__(self, path, timings=None):
+        self.path = path
+        self.timings = dbt.utils.coalesce(timings, {})
+
+    @classmethod
+    def load(cls, target_path):
+        path = os.path.join(target_path, RUN_HISTORY_FILE_NAME)
+        timings = {}
+
+        if os.path.exists(path):
+            try:
+                timings = json.loads(
+                    dbt.clients.system.load_file_contents(path))
+            except Exception as e:
+                logger.debug("Could not read the run history at {}, "
+                             "ignoring it: {}".format(path, e))
+
+        return cls(path, timings)
+
+    def record(self, results):
+        for result in results:
+            if result.skipped or result.errored:
+                continue
+
+            self.timings[result.node.get('unique_id')] = \
+                result.execution_time
+
+    def prune(self, unique_ids):
+        """Forget the nodes that aren't in the given unique IDs, eg. because
+        they were deleted."""
+        unique_ids = set(unique_ids)
+
+        self.timings = {
+            unique_id: timing for unique_id, timing in self.timings.items()
+            if unique_id in unique_ids
+        }
+
+    def save(self):
+        try:
+            dbt.clients.system.make_directory(os.path.dirname(self.path))
+            dbt.clients.system.write_file(
+                self.path, json.dumps(self.timings, sort_keys=True))
+
+        except Exception as e:
+            logger.debug("Could not write the run history to {}: {}"
+                         .format(self.path, e))
+
+    def get_execution_times(self, unique_ids):
+        """Return the expected execution time of each of the given nodes.
+        Nodes without any history are assumed to take the average time."""
+        known = [self.timings[unique_id] for unique_id in unique_ids
+                 if unique_id in self.timings]
+
+        if known:
+            default = sum(known) / len(known)
+        else:
+            default = DEFAULT_EXECUTION_TIME
+
+        return {
+            unique_id: self.timings.get(unique_id, default)
+            for unique_id in unique_ids
+        }
+
+
+def get_dependents(waiting_on):
+    dependents = {unique_id: [] for unique_id in waiting_on}
+
+    for unique_id, dependencies in waiting_on.items():
+        for dependency in dependencies:
+            dependents[dependency].append(unique_id)
+
+    return dependents
+
+
+def get_critical_path_priorities(waiting_on, execution_times):
+    """Return the length of the longest path from each node to the end of the
+    run, weighted by the execution time of each node on the path. Starting
+    the nodes with the longest paths first keeps long chains from being left
+    until the end of the run.
+    """
+    dependents = get_dependents(waiting_on)
+    remaining = {unique_id: len(dependents[unique_id])
+                 for unique_id in waiting_on}
+
+    # walk the nodes from the end of the run backwards
+    to_visit = [unique_id for unique_id, count in remaining.items()
+                if count == 0]
+    priorities = {}
+
+    while to_visit:
+        unique_id = to_visit.pop()
+
+        downstream = max([priorities[dependent]
+                          for dependent in dependents[unique_id]] or [0])
+        priorities[unique_id] = execution_times[unique_id] + downstream
+
+        for dependency in waiting_on[unique_id]:
+            remaining[dependency] -= 1
+            if remaining[dependency] == 0:
+                to_visit.append(dependency)
+
+    return priorities
+
+
+class NodeQueue(object):
+    """Hands out nodes once every node they wait on is done. Ready nodes are
+    handed out highest priority first, then in the given order."""
+
+    def __init__(self, node_order, waiting_on, priorities=None):
+        self.position = {
+            unique_id: i for i, unique_id in enumerate(node_order)
+        }
+        self.waiting_on = {
+            unique_id: set(waiting_on[unique_id]) for unique_id in node_order
+        }
+        self.dependents = get_dependents(self.waiting_on)
+        self.priorities = dbt.utils.coalesce(priorities, {})
+        self.ready = []
+
+        for unique_id in node_order:
+            if len(self.waiting_on[unique_id]) == 0:
+                self._push(unique_id)
+
+    def _push(self, unique_id):
+        heapq.heappush(self.ready, (-self.priorities.get(unique_id, 0),
+                                    self.position[unique_id],
+                                    unique_id))
+
+    def has_ready(self):
+        return len(self.ready) > 0
+
+    def pop(self):
+        return heapq.heappop(self.ready)[-1]
+
+    def mark_done(self, unique_id):
+        for dependent in self.dependents[unique_id]:
+            self.waiting_on[dependent].discard(unique_id)
+
+            if len(self.waiting_on[dependent]) == 0:
+                self._push(dependent)
+
+
+class SkipTracker(object):
+    """Tracks the nodes that have to be skipped because something upstream
+    of them failed. Each node keeps a count of its failed or skipped
+    parents, and a node is skipped as soon as its count goes above zero, so
+    failures are propagated in constant time per edge over the whole run.
+    """
+
+    def __init__(self, depends_on):
+        self.dependents = get_dependents(depends_on)
+        self.failed_parents = {unique_id: 0 for unique_id in depends_on}
+
+    def is_skipped(self, unique_id):
+        return self.failed_parents[unique_id] > 0
+
+    def mark_failed(self, unique_id):
+        """Record that a node failed, and return the nodes that are newly
+        skipped because of it"""
+        skipped = []
+        to_visit = [unique_id]
+
+        while to_visit:
+            for dependent in self.dependents[to_visit.pop()]:
+                self.failed_parents[dependent] += 1
+
+                # dependents of nodes skipped earlier were already visited
+                if self.failed_parents[dependent] == 1:
+                    skipped.append(dependent)
+                    to_visit.append(dependent)
+
+        return skipped
@@ -122,21 +122,126 @@ def find_by_name(flat_graph, target_name, target_package, subgraph,
         nodetype)
 
 
+def raise_invalid_unique_id(model):
+    node_type = model.get('resource_type', 'node')
+    msg = "{} names cannot contain '.' characters".format(node_type)
+    dbt.exceptions.raise_compiler_error(msg, model)
+
+
+class NameIndex(object):
+    """An index of the unique ids in a subgraph by resource type, package and
+    name. When there's no package to match on, the first unique id added for
+    a name wins, which is the same one a scan of the subgraph would find.
+    """
+
+    def __init__(self):
+        self.by_package = {}
+        self.by_name = {}
+        self.invalid = None
+
+    def add(self, unique_id, model):
+        node_parts = unique_id.split('.')
+        if len(node_parts) != 3:
+            if self.invalid is None:
+                self.invalid = model
+            return
+
+        resource_type, package_name, node_name = node_parts
+
+        self.by_package[(resource_type, package_name, node_name)] = unique_id
+        self.by_name.setdefault((resource_type, node_name), unique_id)
+
+    def find(self, subgraph, target_name, target_package, nodetype):
+        if self.invalid is not None:
+            raise_invalid_unique_id(self.invalid)
+
+        for resource_type in nodetype:
+            if target_package is None:
+                unique_id = self.by_name.get((resource_type, target_name))
+            else:
+                unique_id = self.by_package.get(
+                    (resource_type, target_package, target_name))
+
+            if unique_id is not None:
+                return subgraph.get(unique_id)
+
+        return None
+
+
+class IndexedSubgraph(dict):
+    """A dict mapping unique id -> node that keeps a NameIndex of its keys up
+    to date as nodes are added, so find_in_subgraph_by_name doesn't have to
+    scan it. Nodes are rarely removed, so that rebuilds the whole index."""
+
+    def __init__(self, *args, **kwargs):
+        super(IndexedSubgraph, self).__init__(*args, **kwargs)
+        self._reindex()
+
+    def __reduce__(self):
+        # pickle restores dict items before __dict__, so the index wouldn't
+        # exist yet when __setitem__ is called
+        return (self.__class__, (dict(self),))
+
+    def _reindex(self):
+        self.name_index = NameIndex()
+
+        for unique_id, model in self.items():
+            self.name_index.add(unique_id, model)
+
+    def __setitem__(self, unique_id, model):
+        if unique_id not in self:
+            self.name_index.add(unique_id, model)
+
+        super(IndexedSubgraph, self).__setitem__(unique_id, model)
+
+    def setdefault(self, unique_id, model=None):
+        if unique_id not in self:
+            self[unique_id] = model
+
+        return self[unique_id]
+
+    def update(self, *args, **kwargs):
+        for unique_id, model in dict(*args, **kwargs).items():
+            self[unique_id] = model
+
+    def __delitem__(self, unique_id):
+        super(IndexedSubgraph, self).__delitem__(unique_id)
+        self._reindex()
+
+    def pop(self, *args):
+        model = super(IndexedSubgraph, self).pop(*args)
+        self._reindex()
+        return model
+
+    def popitem(self):
+        item = super(IndexedSubgraph, self).popitem()
+        self._reindex()
+        return item
+
+    def clear(self):
+        super(IndexedSubgraph, self).clear()
+        self._reindex()
+
+
 def find_in_subgraph_by_name(subgraph, target_name, target_package, nodetype):
     """Find an entry in a subgraph by name. Any mapping that implements
     .items() and maps unique id -> something can be used as the subgraph.
+    An IndexedSubgraph is searched with its index instead of a scan.
 
     Names are like:
         '{nodetype}.{target_package}.{target_name}'
 
     You can use `None` for the package name as a wildcard.
     """
+    name_index = getattr(subgraph, 'name_index', None)
+    if name_index is not None:
+        return name_index.find(subgraph, target_name, target_package,
+                               nodetype)
+
     for name, model in subgraph.items():
         node_parts = name.split('.')
         if len(node_parts) != 3:
-            node_type = model.get('resource_type', 'node')
-            msg = "{} names cannot contain '.' characters".format(node_type)
-            dbt.exceptions.raise_compiler_error(msg, model)
+            raise_invalid_unique_id(model)
 
         resource_type, package_name, node_name = node_parts
 
@@ -1,17 +1,140 @@
 import os.path
+import threading
 
 import dbt.clients.system
+import dbt.compat
+import dbt.exceptions
+import dbt.utils
 
+from dbt.compat import queue
+from dbt.logger import GLOBAL_LOGGER as logger
 
-def write_node(node, target_path, subdirectory, payload):
-    node_path = node.get('path')
+# The writer used by write_node while nodes are being run. When there isn't
+# one, files are written on the calling thread.
+_active_writer = None
+
+
+def get_active_writer():
+    return _active_writer
+
+
+def set_active_writer(writer):
+    global _active_writer
+    _active_writer = writer
 
-    full_path = os.path.join(
+
+def get_node_path(node, target_path, subdirectory):
+    return os.path.join(
         target_path,
         subdirectory,
         node.get('package_name'),
-        node_path)
+        node.get('path'))
+
+
+def payload_digest(payload):
+    return dbt.utils.md5(dbt.compat.to_string(payload))
+
+
+def write_if_changed(path, payload, digest=None):
+    """Atomically write the payload to path, unless the file there already
+    has the same contents. Returns True if the file was written."""
+    if digest is None:
+        digest = payload_digest(payload)
+
+    if (os.path.exists(path) and
+            dbt.clients.system.file_md5(path) == digest):
+        return False
+
+    return dbt.clients.system.write_file_atomic(path, payload)
+
+
+class BackgroundWriter(object):
+    """Writes files on a background thread, so that the threads running
+    nodes don't wait on the disk. A file is only queued if its contents
+    differ from the last thing queued for the same path, and is only written
+    if they differ from what's already on disk.
+
+    Errors are collected rather than raised, and should be checked with
+    raise_errors once the writer is closed.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.digests = {}
+        self.errors = []
+        self.lock = threading.Lock()
+
+        self.written = 0
+        self.unchanged = 0
+
+        self.thread = threading.Thread(target=self._write_queued)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write(self, path, payload):
+        digest = payload_digest(payload)
+
+        with self.lock:
+            if self.digests.get(path) == digest:
+                self.unchanged += 1
+                return
+
+            self.digests[path] = digest
+
+        self.queue.put((path, payload, digest))
+
+    def _write_queued(self):
+        while True:
+            item = self.queue.get()
+
+            if item is None:
+                break
+
+            path, payload, digest = item
+
+            try:
+                written = write_if_changed(path, payload, digest)
+
+            except Exception as e:
+                logger.debug("Could not write {}: {}".format(path, e))
+                with self.lock:
+                    self.errors.append((path, e))
+                continue
+
+            with self.lock:
+                if written:
+                    self.written += 1
+                else:
+                    self.unchanged += 1
+
+    def close(self):
+        """Wait for every queued file to be written."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def failed_paths(self):
+        with self.lock:
+            return [path for path, _ in self.errors]
+
+    def raise_errors(self):
+        with self.lock:
+            errors = list(self.errors)
+
+        if errors:
+            path, error = errors[0]
+            raise dbt.exceptions.RuntimeException(
+                "Could not write {} files, including {}: {}"
+                .format(len(errors), path, error))
+
+
+def write_node(node, target_path, subdirectory, payload):
+    full_path = get_node_path(node, target_path, subdirectory)
+
+    writer = get_active_writer()
 
-    dbt.clients.system.write_file(full_path, payload)
+    if writer is None:
+        write_if_changed(full_path, payload)
+    else:
+        writer.write(full_path, payload)
 
     return full_path
@@ -0,0 +1,77 @@
+"""Time CTE injection with the fast-path scanner against sqlparse on
+generated models of increasing size.
+
+Usage:
+    python test/benchmark/cte_injection_benchmark.py [num_lines ...]
+
+Each model is a WITH clause of CTEs with comments, quoted strings and
+nested subqueries, followed by a final select, roughly like a large
+hand-written dbt model.
+"""
+import sys
+import time
+from collections import OrderedDict
+
+import dbt.compilation
+
+DEFAULT_SIZES = [100, 500, 2000, 5000]
+
+CTES = OrderedDict([
+    ('model.bench.ephemeral', ' __dbt__CTE__ephemeral as (\n'
+                              'select * from analytics.source\n)'),
+])
+
+CTE_TEMPLATE = """
+cte_{i} as (
+    -- cte number {i}, with a comment (and parentheses
+    select
+        id,
+        'it''s a string with (parens' as label_{i},
+        /* a block comment
+           over two lines */
+        (select max(x) from (select id as x from cte_{prev}) sub) as m
+    from cte_{prev}
+    where id > {i}
+),"""
+
+
+def build_sql(num_lines):
+    lines_per_cte = CTE_TEMPLATE.count('\n')
+    parts = ['with cte_0 as (select 1 as id),']
+
+    for i in range(1, max(num_lines // lines_per_cte, 1) + 1):
+        parts.append(CTE_TEMPLATE.format(i=i, prev=i - 1))
+
+    parts.append('\nfinal as (select * from __dbt__CTE__ephemeral)\n'
+                 'select * from final')
+
+    return ''.join(parts)
+
+
+def timed(fn, *args):
+    start = time.time()
+    result = fn(*args)
+    return result, time.time() - start
+
+
+def main(sizes):
+    print('{:>8} {:>10} {:>14} {:>12}'.format(
+        'lines', 'bytes', 'sqlparse (s)', 'scanner (s)'))
+
+    for num_lines in sizes:
+        sql = build_sql(num_lines)
+
+        expected, sqlparse_elapsed = timed(
+            dbt.compilation.inject_ctes_with_sqlparse, sql, CTES)
+        actual, scanner_elapsed = timed(
+            dbt.compilation.inject_ctes_into_sql, sql, CTES)
+
+        assert actual == expected
+
+        print('{:>8} {:>10} {:>14.3f} {:>12.3f}'.format(
+            sql.count('\n') + 1, len(sql), sqlparse_elapsed,
+            scanner_elapsed))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,71 @@
+"""Time Linker.as_dependency_list on generated graphs of increasing size.
+
+Usage:
+    python test/benchmark/linker_benchmark.py [num_nodes ...]
+
+Each node depends on up to five randomly chosen nodes created before it, and
+one in ten nodes is ephemeral, so the graph looks roughly like a large dbt
+project.
+"""
+import random
+import sys
+import time
+
+from dbt.compilation import Linker
+
+DEFAULT_SIZES = [1000, 5000, 10000, 50000]
+MAX_PARENTS = 5
+
+
+def build_linker(num_nodes, seed=0):
+    rand = random.Random(seed)
+    linker = Linker()
+
+    for i in range(num_nodes):
+        node_id = 'model.bench.model_{}'.format(i)
+
+        if rand.random() < 0.1:
+            materialized = 'ephemeral'
+        else:
+            materialized = 'view'
+
+        linker.update_node_data(node_id, {
+            'unique_id': node_id,
+            'resource_type': 'model',
+            'config': {'materialized': materialized},
+        })
+
+        if i == 0:
+            continue
+
+        num_parents = rand.randint(0, min(i, MAX_PARENTS))
+        for parent in rand.sample(range(i), num_parents):
+            linker.dependency(node_id, 'model.bench.model_{}'.format(parent))
+
+    return linker
+
+
+def timed(fn, *args, **kwargs):
+    start = time.time()
+    result = fn(*args, **kwargs)
+    return result, time.time() - start
+
+
+def main(sizes):
+    print('{:>8} {:>8} {:>8} {:>12} {:>12}'.format(
+        'nodes', 'edges', 'levels', 'all (s)', 'ephemeral (s)'))
+
+    for num_nodes in sizes:
+        linker = build_linker(num_nodes)
+
+        levels, elapsed = timed(linker.as_dependency_list)
+        _, ephemeral_elapsed = timed(linker.as_dependency_list,
+                                     ephemeral_only=True)
+
+        print('{:>8} {:>8} {:>8} {:>12.3f} {:>12.3f}'.format(
+            num_nodes, len(linker.edges()), len(levels), elapsed,
+            ephemeral_elapsed))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
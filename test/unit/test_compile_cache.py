@@ -0,0 +1,86 @@
+import mock
+import shutil
+import tempfile
+import unittest
+
+import dbt.clients.jinja
+import dbt.compilation
+import dbt.compile_cache
+import dbt.flags
+
+from test.unit.utils import get_node, parse_macros, project_config
+
+
+class CompileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = False
+
+        self.target_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target_path)
+        self.addCleanup(dbt.compile_cache.set_active_cache, None)
+
+        self.project = project_config(**{'target-path': self.target_path})
+
+        self.macros = {}
+        self.set_macros("{% macro one() %}1{% endmacro %}"
+                        "{% macro schema_of(x) %}{{ adapter.type() }}"
+                        "{% endmacro %}")
+
+    def set_macros(self, macro_sql):
+        self.macros = parse_macros(macro_sql, root_path=self.target_path)
+
+    def get_node(self, raw_sql):
+        return get_node('model_one', raw_sql)
+
+    def compile(self, node):
+        cache = dbt.compile_cache.CompileCache.load(
+            self.target_path, self.project, self.macros)
+        dbt.compile_cache.set_active_cache(cache)
+
+        flat_graph = {'nodes': {node['unique_id']: node},
+                      'macros': self.macros}
+        compiler = dbt.compilation.Compiler(self.project)
+
+        with mock.patch.object(dbt.clients.jinja, 'get_rendered',
+                               wraps=dbt.clients.jinja.get_rendered) as render:
+            compiled = compiler.compile_node(node, flat_graph)
+
+        cache.save()
+        return compiled, render.called
+
+    def test__unchanged_nodes_are_not_rendered(self):
+        node = self.get_node("select {{ one() }}")
+
+        compiled, rendered = self.compile(node)
+        self.assertTrue(rendered)
+        self.assertEqual(compiled['injected_sql'], 'select 1')
+
+        compiled, rendered = self.compile(node)
+        self.assertFalse(rendered)
+        self.assertEqual(compiled['compiled_sql'], 'select 1')
+        self.assertEqual(compiled['injected_sql'], 'select 1')
+
+        compiled, rendered = self.compile(self.get_node("select 2"))
+        self.assertTrue(rendered)
+        self.assertEqual(compiled['compiled_sql'], 'select 2')
+
+    def test__editing_a_called_macro_invalidates(self):
+        node = self.get_node("select {{ one() }}")
+        self.compile(node)
+
+        self.set_macros("{% macro one() %}one{% endmacro %}"
+                        "{% macro schema_of(x) %}{% endmacro %}")
+        compiled, rendered = self.compile(node)
+
+        self.assertTrue(rendered)
+        self.assertEqual(compiled['compiled_sql'], 'select one')
+
+    def test__volatile_nodes_are_not_cached(self):
+        for raw_sql in ["select '{{ env_var(\"HOME\") }}'",
+                        "select '{{ schema_of(1) }}'"]:
+            node = self.get_node(raw_sql)
+            self.compile(node)
+            _, rendered = self.compile(node)
+
+            self.assertTrue(rendered, raw_sql)
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import dbt.compile_pool
+import dbt.flags
+import dbt.project
+import dbt.tracking
+from dbt.node_runners import CompileRunner
+
+from test.unit.utils import get_node, parse_macros
+
+
+class CompilePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = False
+
+        self.addCleanup(setattr, dbt.tracking, 'active_user',
+                        dbt.tracking.active_user)
+        dbt.tracking.active_user = dbt.tracking.User()
+
+        self.target_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target_path)
+
+        self.project = dbt.project.Project(
+            cfg={
+                'name': 'root',
+                'version': '0.1',
+                'profile': 'test',
+                'project-root': os.path.abspath('.'),
+                'target-path': self.target_path,
+            },
+            profiles={
+                'test': {
+                    'outputs': {
+                        'test': {
+                            'type': 'postgres',
+                            'threads': 4,
+                            'host': 'database',
+                            'port': 5432,
+                            'user': 'root',
+                            'pass': 'password',
+                            'dbname': 'dbt',
+                            'schema': 'dbt_test'
+                        }
+                    },
+                    'target': 'test'
+                }
+            },
+            profiles_dir=None)
+
+        macros = parse_macros("{% macro answer() %}42{% endmacro %}",
+                              root_path=self.target_path)
+
+        self.flat_graph = {
+            'nodes': {
+                'model.root.ephemeral': get_node(
+                    'ephemeral', 'select {{ answer() }} as answer',
+                    materialized='ephemeral', schema='dbt_test'),
+                'model.root.view': get_node(
+                    'view', 'select * from {{ ref("ephemeral") }}',
+                    depends_on=['model.root.ephemeral'], schema='dbt_test'),
+            },
+            'macros': macros,
+        }
+
+    def test__workers_compile_like_the_parent(self):
+        pool = dbt.compile_pool.CompilePool(2, self.project, self.flat_graph)
+        self.addCleanup(pool.close)
+
+        ephemeral = pool.compile_node(
+            self.flat_graph['nodes']['model.root.ephemeral'], self.flat_graph)
+        self.assertEqual(ephemeral['compiled_sql'], 'select 42 as answer')
+
+        self.flat_graph['nodes']['model.root.ephemeral'] = ephemeral
+        view = pool.compile_node(
+            self.flat_graph['nodes']['model.root.view'], self.flat_graph)
+
+        expected = CompileRunner._compile_node(
+            None, self.project, self.flat_graph['nodes']['model.root.view'],
+            self.flat_graph)
+
+        self.assertEqual(view, expected)
+        self.assertIn('__dbt__CTE__ephemeral', view['injected_sql'])
+        self.assertTrue(os.path.exists(view['build_path']))
+
+    def test__errors_are_left_to_the_parent(self):
+        pool = dbt.compile_pool.CompilePool(1, self.project, self.flat_graph)
+        self.addCleanup(pool.close)
+
+        broken = get_node('broken', 'select {{ ref("missing") }}',
+                          schema='dbt_test')
+        self.assertIsNone(pool.compile_node(broken, self.flat_graph))
@@ -425,3 +425,124 @@ class CompilerTest(unittest.TestCase):
                          .get('model.root.ephemeral_level_two')
                          .get('extra_ctes_injected')),
             True)
+
+    def test__inject_ctes_into_sql__matches_sqlparse(self):
+        ctes = OrderedDict([
+            ('model.root.a', ' __dbt__CTE__a as (\nselect 1\n)'),
+            ('model.root.b', ' __dbt__CTE__b as (\nselect 2\n)'),
+        ])
+
+        fast_path = [
+            'select 1',
+            '  -- leading comment\nselect 1',
+            '/* x */ WITH b as (select 2) select * from b',
+            '\n\nwith x as (select 1) select 2',
+            "with /* c */ x as (select 'a''b(' as s) select * from x",
+            'select \'(\' as p, "with" from t',
+            'SELECT\n  a -- with\nFROM t',
+            "select 'a\\'b' as x",
+            'with recursive t as (select 1) select * from t',
+        ]
+
+        fallback = [
+            'select 1;\n',
+            'select 1; select 2',
+            'select x::timestamp with time zone from y',
+            'select * from (with a as (select 1) select * from a) s',
+            'with',
+            '(select 1)',
+            'select (1',
+            "select 'abc",
+            'select $$x$$',
+            'insert into x select 1',
+            'select 1 /* unterminated',
+        ]
+
+        for sql in fast_path + fallback:
+            self.assertEqual(
+                dbt.compilation.inject_ctes_into_sql(sql, ctes),
+                dbt.compilation.inject_ctes_with_sqlparse(sql, ctes),
+                sql)
+
+        for sql in fast_path:
+            self.assertIsNotNone(
+                dbt.compilation.find_cte_insertion_point(sql), sql)
+
+        for sql in fallback:
+            self.assertIsNone(
+                dbt.compilation.find_cte_insertion_point(sql), sql)
+
+    def test__prepend_ctes__ephemeral_models_are_expanded_once(self):
+        ephemeral_config = self.model_config.copy()
+        ephemeral_config['materialized'] = 'ephemeral'
+
+        def model(name, compiled_sql, refs, config):
+            return {
+                'name': name,
+                'schema': 'analytics',
+                'alias': name,
+                'resource_type': 'model',
+                'unique_id': 'model.root.{}'.format(name),
+                'fqn': ['root_project', name],
+                'empty': False,
+                'package_name': 'root',
+                'root_path': '/usr/src/app',
+                'refs': [],
+                'depends_on': {
+                    'nodes': ['model.root.{}'.format(r) for r in refs],
+                    'macros': []
+                },
+                'config': config,
+                'tags': [],
+                'path': '{}.sql'.format(name),
+                'original_file_path': '{}.sql'.format(name),
+                'raw_sql': compiled_sql,
+                'compiled': True,
+                'extra_ctes_injected': False,
+                'extra_ctes': OrderedDict(
+                    ('model.root.{}'.format(r), None) for r in refs),
+                'injected_sql': '',
+                'compiled_sql': compiled_sql,
+            }
+
+        input_graph = {
+            'macros': {},
+            'nodes': {
+                'model.root.base': model(
+                    'base', 'select * from source_table', [],
+                    ephemeral_config),
+                'model.root.ephemeral': model(
+                    'ephemeral', 'select * from __dbt__CTE__base',
+                    ['base'], ephemeral_config),
+                'model.root.view_one': model(
+                    'view_one', 'select * from __dbt__CTE__ephemeral',
+                    ['ephemeral'], self.model_config),
+                'model.root.view_two': model(
+                    'view_two', 'select 2 from __dbt__CTE__ephemeral',
+                    ['ephemeral'], self.model_config),
+            }
+        }
+
+        first, output_graph = dbt.compilation.prepend_ctes(
+            input_graph['nodes']['model.root.view_one'], input_graph)
+
+        expanded = output_graph['nodes']['model.root.ephemeral']
+        self.assertTrue(expanded['extra_ctes_injected'])
+        self.assertEqual(list(expanded['extra_ctes']), ['model.root.base'])
+
+        # the second model reuses the expanded ephemeral model, rather than
+        # expanding base again
+        output_graph['nodes']['model.root.base']['compiled_sql'] = 'changed'
+        second, output_graph = dbt.compilation.prepend_ctes(
+            output_graph['nodes']['model.root.view_two'], output_graph)
+
+        self.assertIs(second['extra_ctes']['model.root.base'],
+                      first['extra_ctes']['model.root.base'])
+        self.assertEqualIgnoreWhitespace(
+            second['injected_sql'],
+            ('with __dbt__CTE__base as ('
+             'select * from source_table'
+             '), __dbt__CTE__ephemeral as ('
+             'select * from __dbt__CTE__base'
+             ') '
+             'select 2 from __dbt__CTE__ephemeral'))
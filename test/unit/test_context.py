@@ -0,0 +1,106 @@
+import unittest
+
+import dbt.clients.jinja
+import dbt.context.common
+import dbt.context.parser
+import dbt.flags
+
+from test.unit.utils import get_node, parse_macros, project_config
+
+
+class MacroNamespaceTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = True
+
+        self.root_project_config = project_config()
+
+        self.macros = {}
+        self.add_macros('dbt', "{% macro whoami() %}global{% endmacro %}"
+                               "{% macro shout(s) %}{{ s }}!{% endmacro %}")
+        self.add_macros('root', "{% macro whoami() %}{{ model.name }}"
+                                "{% endmacro %}")
+        self.add_macros('snowplow', "{% macro whoami() %}snowplow"
+                                    "{% endmacro %}")
+
+    def add_macros(self, package_name, macro_sql):
+        self.macros.update(parse_macros(macro_sql, package_name))
+
+    def render(self, sql, node):
+        context = dbt.context.parser.generate(
+            node, self.root_project_config, {'macros': self.macros})
+
+        return dbt.clients.jinja.get_rendered(sql, context, node)
+
+    def test__local_macros_take_precedence(self):
+        self.assertEqual(
+            self.render("{{ whoami() }}", get_node('model_one')),
+            'model_one')
+        self.assertEqual(
+            self.render("{{ whoami() }}",
+                        get_node('model_one', package_name='snowplow')),
+            'snowplow')
+        self.assertEqual(
+            self.render("{{ whoami() }}",
+                        get_node('model_one', package_name='other')),
+            'global')
+
+    def test__package_prefixed_macros(self):
+        self.assertEqual(
+            self.render("{{ snowplow.whoami() }} {{ dbt.shout('hi') }}",
+                        get_node('model_one')),
+            'snowplow hi!')
+
+    def test__macros_are_bound_to_each_node(self):
+        self.assertEqual(
+            self.render("{{ root.whoami() }}", get_node('model_one')),
+            'model_one')
+        self.assertEqual(
+            self.render("{{ root.whoami() }}", get_node('model_two')),
+            'model_two')
+
+    def test__namespace_is_shared(self):
+        self.render("select 1", get_node('model_one'))
+        namespace = dbt.context.common.get_macro_namespace(self.macros)
+
+        self.render("select 1", get_node('model_two'))
+        self.assertIs(dbt.context.common.get_macro_namespace(self.macros),
+                      namespace)
+
+        self.add_macros('other', "{% macro new() %}{% endmacro %}")
+        self.assertIsNot(dbt.context.common.get_macro_namespace(self.macros),
+                         namespace)
+
+    def test__base_context_is_shared(self):
+        node_one = get_node('model_one')
+        node_two = get_node('model_two')
+        flat_graph = {'macros': self.macros}
+
+        context_one = dbt.context.parser.generate(
+            node_one, self.root_project_config, flat_graph)
+        context_two = dbt.context.parser.generate(
+            node_two, self.root_project_config, flat_graph)
+
+        self.assertIs(context_one['exceptions'], context_two['exceptions'])
+        self.assertIsNot(context_one['adapter'], context_two['adapter'])
+        self.assertEqual(context_two['this'].identifier, 'model_two')
+        self.assertIs(context_two['context'], context_two)
+
+    def test__nodes_dont_share_mutable_entries(self):
+        self.render("{{ target.update({'schema': 'changed'}) }}"
+                    "{{ modules.update({'datetime': none}) }}",
+                    get_node('model_one'))
+
+        self.assertEqual(
+            self.render("{{ target.schema }} {{ env.schema }} "
+                        "{{ modules.datetime is none }}",
+                        get_node('model_two')),
+            'analytics analytics False')
+
+    def test__macros_shadow_node_functions(self):
+        self.add_macros('root', "{% macro schema() %}mine{% endmacro %}")
+
+        self.assertEqual(
+            self.render("{{ schema() }} {{ this.identifier }}",
+                        get_node('model_one')),
+            'mine model_one')
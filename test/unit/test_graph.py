@@ -21,7 +21,7 @@ from dbt.logger import GLOBAL_LOGGER as logger # noqa
 class GraphTest(unittest.TestCase):
 
     def tearDown(self):
-        nx.write_gpickle = self.real_write_gpickle
+        dbt.linker.Linker.write_graph = self.real_write_graph
         dbt.utils.dependency_projects = self.real_dependency_projects
         dbt.clients.system.find_matching = self.real_find_matching
         dbt.clients.system.load_file_contents = self.real_load_file_contents
@@ -29,11 +29,11 @@ class GraphTest(unittest.TestCase):
     def setUp(self):
         dbt.flags.STRICT_MODE = True
 
-        def mock_write_gpickle(graph, outfile):
-            self.graph_result = graph
+        def mock_write_graph(linker, outfile):
+            self.graph_result = linker.graph
 
-        self.real_write_gpickle = nx.write_gpickle
-        nx.write_gpickle = mock_write_gpickle
+        self.real_write_graph = dbt.linker.Linker.write_graph
+        dbt.linker.Linker.write_graph = mock_write_graph
 
         self.graph_result = None
 
@@ -3,6 +3,7 @@ import unittest
 import os
 import string
 import dbt.graph.selector as graph_selector
+import dbt.linker
 import dbt.project
 
 import networkx as nx
@@ -157,3 +158,80 @@ class GraphSelectionTest(unittest.TestCase):
         test(('X', 'a'), ('X', 'b'), False)
         test(('X', 'a'), ('X', 'a', 'b'), False)
         test(('X', 'a'), ('Y', '*'), False)
+
+    def test__fqn_index_matches_is_selected_node(self):
+        graph = nx.DiGraph()
+        fqns = [
+            ['X', 'a'],
+            ['X', 'dir', 'a'],
+            ['X', 'dir', 'b'],
+            ['X', 'dir', 'sub', 'c'],
+            ['Y', 'dir', 'c'],
+            ['Y', 'X'],
+            ['Y', 'b', 'b'],
+        ]
+        for fqn in fqns:
+            unique_id = 'model.' + '.'.join(fqn)
+            graph.add_node(unique_id, {'fqn': fqn})
+
+        package_names = graph_selector.get_package_names(graph)
+        index = graph_selector.FQNIndex(graph)
+
+        specs = ['a', 'b', 'c', 'X', 'Y', '*', 'dir', 'dir.*', 'dir.sub',
+                 'dir.a', 'X.a', 'X.*', 'X.dir', 'X.dir.c', 'X.dir.sub.c',
+                 'Y.b', 'Y.b.b', 'Y.b.b.b', 'sub.c', 'Z', 'Z.a', 'dir.Z.c']
+
+        for spec in specs:
+            qualified_name = spec.split('.')
+            expected = set()
+
+            for node in graph.nodes():
+                fqn = graph.node[node]['fqn']
+
+                if len(qualified_name) == 1 and fqn[-1] == qualified_name[0]:
+                    expected.add(node)
+                elif qualified_name[0] in package_names:
+                    if graph_selector.is_selected_node(fqn, qualified_name):
+                        expected.add(node)
+                elif any(graph_selector.is_selected_node(fqn,
+                                                         [p] + qualified_name)
+                         for p in package_names):
+                    expected.add(node)
+
+            self.assertEqual(index.get_nodes(qualified_name), expected, spec)
+
+    def test__closures_of_node_sets(self):
+        self.assertEqual(
+            graph_selector.get_ancestors(self.package_graph,
+                                         ['m.Y.d', 'm.X.g']),
+            set(['m.X.a', 'm.Y.b', 'm.X.c']))
+
+        self.assertEqual(
+            graph_selector.get_descendants(self.package_graph,
+                                           ['m.Y.b', 'm.X.c']),
+            set(['m.Y.d', 'm.X.e', 'm.Y.f', 'm.X.g']))
+
+        self.assertEqual(
+            graph_selector.get_descendants(self.package_graph,
+                                           ['m.X.a', 'm.Y.b']),
+            set(['m.Y.b', 'm.X.c', 'm.Y.d', 'm.X.e', 'm.Y.f', 'm.X.g']))
+
+    def test__ancestor_ephemeral_nodes(self):
+        linker = dbt.linker.Linker()
+        linker.graph = self.package_graph
+        flat_graph = {'nodes': {}}
+
+        for node in self.package_graph:
+            materialized = 'ephemeral' if node.endswith(('b', 'c')) \
+                else 'view'
+            flat_graph['nodes'][node] = {
+                'resource_type': 'model',
+                'config': {'materialized': materialized},
+            }
+
+        selector = graph_selector.NodeSelector(linker, flat_graph)
+
+        self.assertEqual(
+            selector.get_ancestor_ephemeral_nodes(
+                flat_graph, self.package_graph, set(['m.Y.d'])),
+            set(['m.Y.b']))
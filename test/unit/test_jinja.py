@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import dbt.clients.jinja
+import dbt.exceptions
+
+
+class TemplateCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.clients.jinja.clear_template_cache()
+
+    def tearDown(self):
+        dbt.clients.jinja.set_bytecode_cache_dir(None)
+        dbt.clients.jinja.clear_template_cache()
+
+    def test__templates_share_compiled_code(self):
+        first = dbt.clients.jinja.get_template("select {{ a }}", {'a': 1})
+        second = dbt.clients.jinja.get_template("select {{ a }}", {'a': 2})
+
+        self.assertIs(first.environment, second.environment)
+        self.assertEqual(len(dbt.clients.jinja._template_cache), 1)
+
+        # the globals passed in are still specific to each template
+        self.assertEqual(first.render(), 'select 1')
+        self.assertEqual(second.render(), 'select 2')
+
+    def test__capture_macros_has_its_own_environment(self):
+        template = dbt.clients.jinja.get_template(
+            "{{ some_package.some_macro() }}", {}, capture_macros=True)
+
+        self.assertEqual(template.render(), 'True')
+
+        with self.assertRaises(dbt.exceptions.CompilationException):
+            dbt.clients.jinja.get_rendered(
+                "{{ some_package.some_macro() }}", {})
+
+    def test__least_recently_used_template_is_dropped(self):
+        old_size = dbt.clients.jinja.TEMPLATE_CACHE_SIZE
+        dbt.clients.jinja.TEMPLATE_CACHE_SIZE = 2
+
+        try:
+            dbt.clients.jinja.get_template("one", {})
+            dbt.clients.jinja.get_template("two", {})
+            dbt.clients.jinja.get_template("one", {})
+            dbt.clients.jinja.get_template("three", {})
+        finally:
+            dbt.clients.jinja.TEMPLATE_CACHE_SIZE = old_size
+
+        self.assertEqual(
+            [source for _, source in dbt.clients.jinja._template_cache],
+            ['one', 'three'])
+
+    def test__bytecode_cache(self):
+        path = tempfile.mkdtemp()
+
+        try:
+            dbt.clients.jinja.set_bytecode_cache_dir(path)
+            dbt.clients.jinja.get_template("select {{ a }}", {})
+            self.assertEqual(len(os.listdir(path)), 1)
+
+            # a new process would start with an empty in-memory cache
+            dbt.clients.jinja.clear_template_cache()
+            template = dbt.clients.jinja.get_template("select {{ a }}",
+                                                      {'a': 1})
+            self.assertEqual(template.render(), 'select 1')
+        finally:
+            shutil.rmtree(path)
+
+
+class TemplateFreeRenderTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.clients.jinja.clear_template_cache()
+        dbt.clients.jinja.reset_render_counts()
+
+    def test__plain_text_is_not_rendered(self):
+        for sql in ["select 1", "select 1\n", "select\r\n  1\n\n", ""]:
+            expected = dbt.clients.jinja.get_template(sql, {}).render()
+            self.assertEqual(dbt.clients.jinja.get_rendered(sql, {}),
+                             expected)
+
+        # get_template above compiled each string, get_rendered didn't
+        self.assertEqual(dbt.clients.jinja.get_render_counts(),
+                         {'rendered': 0, 'skipped': 4})
+
+    def test__templates_are_rendered(self):
+        for sql in ["{{ 1 }}", "{% if true %}1{% endif %}", "{# 2 #}1"]:
+            self.assertEqual(dbt.clients.jinja.get_rendered(sql, {}), '1')
+
+        self.assertEqual(dbt.clients.jinja.get_render_counts(),
+                         {'rendered': 3, 'skipped': 0})
@@ -1,6 +1,11 @@
+import json
 import mock
+import os
+import shutil
+import tempfile
 import unittest
 
+import dbt.linker
 import dbt.utils
 
 from dbt.compilation import Linker
@@ -73,6 +78,40 @@ class LinkerTest(unittest.TestCase):
         expected_limit_2 = [['B'], ['A']]
         self.assertEqual(expected_limit_2, actual_limit_2)
 
+    def test_linker_dependency_list_uses_longest_path(self):
+        actual_deps = [('A', 'B'), ('B', 'C'), ('A', 'C'), ('D', 'C')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        actual = self.linker.as_dependency_list()
+        self.assertEqual(len(actual), 3)
+        self.assertEqual(actual[0], ['C'])
+        self.assertEqual(set(actual[1]), set(['B', 'D']))
+        self.assertEqual(actual[2], ['A'])
+
+    def test_linker_dependency_list_ephemeral_only(self):
+        dbt.utils.is_blocking_dependency = self.real_is_blocking_dependency
+
+        materializations = {'A': 'table', 'B': 'ephemeral', 'C': 'table'}
+        for node, materialized in materializations.items():
+            self.linker.update_node_data(node, {
+                'resource_type': 'model',
+                'config': {'materialized': materialized},
+            })
+
+        self.linker.dependency('A', 'B')
+        self.linker.dependency('B', 'C')
+
+        self.assertEqual(self.linker.as_dependency_list(),
+                         [['C'], ['B'], ['A']])
+        self.assertEqual(
+            self.linker.as_dependency_list(['A', 'C'], ephemeral_only=True),
+            [['C'], ['A']])
+        self.assertEqual(
+            self.linker.as_dependency_list(['B', 'C'], ephemeral_only=True),
+            [['B', 'C']])
+
     def test_linker_bad_limit_throws_runtime_error(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'D')]
 
@@ -90,6 +129,25 @@ class LinkerTest(unittest.TestCase):
 
         self.assertIsNotNone(self.linker.find_cycles())
 
+    def test__find_cycles__reports_the_cycle(self):
+        actual_deps = [('B', 'A'), ('C', 'B'), ('D', 'C'), ('B', 'D'),
+                       ('E', 'A')]
+
+        for (l, r) in actual_deps:
+            self.linker.dependency(l, r)
+
+        cycle = self.linker.find_cycles().split(' --> ')
+
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(sorted(cycle[:-1]), ['B', 'C', 'D'])
+        for parent, child in zip(cycle, cycle[1:]):
+            self.assertIn((parent, child), self.linker.edges())
+
+    def test__find_cycles__self_reference(self):
+        self.linker.dependency('A', 'A')
+
+        self.assertEqual(self.linker.find_cycles(), 'A --> A')
+
     def test__find_cycles__no_cycles(self):
         actual_deps = [('A', 'B'), ('B', 'C'), ('C', 'D')]
 
@@ -97,3 +155,41 @@ class LinkerTest(unittest.TestCase):
             self.linker.dependency(l, r)
 
         self.assertIsNone(self.linker.find_cycles())
+
+    def test__write_and_read_graph(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        graph_file = os.path.join(path, 'graph.json')
+
+        self.linker.dependency('B', 'A')
+        self.linker.dependency('C', 'B')
+        self.linker.update_node_data('A', {'name': 'A', 'agate_table': 1})
+        self.linker.update_node_data('B', {'name': 'B'})
+        self.linker.update_node_data('C', {'name': 'C'})
+        self.linker.write_graph(graph_file)
+
+        with open(graph_file) as fh:
+            contents = json.load(fh)
+
+        # node data isn't stored in the graph file itself
+        self.assertEqual(sorted(contents['nodes']), ['A', 'B', 'C'])
+        self.assertEqual(len(contents['edges']), 2)
+
+        linker = dbt.linker.from_file(graph_file)
+        self.assertEqual(sorted(linker.edges()),
+                         [('A', 'B'), ('B', 'C')])
+        self.assertEqual(linker.graph.node['B'], {})
+
+        self.assertEqual(linker.get_node('B'), {'name': 'B'})
+        self.assertEqual(linker.get_node('A'), {'name': 'A'})
+        self.assertEqual(linker.as_dependency_list(), [['A'], ['B'], ['C']])
+
+        linker = dbt.linker.from_file(graph_file)
+        with mock.patch('dbt.linker.open', create=True,
+                        side_effect=open) as mock_open:
+            linker.load_nodes()
+            linker.load_nodes()
+
+        # the payload file is only read once
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertEqual(linker.graph.node['C'], {'name': 'C'})
@@ -1,7 +1,9 @@
 import unittest
 
 import copy
+import json
 import os
+import six
 
 import dbt.flags
 from dbt.contracts.graph.parsed import ParsedNode, ParsedManifest
@@ -229,3 +231,12 @@ class ManifestTest(unittest.TestCase):
         expected_keys = set(ParsedNode.SCHEMA['required']) | {'agate_table'}
         for node in flat_nodes.values():
             self.assertEqual(set(node), expected_keys)
+
+    def test__write_json(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = ParsedManifest(nodes=nodes, macros={})
+        handle = six.StringIO()
+
+        manifest.write_json(handle)
+
+        self.assertEqual(json.loads(handle.getvalue()), manifest.serialize())
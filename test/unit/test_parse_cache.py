@@ -0,0 +1,117 @@
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+import dbt.flags
+import dbt.parser.cache
+from dbt.parser import ModelParser
+
+from test.unit.utils import get_model, parse_macros, project_config
+
+
+class ParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = True
+
+        self.target_path = tempfile.mkdtemp()
+
+        self.root_project_config = project_config()
+
+        self.all_projects = {'root': self.root_project_config}
+
+        self.models = [
+            get_model('model_one', "select *, {{ simple(1, 2) }} from events"),
+            get_model('model_two', "select * from {{ ref('model_one') }}"),
+        ]
+
+    def tearDown(self):
+        dbt.parser.cache.set_active_cache(None)
+        shutil.rmtree(self.target_path)
+
+    def parse(self, macro_sql):
+        """Parse the test models with a fresh cache loaded from disk, the way
+        GraphLoader does for each invocation."""
+        cache = dbt.parser.cache.ParseCache.load(self.target_path)
+        dbt.parser.cache.set_active_cache(cache)
+
+        macros = parse_macros(macro_sql)
+        cache.set_macros(macros)
+
+        nodes = ModelParser.parse_sql_nodes(
+            self.models, self.root_project_config, self.all_projects,
+            macros=macros)
+
+        dbt.parser.cache.set_active_cache(None)
+        cache.save()
+
+        return cache, macros, nodes
+
+    def test__unchanged_files_are_cached(self):
+        macro_sql = "{% macro simple(a, b) %}{{a}} + {{b}}{% endmacro %}"
+
+        cache, _, first = self.parse(macro_sql)
+        self.assertEqual(cache.hits, 0)
+
+        cache, macros, second = self.parse(macro_sql)
+        # one macro file and two models
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(first, second)
+
+        # macros from the cache compile their template when it's needed
+        self.assertIsNone(macros['macro.root.simple']._template)
+        self.assertTrue(callable(macros['macro.root.simple'].generator({})))
+
+    def test__changed_macro_invalidates_callers(self):
+        cache, _, _ = self.parse(
+            "{% macro simple(a, b) %}{{a}} + {{b}}{% endmacro %}")
+
+        cache, _, _ = self.parse(
+            "{% macro simple(a, b) %}{{a}} - {{b}}{% endmacro %}")
+
+        # model_one calls the macro and is reparsed, model_two is not
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test__changed_vars_invalidate_everything(self):
+        macro_sql = "{% macro simple(a, b) %}{{a}} + {{b}}{% endmacro %}"
+        self.parse(macro_sql)
+
+        self.root_project_config['cli_vars'] = {'key': 'value'}
+        cache, _, _ = self.parse(macro_sql)
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test__env_vars_are_not_cached(self):
+        self.models[1]['raw_sql'] = (
+            "{{ config(schema=env_var('PARSE_CACHE_SCHEMA', 'default')) }}"
+            "select * from {{ ref('model_one') }}")
+
+        macro_sql = ("{% macro simple(a, b) %}"
+                     "{{ env_var('PARSE_CACHE_OP', '+') }}"
+                     "{% endmacro %}")
+
+        self.parse(macro_sql)
+
+        with mock.patch.dict(os.environ, {'PARSE_CACHE_SCHEMA': 'other'}):
+            cache, _, nodes = self.parse(macro_sql)
+
+        # only the macro file is cached
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(
+            nodes['model.root.model_two'].get('config').get('schema'),
+            'other')
+
+    def test__unreadable_cache_is_ignored(self):
+        path = os.path.join(self.target_path,
+                            dbt.parser.cache.PARSE_CACHE_FILE_NAME)
+        with open(path, 'w') as handle:
+            handle.write('not a pickle')
+
+        cache = dbt.parser.cache.ParseCache.load(self.target_path)
+        self.assertEqual(cache.entries, {})
@@ -0,0 +1,63 @@
+import unittest
+
+import dbt.exceptions
+import dbt.flags
+import dbt.parser.parallel
+from dbt.parser import ModelParser
+from dbt.parser.parallel import ParsePool
+
+from test.unit.utils import get_model, parse_macros, project_config
+
+
+class ParseWorkersTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = True
+
+        self.root_project_config = project_config()
+
+        self.all_projects = {'root': self.root_project_config}
+
+        self.macros = parse_macros(
+            "{% macro simple(a, b) %}{{a}} + {{b}}{% endmacro %}")
+
+        self.pool = ParsePool(2, self.macros)
+
+    def tearDown(self):
+        dbt.parser.parallel.set_active_pool(None)
+        self.pool.terminate()
+
+    def parse(self, models, pool=None):
+        dbt.parser.parallel.set_active_pool(pool)
+
+        return ModelParser.parse_sql_nodes(
+            models, self.root_project_config, self.all_projects,
+            macros=self.macros)
+
+    def test__workers_match_sequential_parse(self):
+        models = [
+            get_model(
+                'model_{}'.format(i),
+                "{{ config(materialized='table') }}"
+                "select {{ simple(1, 2) }} from {{ ref('base') }}")
+            for i in range(10)
+        ]
+
+        self.assertEqual(self.parse(models), self.parse(models, self.pool))
+
+    def test__worker_errors_are_raised(self):
+        models = [
+            get_model('model_one', "select 1"),
+            get_model('model_two', "select {{ 1 + }}"),
+        ]
+
+        with self.assertRaises(dbt.exceptions.CompilationException):
+            self.parse(models, self.pool)
+
+    def test__duplicate_names_are_found(self):
+        model = get_model('model_one', "select 1")
+        duplicate = dict(model, path='other/model_one.sql',
+                         original_file_path='other/model_one.sql')
+
+        with self.assertRaises(dbt.exceptions.CompilationException):
+            self.parse([model, duplicate], self.pool)
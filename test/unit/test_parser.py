@@ -1,9 +1,12 @@
 import unittest
 
 import os
+import shutil
+import tempfile
 
 import dbt.flags
 from dbt.parser import ModelParser, MacroParser, DataTestParser, SchemaParser, ParserUtils
+from dbt.parser import SeedParser
 
 from dbt.node_types import NodeType
 from dbt.contracts.graph.parsed import ParsedManifest, ParsedNode, ParsedMacro
@@ -1539,3 +1542,30 @@ another_model:
                 }
             }
         )
+
+    def test__seed_rows_are_loaded_on_demand(self):
+        root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_dir)
+
+        os.mkdir(os.path.join(root_dir, 'data'))
+        abspath = os.path.join(root_dir, 'data', 'seed_one.csv')
+        with open(abspath, 'w') as handle:
+            handle.write('id,"first name"\n1,alice\n2,bob\n')
+
+        seeds = SeedParser.load_and_parse(
+            'root',
+            self.root_project_config,
+            {'root': self.root_project_config},
+            root_dir,
+            ['data'])
+
+        seed = seeds['seed.root.seed_one']
+        self.assertIsNone(seed.agate_table)
+        self.assertEqual(seed.seed_file['path'], abspath)
+        self.assertEqual(seed.seed_file['size'], os.path.getsize(abspath))
+        self.assertEqual(seed.seed_file['header'], ['id', 'first name'])
+
+        table = SeedParser.load_agate_table(seed.to_dict())
+        self.assertEqual(list(table.column_names), ['id', 'first name'])
+        self.assertEqual(len(table.rows), 2)
+        self.assertEqual(table.original_abspath, abspath)
@@ -0,0 +1,295 @@
+import mock
+import unittest
+
+import dbt.adapters.cache
+import dbt.flags
+from dbt.adapters.postgres import PostgresAdapter
+from dbt.node_runners import ModelRunner
+
+
+class RelationsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = True
+
+        self.profile = {'type': 'postgres', 'dbname': 'postgres',
+                        'schema': 'analytics', 'threads': 4}
+        self.project = {'quoting': {}}
+
+        self.cache = dbt.adapters.cache.RelationsCache()
+        dbt.adapters.cache.set_active_cache(self.cache)
+        self.addCleanup(dbt.adapters.cache.set_active_cache, None)
+
+        self.relations = [self.relation('one', 'table'),
+                          self.relation('two', 'view')]
+
+        patcher = mock.patch.object(PostgresAdapter, '_list_relations',
+                                    return_value=self.relations)
+        self.list_relations = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(PostgresAdapter, '_get_columns_in_table',
+                                    return_value=[])
+        self.get_columns = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for name in ['_drop_relation', '_rename_relation', '_create_schema',
+                     '_drop_schema', '_alter_column_type']:
+            patcher = mock.patch.object(PostgresAdapter, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def relation(self, identifier, relation_type=None, schema='analytics'):
+        return PostgresAdapter.Relation.create(
+            database='postgres', schema=schema, identifier=identifier,
+            type=relation_type)
+
+    def listed(self, schema='analytics'):
+        relations = PostgresAdapter.list_relations(self.profile, self.project,
+                                                   schema)
+        return sorted((r.identifier, r.type) for r in relations)
+
+    def test__schemas_are_listed_once(self):
+        self.assertEqual(self.listed(), [('one', 'table'), ('two', 'view')])
+        self.assertEqual(self.listed(), [('one', 'table'), ('two', 'view')])
+        self.assertEqual(self.list_relations.call_count, 1)
+
+        self.cache.invalidate('analytics')
+        self.listed()
+        self.assertEqual(self.list_relations.call_count, 2)
+
+    def test__quoted_names_are_case_sensitive(self):
+        self.listed()
+        self.listed('ANALYTICS')
+        self.assertEqual(self.list_relations.call_count, 2)
+
+        self.cache.add(self.relation('Foo', 'table'))
+        self.assertEqual(self.listed(), [('Foo', 'table'), ('one', 'table'),
+                                         ('two', 'view')])
+
+        cache = dbt.adapters.cache.RelationsCache({'schema': False,
+                                                   'identifier': False})
+        dbt.adapters.cache.set_active_cache(cache)
+
+        self.listed()
+        self.listed('ANALYTICS')
+        self.assertEqual(self.list_relations.call_count, 3)
+
+        cache.add(self.relation('ONE', 'table'))
+        self.assertEqual(self.listed(), [('ONE', 'table'), ('two', 'view')])
+
+    def rebuild(self, relation_type, identifier, schema='analytics'):
+        # what the table and view materializations do to an existing model
+        self.listed(schema)
+
+        PostgresAdapter.rename_relation(
+            self.profile, self.project,
+            self.relation(identifier, relation_type, schema),
+            self.relation(identifier + '__dbt_backup', schema=schema))
+        PostgresAdapter.rename_relation(
+            self.profile, self.project,
+            self.relation(identifier + '__dbt_tmp', relation_type, schema),
+            self.relation(identifier, schema=schema))
+        PostgresAdapter.drop_relation(
+            self.profile, self.project,
+            self.relation(identifier + '__dbt_backup', relation_type,
+                          schema))
+        PostgresAdapter.cache_new_relation(
+            self.relation(identifier, relation_type, schema))
+
+    def test__cascading_drops_relist_schemas_with_views(self):
+        # view "two" selects from table "one", but nothing says so
+        tables = [self.relation('three', 'table', 'tables')]
+        self.list_relations.side_effect = lambda *args: \
+            tables if args[2] == 'tables' else self.relations
+
+        self.listed()
+        self.listed('tables')
+
+        # dropping something that doesn't exist can't drop anything else
+        PostgresAdapter.drop_relation(self.profile, self.project,
+                                      self.relation('one__dbt_tmp', 'table'))
+        self.assertEqual(self.list_relations.call_count, 2)
+
+        self.rebuild('table', 'one')
+
+        self.listed()
+        self.assertEqual(self.listed('tables'), [('three', 'table')])
+        self.assertEqual(self.list_relations.call_count, 3)
+
+    def test__rerunning_models_lists_each_schema_once(self):
+        num_models = 5
+        nodes = {}
+        relations = {'analytics': [], 'other': []}
+
+        def add_node(name, materialized, parents=(), schema='analytics'):
+            nodes['model.root.' + name] = {
+                'resource_type': 'model',
+                'schema': schema,
+                'alias': name,
+                'config': {'materialized': materialized},
+                'depends_on': {'nodes': ['model.root.' + parent
+                                         for parent in parents]},
+            }
+            if materialized != 'ephemeral':
+                relations[schema].append(
+                    self.relation(name, materialized, schema))
+
+        # view_i selects from table_i through an ephemeral model, and
+        # another schema has a view on view_0
+        for i in range(num_models):
+            add_node('table_{}'.format(i), 'table')
+            add_node('ephemeral_{}'.format(i), 'ephemeral',
+                     ['table_{}'.format(i)])
+            add_node('view_{}'.format(i), 'view', ['ephemeral_{}'.format(i)])
+        add_node('other_view', 'view', ['view_0'], schema='other')
+
+        self.list_relations.side_effect = lambda *args: \
+            list(relations[args[2]])
+
+        project = mock.Mock(run_environment=mock.Mock(
+            return_value=self.profile))
+        ModelRunner.cache_relations(project, PostgresAdapter,
+                                    {'nodes': nodes})
+
+        for i in range(num_models):
+            self.rebuild('table', 'table_{}'.format(i))
+
+        self.assertEqual(
+            self.listed(),
+            [('table_{}'.format(i), 'table') for i in range(num_models)])
+        self.assertEqual(self.listed('other'), [])
+
+        for i in range(num_models):
+            self.rebuild('view', 'view_{}'.format(i))
+        self.rebuild('view', 'other_view', 'other')
+
+        self.assertEqual(len(self.listed()), 2 * num_models)
+        self.assertEqual(self.listed('other'), [('other_view', 'view')])
+        self.assertEqual(self.list_relations.call_count, 2)
+
+    def test__hooks_relist_the_schema(self):
+        self.listed()
+
+        runner = ModelRunner.__new__(ModelRunner)
+        runner.adapter = PostgresAdapter
+        runner.profile = self.profile
+        runner.cache_materialized_relation({
+            'resource_type': 'model',
+            'schema': 'analytics',
+            'alias': 'one',
+            'config': {'materialized': 'table',
+                       'pre-hook': [], 'post-hook': ['grant select']},
+        })
+
+        self.listed()
+        self.assertEqual(self.list_relations.call_count, 2)
+
+    @mock.patch.object(PostgresAdapter, 'drop_cascades', False)
+    def test__changes_are_tracked(self):
+        self.listed()
+
+        PostgresAdapter.drop_relation(self.profile, self.project,
+                                      self.relation('two', 'view'))
+        PostgresAdapter.rename_relation(self.profile, self.project,
+                                        self.relation('one'),
+                                        self.relation('one__dbt_backup'))
+        PostgresAdapter.rename_relation(self.profile, self.project,
+                                        self.relation('one__dbt_tmp',
+                                                      'table'),
+                                        self.relation('one'))
+        PostgresAdapter.cache_new_relation(self.relation('three', 'view'))
+
+        self.assertEqual(self.listed(), [('one', 'table'),
+                                         ('one__dbt_backup', 'table'),
+                                         ('three', 'view')])
+        self.assertEqual(self.list_relations.call_count, 1)
+
+    def test__new_schemas_are_empty(self):
+        PostgresAdapter.create_schema(self.profile, self.project, 'new')
+
+        self.assertEqual(self.listed('new'), [])
+        self.assertEqual(self.list_relations.call_count, 0)
+
+    def test__no_active_cache(self):
+        dbt.adapters.cache.set_active_cache(None)
+
+        self.listed()
+        self.listed()
+        self.assertEqual(self.list_relations.call_count, 2)
+
+    def columns(self, table='one'):
+        return PostgresAdapter.get_columns_in_table(self.profile,
+                                                    self.project,
+                                                    'analytics', table)
+
+    def test__columns_are_queried_once(self):
+        self.columns()
+        self.columns()
+        self.columns('two')
+        self.assertEqual(self.get_columns.call_count, 2)
+
+    def test__changed_columns_are_queried_again(self):
+        self.columns()
+        PostgresAdapter.alter_column_type(self.profile, self.project,
+                                          'analytics', 'one', 'id', 'bigint')
+        self.columns()
+        self.assertEqual(self.get_columns.call_count, 2)
+
+        PostgresAdapter.drop_relation(self.profile, self.project,
+                                      self.relation('one', 'table'))
+        self.columns()
+        self.assertEqual(self.get_columns.call_count, 3)
+
+        PostgresAdapter.cache_new_relation(self.relation('one', 'table'))
+        self.columns()
+        self.assertEqual(self.get_columns.call_count, 4)
+
+    def test__schemas_are_created_concurrently(self):
+        flat_graph = {'nodes': {
+            'model.root.{}'.format(schema): {
+                'resource_type': 'model',
+                'schema': schema,
+                'alias': 'model',
+                'config': {'materialized': 'view'},
+            } for schema in ['analytics', 'one', 'two', 'three']
+        }}
+        project = mock.Mock(run_environment=mock.Mock(
+            return_value=self.profile))
+
+        with mock.patch.object(PostgresAdapter, '_get_existing_schemas',
+                               return_value=['analytics']) as existing:
+            ModelRunner.create_schemas(project, PostgresAdapter, flat_graph,
+                                       threads=4)
+            ModelRunner.cache_relations(project, PostgresAdapter,
+                                        flat_graph, threads=4)
+
+        self.assertEqual(existing.call_count, 1)
+
+        create_schema = PostgresAdapter._create_schema
+        self.assertEqual(
+            sorted((args[2], args[3])
+                   for args, _ in create_schema.call_args_list),
+            [('one', 'schema_one'), ('three', 'schema_three'),
+             ('two', 'schema_two')])
+
+        # only the existing schema has to be listed
+        self.assertEqual(self.list_relations.call_count, 1)
+        self.assertEqual(self.list_relations.call_args[0][2], 'analytics')
+        self.assertEqual(self.cache.hits, 0)
+
+    def test__cascading_drops_forget_columns(self):
+        self.listed()
+        self.columns('two')
+
+        PostgresAdapter.drop_relation(self.profile, self.project,
+                                      self.relation('one', 'table'))
+        self.columns('two')
+        self.assertEqual(self.get_columns.call_count, 2)
+
+        self.listed('other')
+        self.columns('two')
+        PostgresAdapter.drop_schema(self.profile, self.project, 'other')
+        self.assertEqual(self.listed('other'), [])
+        self.columns('two')
+        self.assertEqual(self.get_columns.call_count, 3)
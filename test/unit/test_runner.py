@@ -0,0 +1,239 @@
+import mock
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import dbt.exceptions
+import dbt.flags
+from dbt.compilation import Linker
+from dbt.node_runners import BaseRunner, RunModelResult
+from dbt.runner import RunManager
+from dbt.scheduler import NodeQueue, RunHistory, SkipTracker
+
+
+class FakeRunner(BaseRunner):
+    """Runs nodes by sleeping for the number of seconds in node['sleep']."""
+
+    lock = threading.Lock()
+    events = []
+
+    def safe_run(self, flat_graph):
+        with self.lock:
+            self.events.append(('start', self.node['unique_id']))
+
+        time.sleep(self.node.get('sleep', 0))
+
+        with self.lock:
+            self.events.append(('end', self.node['unique_id']))
+
+        if self.node.get('fail'):
+            return RunModelResult(self.node, error='failed', status='ERROR')
+
+        return RunModelResult(self.node, status='OK',
+                              execution_time=self.node.get('sleep', 0))
+
+    def before_execute(self):
+        pass
+
+    def after_execute(self, result):
+        pass
+
+    def on_skip(self):
+        with self.lock:
+            self.events.append(('skip', self.node['unique_id']))
+
+        return RunModelResult(self.node, skip=True)
+
+
+class FailFastRunner(FakeRunner):
+    def raise_on_first_error(self):
+        return True
+
+
+class RunManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        dbt.flags.STRICT_MODE = True
+        FakeRunner.events = []
+
+        profile = {
+            'type': 'postgres',
+            'host': 'localhost',
+            'schema': 'analytics',
+            'threads': 2,
+        }
+
+        self.project = mock.MagicMock()
+        self.project.run_environment.return_value = profile
+        self.project.get_target.return_value = {'name': 'test'}
+
+        self.linker = Linker()
+        self.nodes = {}
+
+        self.target_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target_path)
+
+    def add_node(self, name, depends_on=(), **kwargs):
+        node = {
+            'unique_id': name,
+            'name': name,
+            'resource_type': 'model',
+            'schema': 'analytics',
+            'config': {'materialized': 'view'},
+        }
+        node.update(kwargs)
+
+        self.nodes[name] = node
+        self.linker.update_node_data(name, node)
+        for parent in depends_on:
+            self.linker.dependency(name, parent)
+
+    def get_manager(self, scheduler='fifo'):
+        return RunManager(self.project, self.target_path,
+                          mock.MagicMock(threads=2, scheduler=scheduler))
+
+    def execute(self, Runner=FakeRunner, scheduler='fifo'):
+        manager = self.get_manager(scheduler)
+        dep_list = [
+            [self.nodes[name] for name in level]
+            for level in self.linker.as_dependency_list()
+        ]
+
+        return manager.execute_nodes(self.linker, Runner,
+                                     {'nodes': dict(self.nodes)}, dep_list)
+
+    def index(self, event, name):
+        return FakeRunner.events.index((event, name))
+
+    def test__nodes_start_when_their_parents_finish(self):
+        self.add_node('slow', sleep=0.5)
+        self.add_node('fast')
+        self.add_node('after_fast', depends_on=['fast'])
+        self.add_node('after_slow', depends_on=['slow'])
+
+        results = self.execute()
+
+        self.assertEqual(len(results), 4)
+        # after_fast doesn't wait for the rest of its level to finish
+        self.assertLess(self.index('end', 'after_fast'),
+                        self.index('end', 'slow'))
+        self.assertLess(self.index('end', 'slow'),
+                        self.index('start', 'after_slow'))
+
+    def test__waits_for_unselected_parents_parents(self):
+        self.add_node('first', sleep=0.2)
+        self.add_node('middle', depends_on=['first'])
+        self.add_node('last', depends_on=['middle'])
+        del self.nodes['middle']
+
+        manager = self.get_manager()
+        dep_list = [
+            [self.nodes[name] for name in level]
+            for level in self.linker.as_dependency_list(['first', 'last'])
+        ]
+        manager.execute_nodes(self.linker, FakeRunner,
+                              {'nodes': dict(self.nodes)}, dep_list)
+
+        self.assertLess(self.index('end', 'first'),
+                        self.index('start', 'last'))
+
+    def test__failures_skip_dependents(self):
+        self.add_node('broken', fail=True)
+        self.add_node('child', depends_on=['broken'])
+        self.add_node('grandchild', depends_on=['child'])
+        self.add_node('unrelated')
+
+        results = self.execute()
+
+        skipped = set(r.node['unique_id'] for r in results if r.skipped)
+        self.assertEqual(skipped, set(['child', 'grandchild']))
+        self.assertIn(('end', 'unrelated'), FakeRunner.events)
+
+    def test__raise_on_first_error(self):
+        self.add_node('broken', fail=True)
+        self.add_node('child', depends_on=['broken'])
+
+        with self.assertRaises(dbt.exceptions.RuntimeException):
+            self.execute(FailFastRunner)
+
+        self.assertNotIn(('start', 'child'), FakeRunner.events)
+
+    def test__run_history_is_saved(self):
+        self.add_node('model_one', sleep=0.1)
+        self.add_node('broken', fail=True)
+
+        RunHistory(self.target_path, {'deleted': 1.0}).save()
+
+        self.execute()
+
+        history = RunHistory.load(self.target_path)
+        self.assertEqual(list(history.timings), ['model_one'])
+        self.assertGreaterEqual(history.timings['model_one'], 0.1)
+
+    def test__critical_path_starts_long_chains_first(self):
+        self.add_node('short')
+        self.add_node('long_1')
+        self.add_node('long_2', depends_on=['long_1'])
+        self.add_node('long_3', depends_on=['long_2'])
+
+        RunHistory(self.target_path, {
+            'short': 5.0, 'long_1': 1.0, 'long_2': 3.0, 'long_3': 3.0
+        }).save()
+
+        manager = RunManager(self.project, self.target_path,
+                             mock.MagicMock(threads=1,
+                                            scheduler='critical-path'))
+        dep_list = [
+            [self.nodes[name] for name in level]
+            for level in self.linker.as_dependency_list()
+        ]
+        manager.execute_nodes(self.linker, FakeRunner,
+                              {'nodes': dict(self.nodes)}, dep_list)
+
+        started = [name for event, name in FakeRunner.events
+                   if event == 'start']
+        # the rest of the long chain is shorter than the short node
+        self.assertEqual(started, ['long_1', 'long_2', 'short', 'long_3'])
+
+
+class NodeQueueTest(unittest.TestCase):
+
+    def test__priorities(self):
+        waiting_on = {'a': set(), 'b': set(), 'c': set(['a'])}
+        queue = NodeQueue(['a', 'b', 'c'], waiting_on,
+                          {'a': 1, 'b': 2, 'c': 1})
+
+        self.assertEqual(queue.pop(), 'b')
+        self.assertEqual(queue.pop(), 'a')
+        self.assertFalse(queue.has_ready())
+
+        queue.mark_done('a')
+        self.assertEqual(queue.pop(), 'c')
+
+    def test__fifo(self):
+        waiting_on = {'a': set(), 'b': set(), 'c': set()}
+        queue = NodeQueue(['c', 'a', 'b'], waiting_on)
+
+        self.assertEqual([queue.pop(), queue.pop(), queue.pop()],
+                         ['c', 'a', 'b'])
+
+
+class SkipTrackerTest(unittest.TestCase):
+
+    def test__skips_are_propagated_once(self):
+        depends_on = {
+            'a': set(), 'b': set(), 'c': set(['a', 'b']),
+            'd': set(['c']), 'e': set(['b'])
+        }
+        tracker = SkipTracker(depends_on)
+
+        self.assertEqual(sorted(tracker.mark_failed('a')), ['c', 'd'])
+        self.assertTrue(tracker.is_skipped('d'))
+        self.assertFalse(tracker.is_skipped('e'))
+
+        # c and d were already skipped
+        self.assertEqual(tracker.mark_failed('b'), ['e'])
+        self.assertEqual(tracker.failed_parents['c'], 2)
+        self.assertEqual(tracker.failed_parents['d'], 1)
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 import dbt.utils
@@ -41,3 +42,69 @@ class TestMerge(unittest.TestCase):
                 case['expected'], actual,
                 'failed on {} (actual {}, expected {})'.format(
                     case['description'], actual, case['expected']))
+
+
+class TestIndexedSubgraph(unittest.TestCase):
+
+    def setUp(self):
+        self.subgraph = dbt.utils.IndexedSubgraph({
+            'model.root.events': {'name': 'events'},
+            'seed.snowplow.events': {'name': 'events'},
+            'model.snowplow.page_views': {'name': 'page_views'},
+        })
+
+    def find(self, name, package, nodetype):
+        return dbt.utils.find_in_subgraph_by_name(
+            self.subgraph, name, package, nodetype)
+
+    def test__find_by_package(self):
+        self.assertEqual(
+            self.find('events', 'snowplow', ['model', 'seed']),
+            self.subgraph['seed.snowplow.events'])
+        self.assertIsNone(self.find('events', 'snowplow', ['model']))
+        self.assertIsNone(self.find('sessions', None, ['model']))
+
+    def test__find_in_any_package(self):
+        self.assertEqual(
+            self.find('page_views', None, ['model']),
+            self.subgraph['model.snowplow.page_views'])
+
+    def test__added_nodes_are_indexed(self):
+        self.subgraph['model.root.sessions'] = {'name': 'sessions'}
+        self.assertEqual(self.find('sessions', 'root', ['model']),
+                         {'name': 'sessions'})
+
+        # replacing a node returns the new value
+        self.subgraph['model.root.events'] = {'name': 'events', 'new': True}
+        self.assertTrue(self.find('events', 'root', ['model'])['new'])
+
+    def test__removed_nodes_are_not_found(self):
+        del self.subgraph['model.root.events']
+        self.subgraph['model.other.events'] = {'name': 'other events'}
+        self.assertEqual(self.find('events', None, ['model']),
+                         {'name': 'other events'})
+
+        self.subgraph.pop('model.other.events')
+        self.assertIsNone(self.find('events', None, ['model']))
+        self.assertEqual(self.find('events', None, ['seed']),
+                         {'name': 'events'})
+
+        self.subgraph.clear()
+        self.assertIsNone(self.find('events', None, ['seed']))
+
+    def test__pickle_round_trip(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            subgraph = pickle.loads(pickle.dumps(self.subgraph, protocol))
+
+            self.assertIsInstance(subgraph, dbt.utils.IndexedSubgraph)
+            self.assertEqual(subgraph, self.subgraph)
+            self.assertEqual(
+                dbt.utils.find_in_subgraph_by_name(
+                    subgraph, 'page_views', None, ['model']),
+                {'name': 'page_views'})
+
+    def test__invalid_names(self):
+        self.subgraph['model.root.my.model'] = {'resource_type': 'model'}
+
+        with self.assertRaises(dbt.exceptions.CompilationException):
+            self.find('events', 'root', ['model'])
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import dbt.exceptions
+import dbt.writer
+
+
+class WriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.target_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target_path)
+
+        self.node = {'package_name': 'root', 'path': 'models/one.sql'}
+        self.path = os.path.join(self.target_path, 'compiled', 'root',
+                                 'models', 'one.sql')
+
+    def read(self):
+        with open(self.path) as handle:
+            return handle.read()
+
+    def test__unchanged_files_are_not_rewritten(self):
+        self.assertTrue(dbt.writer.write_if_changed(self.path, 'select 1'))
+        inode = os.stat(self.path).st_ino
+
+        self.assertFalse(dbt.writer.write_if_changed(self.path, 'select 1'))
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+
+        self.assertTrue(dbt.writer.write_if_changed(self.path, 'select 2'))
+        self.assertEqual(self.read(), 'select 2')
+        # no temporary files are left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['one.sql'])
+
+    def test__background_writer(self):
+        writer = dbt.writer.BackgroundWriter()
+        dbt.writer.set_active_writer(writer)
+        self.addCleanup(dbt.writer.set_active_writer, None)
+
+        for payload in ['select 1', 'select 1', 'select 2']:
+            path = dbt.writer.write_node(self.node, self.target_path,
+                                         'compiled', payload)
+
+        writer.close()
+        writer.raise_errors()
+
+        self.assertEqual(path, self.path)
+        self.assertEqual(self.read(), 'select 2')
+        self.assertEqual((writer.written, writer.unchanged), (2, 1))
+
+    def test__background_writer_errors(self):
+        # a file where the directory should be
+        dbt.writer.write_if_changed(os.path.join(self.target_path, 'run'), '')
+
+        writer = dbt.writer.BackgroundWriter()
+        writer.write(os.path.join(self.target_path, 'run', 'one.sql'), '')
+        writer.close()
+
+        self.assertEqual(len(writer.failed_paths()), 1)
+        with self.assertRaises(dbt.exceptions.RuntimeException):
+            writer.raise_errors()
@@ -0,0 +1,75 @@
+"""Fixtures shared by the unit tests that parse and compile nodes."""
+import os
+
+from dbt.parser import MacroParser
+
+from dbt.node_types import NodeType
+
+
+def get_os_path(unix_path):
+    return os.path.normpath(unix_path)
+
+
+def project_config(**kwargs):
+    config = {
+        'name': 'root',
+        'version': '0.1',
+        'profile': 'test',
+        'project-root': os.path.abspath('.'),
+        'target': 'test',
+        'quoting': {},
+        'outputs': {
+            'test': {
+                'type': 'postgres',
+                'host': 'localhost',
+                'schema': 'analytics',
+            }
+        }
+    }
+
+    config.update(kwargs)
+    return config
+
+
+def parse_macros(macro_sql, package_name='root', root_path=None):
+    if root_path is None:
+        root_path = get_os_path('/usr/src/app')
+
+    return MacroParser.parse_macro_file(
+        macro_file_path='macros.sql',
+        macro_file_contents=macro_sql,
+        root_path=root_path,
+        package_name=package_name,
+        resource_type=NodeType.Macro)
+
+
+def get_model(name, raw_sql):
+    """Return an unparsed model in the root project."""
+    return {
+        'name': name,
+        'resource_type': 'model',
+        'package_name': 'root',
+        'original_file_path': '{}.sql'.format(name),
+        'root_path': get_os_path('/usr/src/app'),
+        'path': '{}.sql'.format(name),
+        'raw_sql': raw_sql,
+    }
+
+
+def get_node(name, raw_sql='', package_name='root', materialized='view',
+             depends_on=(), schema='analytics'):
+    """Return a parsed model."""
+    return {
+        'name': name,
+        'alias': name,
+        'schema': schema,
+        'package_name': package_name,
+        'path': '{}.sql'.format(name),
+        'unique_id': 'model.{}.{}'.format(package_name, name),
+        'resource_type': 'model',
+        'raw_sql': raw_sql,
+        'refs': [],
+        'depends_on': {'nodes': list(depends_on), 'macros': []},
+        'config': {'materialized': materialized, 'vars': {}, 'quoting': {}},
+        'tags': [],
+    }